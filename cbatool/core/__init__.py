@@ -6,10 +6,12 @@ Core components for CBAtool including data loading, analysis, and visualization.
 try:
     from .data_loader import DataLoader
     from .depth_analyzer import DepthAnalyzer
+    from .kp_index import KPIntervalIndex
     from .position_analyzer import PositionAnalyzer
+    from .route_index import RouteIndex
     from .visualizer import Visualizer
     
-    __all__ = ['DataLoader', 'DepthAnalyzer', 'PositionAnalyzer', 'Visualizer']
+    __all__ = ['DataLoader', 'DepthAnalyzer', 'KPIntervalIndex', 'PositionAnalyzer', 'RouteIndex', 'Visualizer']
 except ImportError as e:
     print(f"Warning: Could not import core modules: {e}")
     __all__ = []
\ No newline at end of file
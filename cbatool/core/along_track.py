@@ -0,0 +1,232 @@
+"""
+Along-track distance module for CBAtool v2.0.
+
+This module contains vectorised functions to compute cumulative along-track
+distance from survey coordinates, compare it with the reported KP, flag KP drift
+and reconstruct missing KP values.
+"""
+
+import numpy as np
+import logging
+from typing import Dict, Any
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius in meters (used for haversine distances)
+EARTH_RADIUS_M = 6371008.8
+
+
+def segment_lengths(x: np.ndarray, y: np.ndarray, geographic: bool = False) -> np.ndarray:
+    """
+    Calculate the length of each segment between consecutive survey points.
+
+    Args:
+        x: Easting values, or longitude in degrees if geographic.
+        y: Northing values, or latitude in degrees if geographic.
+        geographic: Whether the coordinates are longitude/latitude, in which case
+            great-circle (haversine) distances are used.
+
+    Returns:
+        Array of segment lengths in meters, with NaN for the first point and for
+        segments touching a point with missing coordinates.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if geographic:
+        lon = np.radians(x)
+        lat = np.radians(y)
+        dlat = np.diff(lat, prepend=np.nan)
+        dlon = np.diff(lon, prepend=np.nan)
+        previous_lat = np.concatenate(([np.nan], lat[:-1]))
+        h = np.sin(dlat / 2) ** 2 + np.cos(previous_lat) * np.cos(lat) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+    return np.hypot(np.diff(x, prepend=np.nan), np.diff(y, prepend=np.nan))
+
+
+def cumulative_distance(lengths: np.ndarray) -> np.ndarray:
+    """
+    Accumulate segment lengths into along-track distance.
+
+    Segments with missing coordinates contribute no distance.
+
+    Args:
+        lengths: Segment lengths in meters as returned by segment_lengths.
+
+    Returns:
+        Cumulative along-track distance in meters, starting at 0.
+    """
+    return np.cumsum(np.nan_to_num(lengths, nan=0.0))
+
+
+def windowed_change(values: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    Calculate the change of a series over a centred window of points.
+
+    Args:
+        values: Series values (e.g. along-track distance or KP).
+        window: Number of points in the window. The window is truncated at the
+            ends of the series.
+
+    Returns:
+        Array with, for each point, the value at the end of its window minus the
+        value at the start.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    half = max(int(window) // 2, 1)
+    positions = np.arange(n)
+    lower = np.maximum(positions - half, 0)
+    upper = np.minimum(positions + half, n - 1)
+    return values[upper] - values[lower]
+
+
+def windowed_distance_ratio(along_track: np.ndarray, kp: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    Compare distance travelled with KP progress over a centred window of points.
+
+    Args:
+        along_track: Cumulative along-track distance in meters.
+        kp: Reported KP values in kilometers.
+        window: Number of points in the window.
+
+    Returns:
+        Ratio of along-track distance to KP progress (in meters) for each point,
+        NaN where KP does not progress over the window or is missing.
+    """
+    travelled = windowed_change(along_track, window)
+    progress = windowed_change(kp, window) * 1000
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(progress > 0, travelled / progress, np.nan)
+
+
+def local_linear_fit(x: np.ndarray, y: np.ndarray, weights: np.ndarray, window: float) -> np.ndarray:
+    """
+    Evaluate a weighted least-squares line fitted around each point.
+
+    Each point gets its own line, fitted over the points whose x lies within
+    window / 2 of its own. The window sums come from cumulative sums, so the
+    whole series is fitted in O(n).
+
+    Args:
+        x: Non-decreasing x values (e.g. along-track distance).
+        y: y values (NaN allowed where the weight is 0).
+        weights: Weight of each point in the fits (0 excludes a point).
+        window: Width of the fitting window, in the units of x.
+
+    Returns:
+        Fitted y value at each point, NaN where the window holds fewer than two
+        weighted points or no spread in x.
+    """
+    x = np.asarray(x, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    y = np.where(weights > 0, np.asarray(y, dtype=float), 0.0)
+    x0 = x - (x.mean() if len(x) else 0.0)  # Centre x to limit cancellation in the sums
+
+    lower = np.searchsorted(x, x - window / 2, side='left')
+    upper = np.searchsorted(x, x + window / 2, side='right')
+
+    def window_sum(values):
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        return sums[upper] - sums[lower]
+
+    s = window_sum(weights)
+    sx = window_sum(weights * x0)
+    sy = window_sum(weights * y)
+    sxx = window_sum(weights * x0 * x0)
+    sxy = window_sum(weights * x0 * y)
+
+    denominator = s * sxx - sx * sx
+    valid = (s >= 2) & (denominator > 1e-12 * np.maximum(s * sxx, 1e-300))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (s * sxy - sx * sy) / denominator
+        intercept = (sy - slope * sx) / s
+    return np.where(valid, intercept + slope * x0, np.nan)
+
+
+def reconstruct_kp(kp: np.ndarray, along_track: np.ndarray, drift_threshold: float = 0.01,
+                   window_km: float = 1.0) -> Dict[str, Any]:
+    """
+    Compare reported KP with along-track distance, flag drift and fill missing KP.
+
+    KP drift is measured against the local relation between KP and along-track
+    distance: a line fitted over window_km of track around each point. Lay slack,
+    turns and GPS jitter change that relation slowly along a route, so a single
+    line over the whole survey would report long stretches of good data as drift.
+    Points already found to drift are left out of the fit and it is repeated, so
+    a drifting stretch does not pull its own reference line. Departures much
+    shorter than the window are flagged; a shift that persists over several
+    windows is absorbed by the local fits.
+
+    Missing KP values are reconstructed from a linear fit over all reported points,
+    with the residual interpolated between the nearest reported KP values on each
+    side.
+
+    Args:
+        kp: Reported KP values in kilometers (NaN where missing).
+        along_track: Cumulative along-track distance in meters.
+        drift_threshold: Absolute drift (kilometers) above which a point is flagged.
+        window_km: Length of track (kilometers) over which the local reference
+            line of each point is fitted.
+
+    Returns:
+        Dictionary with 'kp' (reported or reconstructed KP), 'is_reconstructed',
+        'drift', 'is_drift' arrays and the fitted 'offset' and 'scale' of the
+        survey-wide fit.
+    """
+    kp = np.asarray(kp, dtype=float)
+    distance_km = np.asarray(along_track, dtype=float) / 1000.0
+    reported = np.isfinite(kp)
+    n_reported = np.count_nonzero(reported)
+
+    # Fit KP against along-track distance by least squares
+    if n_reported >= 2 and np.ptp(distance_km[reported]) > 0:
+        scale, offset = np.polyfit(distance_km[reported], kp[reported], 1)
+    elif n_reported >= 1:
+        scale, offset = 1.0, float(np.median(kp[reported] - distance_km[reported]))
+    else:
+        logger.warning("No reported KP values available for KP reconstruction")
+        return {
+            'kp': kp.copy(),
+            'is_reconstructed': np.zeros(len(kp), dtype=bool),
+            'drift': np.full(len(kp), np.nan),
+            'is_drift': np.zeros(len(kp), dtype=bool),
+            'offset': np.nan,
+            'scale': np.nan
+        }
+
+    global_fit = offset + scale * distance_km
+
+    # Local reference lines, refitted without the points that drift from them
+    reference = global_fit
+    included = reported
+    for _ in range(3):
+        local_fit = local_linear_fit(distance_km, kp, included, window_km)
+        reference = np.where(np.isfinite(local_fit), local_fit, reference)
+        remaining = reported & (np.abs(kp - reference) <= drift_threshold)
+        if np.array_equal(remaining, included):
+            break
+        included = remaining
+
+    drift = kp - reference
+    is_drift = np.abs(drift) > drift_threshold
+
+    # Fill gaps: interpolate the residual between the reported neighbours
+    reconstructed_kp = kp.copy()
+    is_reconstructed = ~reported
+    if is_reconstructed.any():
+        residual = np.interp(distance_km[is_reconstructed], distance_km[reported],
+                             kp[reported] - global_fit[reported])
+        reconstructed_kp[is_reconstructed] = global_fit[is_reconstructed] + residual
+
+    return {
+        'kp': reconstructed_kp,
+        'is_reconstructed': is_reconstructed,
+        'drift': drift,
+        'is_drift': is_drift,
+        'offset': float(offset),
+        'scale': float(scale)
+    }
@@ -0,0 +1,135 @@
+"""
+Shared analysis frame module for CBAtool v2.0.
+
+This module contains the SharedAnalysisFrame class, which lets several analyzers
+work on a single copy of the survey data. Each analyzer adds its derived columns
+under its own namespace, and common derived values such as point-to-point
+differences are computed once and shared.
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SharedAnalysisFrame:
+    """
+    Single DataFrame shared by the analyzers of a combined analysis.
+
+    Analyzers attached to a shared frame write their derived columns directly into
+    it instead of working on private copies. The frame keeps a registry of which
+    namespace (analyzer) owns each derived column, so per-analysis views can be
+    produced without copying data.
+
+    Attributes:
+        data (pd.DataFrame): The shared survey data with all derived columns.
+        base_columns (List[str]): Columns of the data before any analysis.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Initialize the shared frame.
+
+        Args:
+            data: DataFrame containing the survey data. It is used in place, not copied.
+        """
+        self.data = data
+        self.base_columns = list(data.columns)
+        self._namespaces: Dict[str, List[str]] = {}
+        self._diff_cache: Dict[str, np.ndarray] = {}
+
+    def register_columns(self, namespace: str, columns: List[str]) -> None:
+        """
+        Record derived columns as owned by a namespace.
+
+        Args:
+            namespace: Name of the namespace (e.g. 'depth' or 'position').
+            columns: Names of the derived columns added by the namespace.
+        """
+        owned = self._namespaces.setdefault(namespace, [])
+        for column in columns:
+            if column in self.base_columns or column in owned:
+                continue
+
+            owner = self.get_owner(column)
+            if owner is not None:
+                logger.warning(f"Column '{column}' of namespace '{owner}' was overwritten by '{namespace}'")
+                self._namespaces[owner].remove(column)
+            owned.append(column)
+
+    def register_new_columns(self, namespace: str) -> None:
+        """
+        Register all columns of the data not yet owned by any namespace.
+
+        Args:
+            namespace: Name of the namespace that added the columns.
+        """
+        known = set(self.base_columns)
+        for columns in self._namespaces.values():
+            known.update(columns)
+        self.register_columns(namespace, [column for column in self.data.columns if column not in known])
+
+    def get_owner(self, column: str) -> Optional[str]:
+        """
+        Get the namespace that owns a derived column.
+
+        Args:
+            column: Name of the column.
+
+        Returns:
+            Name of the owning namespace, or None for base or unknown columns.
+        """
+        for namespace, columns in self._namespaces.items():
+            if column in columns:
+                return namespace
+        return None
+
+    def get_columns(self, namespace: str) -> List[str]:
+        """
+        Get the derived columns owned by a namespace.
+
+        Args:
+            namespace: Name of the namespace.
+
+        Returns:
+            List of column names in the order they were added.
+        """
+        return list(self._namespaces.get(namespace, []))
+
+    def view(self, namespace: str) -> pd.DataFrame:
+        """
+        Get the base columns together with the derived columns of one namespace.
+
+        Column selection does not copy data under pandas copy-on-write (the
+        default from pandas 3.0), so views are cheap to hand to report generation.
+        On older pandas without copy-on-write enabled, each view copies its columns.
+
+        Args:
+            namespace: Name of the namespace.
+
+        Returns:
+            DataFrame with the base and namespace columns.
+        """
+        columns = [column for column in self.base_columns + self.get_columns(namespace)
+                   if column in self.data.columns]
+        return self.data[columns]
+
+    def diff(self, column: str) -> np.ndarray:
+        """
+        Get the differences between consecutive values of a base column.
+
+        The result is computed once per column and shared by all analyzers.
+
+        Args:
+            column: Name of the column.
+
+        Returns:
+            Array of differences with NaN for the first point.
+        """
+        if column not in self._diff_cache:
+            values = self.data[column].to_numpy(dtype=float)
+            self._diff_cache[column] = np.diff(values, prepend=np.nan)
+        return self._diff_cache[column]
@@ -7,10 +7,14 @@ the common interface for all analysis types.
 
 from abc import ABC, abstractmethod
 import pandas as pd
+import numpy as np
 import logging
 from typing import Optional, Dict, List, Any, Union, Tuple
 from datetime import datetime
 
+from .kp_index import KPIntervalIndex
+from .analysis_frame import SharedAnalysisFrame
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,10 @@ class BaseAnalyzer(ABC):
         data (pd.DataFrame): The data to analyze.
         kp_column (str): Name of the column containing KP (kilometer point) values.
         analysis_results (Dict): Dictionary containing results of various analyses.
+        kp_index (KPIntervalIndex): Index of problem sections and anomalies by KP,
+            built on first query after analysis.
+        shared_frame (SharedAnalysisFrame): Shared frame the analyzer writes its
+            derived columns into, if attached.
     """
     
     def __init__(self, data: Optional[pd.DataFrame] = None):
@@ -37,6 +45,9 @@ class BaseAnalyzer(ABC):
         self.data = data
         self.kp_column = None
         self.analysis_results = {}
+        self.kp_index = None
+        self.shared_frame = None
+        self.namespace = self._get_analysis_type()
     
     def set_data(self, data: pd.DataFrame) -> bool:
         """
@@ -82,6 +93,60 @@ class BaseAnalyzer(ABC):
         # Subclasses should implement their specific column setters
         return self._set_specific_columns(**kwargs)
     
+    def set_shared_frame(self, frame: SharedAnalysisFrame, namespace: Optional[str] = None) -> bool:
+        """
+        Attach a shared analysis frame so results are added to it in place.
+        
+        Args:
+            frame: Shared frame holding the data to analyze.
+            namespace: Namespace for the derived columns (defaults to the analysis type).
+            
+        Returns:
+            bool: True if the shared frame was attached successfully, False otherwise.
+        """
+        if not self.set_data(frame.data):
+            return False
+            
+        self.shared_frame = frame
+        if namespace:
+            self.namespace = namespace
+        logger.info(f"Using shared analysis frame with namespace '{self.namespace}'")
+        return True
+    
+    def _working_data(self) -> pd.DataFrame:
+        """
+        Get the DataFrame that analysis columns should be added to.
+        
+        Returns:
+            The shared frame data if attached, otherwise a copy of the data.
+        """
+        if self.shared_frame is not None:
+            return self.shared_frame.data
+        return self.data.copy()
+    
+    def _register_derived_columns(self) -> None:
+        """Record newly added columns as owned by this analyzer in the shared frame."""
+        if self.shared_frame is not None:
+            self.shared_frame.register_new_columns(self.namespace)
+    
+    def _column_diff(self, data: pd.DataFrame, column: str) -> np.ndarray:
+        """
+        Get differences between consecutive values of a column.
+        
+        Differences of the shared frame's columns are computed once and reused
+        by every analyzer attached to it.
+        
+        Args:
+            data: DataFrame containing the column.
+            column: Name of the column.
+            
+        Returns:
+            Array of differences with NaN for the first point.
+        """
+        if self.shared_frame is not None and data is self.shared_frame.data:
+            return self.shared_frame.diff(column)
+        return np.diff(data[column].to_numpy(dtype=float), prepend=np.nan)
+    
     @abstractmethod
     def _set_specific_columns(self, **kwargs) -> bool:
         """
@@ -121,6 +186,55 @@ class BaseAnalyzer(ABC):
         """
         pass
     
+    def build_kp_index(self) -> KPIntervalIndex:
+        """
+        Build the KP interval index over problem sections and anomalies.
+        
+        Returns:
+            KPIntervalIndex over the current analysis results.
+        """
+        self.kp_index = KPIntervalIndex(self._get_kp_intervals())
+        return self.kp_index
+    
+    def query_kp_range(self, start_kp: float, end_kp: float) -> pd.DataFrame:
+        """
+        Find problem sections and anomalies overlapping a KP range.
+        
+        Args:
+            start_kp: Start of the KP range.
+            end_kp: End of the KP range.
+            
+        Returns:
+            DataFrame of overlapping intervals (Start_KP, End_KP, Source, Severity, Label).
+        """
+        if self.kp_index is None:
+            self.build_kp_index()
+        return self.kp_index.query_range(start_kp, end_kp)
+    
+    def query_kp(self, kp: float) -> pd.DataFrame:
+        """
+        Find problem sections and anomalies at a KP value.
+        
+        Args:
+            kp: KP value to look up.
+            
+        Returns:
+            DataFrame of intervals containing the KP value.
+        """
+        return self.query_kp_range(kp, kp)
+    
+    def _get_kp_intervals(self) -> pd.DataFrame:
+        """
+        Get the KP intervals of problem sections and anomalies for the KP index.
+        
+        Subclasses override this to expose their results; the base implementation
+        has no intervals.
+        
+        Returns:
+            DataFrame with Start_KP, End_KP, Source, Severity and Label columns.
+        """
+        return pd.DataFrame(columns=KPIntervalIndex.COLUMNS)
+    
     def get_analysis_summary(self) -> Dict[str, Any]:
         """
         Get a summary of analysis results.
@@ -208,6 +322,38 @@ class BaseAnalyzer(ABC):
         
         return standardized
     
+    @staticmethod
+    def _column_or_default(frame: pd.DataFrame, column: Optional[str], default: Any) -> pd.Series:
+        """
+        Get a column of a DataFrame, or a constant Series if the column is missing.
+        
+        Args:
+            frame: DataFrame to read from
+            column: Name of the column to read
+            default: Value to use for every row if the column is missing
+            
+        Returns:
+            Series aligned with the rows of the frame
+        """
+        if column and column in frame.columns:
+            return frame[column]
+        return pd.Series([default] * len(frame), index=frame.index, dtype=object)
+    
+    @staticmethod
+    def _build_detail_records(fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build standardized detail records from column-wise values.
+        
+        Args:
+            fields: Mapping of detail field names to array-like values, one value per
+                record (all of the same length), in output field order
+            
+        Returns:
+            List of detail dictionaries, one per record
+        """
+        columns = {name: np.asarray(values) for name, values in fields.items()}
+        return pd.DataFrame(columns).to_dict('records')
+    
     @abstractmethod
     def _populate_problem_sections(self, standardized: Dict[str, Any]) -> None:
         """
@@ -0,0 +1,162 @@
+"""
+Decimation module for CBAtool v2.0.
+
+This module contains shape-preserving downsampling functions used to reduce
+large profiles to a plotting budget while keeping their visual shape and any
+points that must always be shown.
+"""
+
+import numpy as np
+import logging
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Supported decimation methods
+DECIMATION_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. The remaining points are split
+    into n_out - 2 buckets, and from each bucket the point forming the largest
+    triangle with the previously selected point and the average of the next
+    bucket is kept.
+
+    Args:
+        x: X values in plotting order.
+        y: Y values in plotting order.
+        n_out: Number of points to select.
+
+    Returns:
+        Sorted array of selected row positions.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket boundaries over the interior points and the average of every bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    valid_y = np.where(np.isnan(y), 0.0, y)
+    valid_count = np.add.reduceat(~np.isnan(y[1:n - 1]), edges[:-1] - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+        avg_y = np.add.reduceat(valid_y[1:n - 1], edges[:-1] - 1) / valid_count
+
+    # The bucket after the last interior one is the final point itself
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+
+        # Twice the triangle area (the constant factor does not change the argmax)
+        area = np.abs(
+            (x[previous] - avg_x[bucket + 1]) * (bucket_y - y[previous]) -
+            (x[previous] - bucket_x) * (avg_y[bucket + 1] - y[previous])
+        )
+        area[np.isnan(area)] = -1.0
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the minimum and maximum point of each bucket.
+
+    Args:
+        y: Y values in plotting order.
+        n_out: Approximate number of points to select (two per bucket).
+
+    Returns:
+        Sorted array of selected row positions, including the first and last.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+
+    n_buckets = max(n_out // 2, 1)
+    starts = np.arange(n_buckets) * n // n_buckets
+    return np.union1d([0, n - 1], bucket_extreme_indices(y, starts))
+
+
+def bucket_extreme_indices(y: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Find the minimum and maximum point of each bucket of consecutive points.
+
+    Args:
+        y: Y values in plotting order.
+        starts: Sorted first row position of each bucket (the first must be 0).
+
+    Returns:
+        Sorted array of the row positions of the bucket minima and maxima.
+        Buckets without any valid value contribute no points.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    counts = np.diff(np.append(starts, n))
+
+    # Bucket extremes (missing values never win), then the first point matching each
+    low = np.minimum.reduceat(np.where(np.isnan(y), np.inf, y), starts)
+    high = np.maximum.reduceat(np.where(np.isnan(y), -np.inf, y), starts)
+    indices = []
+    for extreme in (low, high):
+        matches = np.flatnonzero(y == np.repeat(extreme, counts))
+        first = np.searchsorted(matches, starts)
+        found = first < len(matches)
+        found[found] = matches[first[found]] < starts[found] + counts[found]
+        indices.append(matches[first[found]])
+
+    return np.unique(np.concatenate(indices))
+
+
+def decimate(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb',
+             keep: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Reduce a profile to a point budget while keeping its shape.
+
+    Args:
+        x: X values in plotting order.
+        y: Y values in plotting order.
+        max_points: Number of points to keep for the profile shape.
+        method: Decimation method, 'lttb' (Largest-Triangle-Three-Buckets) or
+            'minmax' (per-bucket minimum and maximum).
+        keep: Boolean mask of points that must always be kept, such as
+            anomalies and problem section boundaries (optional). These are
+            added on top of the budget.
+
+    Returns:
+        Sorted array of row positions to plot.
+    """
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+
+    if method == 'minmax':
+        selected = minmax_indices(y, max_points)
+    else:
+        if method != 'lttb':
+            logger.warning(f"Unknown decimation method '{method}' - using 'lttb'")
+        selected = lttb_indices(x, y, max_points)
+
+    if keep is not None:
+        selected = np.union1d(selected, np.flatnonzero(keep))
+
+    logger.info(f"Decimated {n} points to {len(selected)} using {method}")
+    return selected
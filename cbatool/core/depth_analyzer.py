@@ -146,8 +146,8 @@ class DepthAnalyzer(BaseAnalyzer):
             logger.error("Data or depth column not set for anomaly detection")
             return pd.DataFrame()
         
-        # Create a copy to avoid modifying original
-        result = self.data.copy()
+        # Work on a copy to avoid modifying the original (or in place on a shared frame)
+        result = self._working_data()
         
         logger.info(f"Detecting anomalies with parameters: max_depth={max_depth}, "
                    f"min_depth={min_depth}, spike_threshold={spike_threshold}")
@@ -175,7 +175,9 @@ class DepthAnalyzer(BaseAnalyzer):
         )
         
         # Store results for later use
+        self._register_derived_columns()
         self.analysis_results['anomalies'] = result[result['Is_Anomaly']].copy()
+        self.kp_index = None  # Rebuilt on the next KP query
         
         return result
     
@@ -216,7 +218,7 @@ class DepthAnalyzer(BaseAnalyzer):
             DataFrame with added spike anomaly detection columns.
         """
         # Calculate changes between adjacent measurements
-        data['Depth_Change'] = data[self.depth_column].diff().abs()
+        data['Depth_Change'] = np.abs(self._column_diff(data, self.depth_column))
         data['Is_Spike'] = data['Depth_Change'] > spike_threshold
         
         spike_count = data['Is_Spike'].sum()
@@ -316,8 +318,8 @@ class DepthAnalyzer(BaseAnalyzer):
             
         logger.info(f"Analyzing burial depth compliance against target of {self.target_depth}m...")
         
-        # Start with a copy of the data
-        result = self.data.copy()
+        # Start with a copy of the data (or the shared frame itself)
+        result = self._working_data()
         
         # Filter out anomalous points if requested
         analysis_data = result
@@ -363,6 +365,7 @@ class DepthAnalyzer(BaseAnalyzer):
                    f"({len(result) - non_compliant_count} of {len(result)} points)")
         
         # Store results for later use
+        self._register_derived_columns()
         self.analysis_results['depth_analysis'] = result
         self.analysis_results['compliance_percentage'] = compliance_percentage
         
@@ -384,6 +387,7 @@ class DepthAnalyzer(BaseAnalyzer):
             return pd.DataFrame()
             
         data = self.analysis_results['depth_analysis']
+        self.kp_index = None  # Rebuilt on the next KP query
         
         logger.info("Identifying and analyzing non-compliant sections...")
         
@@ -502,6 +506,44 @@ class DepthAnalyzer(BaseAnalyzer):
         else:
             return "Monitor during maintenance"
     
+    def _get_kp_intervals(self) -> pd.DataFrame:
+        """
+        Get the KP intervals of problem sections and anomalies for the KP index.
+        
+        Only results positioned by KP are indexed.
+        
+        Returns:
+            DataFrame with Start_KP, End_KP, Source, Severity and Label columns.
+        """
+        frames = []
+        
+        sections = self.analysis_results.get('problem_sections')
+        if isinstance(sections, pd.DataFrame) and 'Start_KP' in sections.columns:
+            sections = sections[sections['Position_Type'] == 'KP']
+            frames.append(pd.DataFrame({
+                'Start_KP': sections['Start_KP'].to_numpy(),
+                'End_KP': sections['End_KP'].to_numpy(),
+                'Source': 'depth_section',
+                'Severity': sections['Severity'].to_numpy(),
+                'Label': sections['Section_ID'].to_numpy()
+            }))
+        
+        anomalies = self.analysis_results.get('anomalies')
+        if isinstance(anomalies, pd.DataFrame) and self.kp_column and self.kp_column in anomalies.columns:
+            kp = anomalies[self.kp_column].to_numpy()
+            frames.append(pd.DataFrame({
+                'Start_KP': kp,
+                'End_KP': kp,
+                'Source': 'depth_anomaly',
+                'Severity': self._column_or_default(anomalies, 'Anomaly_Severity', 'Medium').to_numpy(),
+                'Label': anomalies.index.to_numpy(),
+                'Type': self._column_or_default(anomalies, 'Anomaly_Type', 'Unknown').to_numpy()
+            }))
+        
+        if not frames:
+            return super()._get_kp_intervals()
+        return pd.concat(frames, ignore_index=True)
+    
     def get_analysis_summary(self) -> Dict[str, Any]:
         """
         Get a summary of all analysis results.
@@ -567,20 +609,26 @@ class DepthAnalyzer(BaseAnalyzer):
                     total_length = sections['Length_Meters'].sum()
                     standardized["problem_sections"]["severity_breakdown"][severity_key]["total_length"] = total_length
         
-        # Populate details
-        for _, section in problem_sections.iterrows():
-            # Extract key information
-            position_type = section.get('Position_Type', '')
-            detail = {
-                "section_id": str(section.get('Section_ID', '')),
-                "severity": section.get('Severity', 'Medium').lower(),
-                "start_position": section.get(f'Start_{position_type}', 0.0),
-                "end_position": section.get(f'End_{position_type}', 0.0),
-                "length": section.get('Length_Meters', 0.0),
-                "deviation": section.get('Max_Deficit', 0.0),
-                "recommended_action": section.get('Recommendation', '')
-            }
-            standardized["problem_sections"]["details"].append(detail)
+        # Populate details, reading start/end from the columns of each section's position type
+        position_types = self._column_or_default(problem_sections, 'Position_Type', '')
+        start_position = pd.Series(0.0, index=problem_sections.index)
+        end_position = pd.Series(0.0, index=problem_sections.index)
+        for position_type in position_types.unique():
+            rows = position_types == position_type
+            if f'Start_{position_type}' in problem_sections.columns:
+                start_position = start_position.mask(rows, problem_sections[f'Start_{position_type}'])
+            if f'End_{position_type}' in problem_sections.columns:
+                end_position = end_position.mask(rows, problem_sections[f'End_{position_type}'])
+        
+        standardized["problem_sections"]["details"].extend(self._build_detail_records({
+            "section_id": self._column_or_default(problem_sections, 'Section_ID', '').astype(str),
+            "severity": self._column_or_default(problem_sections, 'Severity', 'Medium').str.lower(),
+            "start_position": start_position,
+            "end_position": end_position,
+            "length": self._column_or_default(problem_sections, 'Length_Meters', 0.0),
+            "deviation": self._column_or_default(problem_sections, 'Max_Deficit', 0.0),
+            "recommended_action": self._column_or_default(problem_sections, 'Recommendation', '')
+        }))
 
     def _populate_anomalies(self, standardized: Dict[str, Any]) -> None:
         """
@@ -609,19 +657,19 @@ class DepthAnalyzer(BaseAnalyzer):
         position_col = self.kp_column if self.kp_column else \
                        self.position_column if self.position_column else None
         
-        for idx, anomaly in anomalies.iterrows():
-            # Extract key information and create standardized entry
-            position_value = anomaly.get(position_col) if position_col and position_col in anomaly else idx
-            
-            detail = {
-                "anomaly_id": str(idx),
-                "type": anomaly.get('Anomaly_Type', 'Unknown'),
-                "severity": anomaly.get('Anomaly_Severity', 'Medium').lower(),
-                "position": position_value,
-                "deviation": anomaly.get('Depth_Deficit', 0.0),
-                "recommended_action": "Investigate anomaly"
-            }
-            standardized["anomalies"]["details"].append(detail)
+        if position_col and position_col in anomalies.columns:
+            position_values = anomalies[position_col]
+        else:
+            position_values = anomalies.index
+        
+        standardized["anomalies"]["details"].extend(self._build_detail_records({
+            "anomaly_id": anomalies.index.astype(str),
+            "type": self._column_or_default(anomalies, 'Anomaly_Type', 'Unknown'),
+            "severity": self._column_or_default(anomalies, 'Anomaly_Severity', 'Medium').str.lower(),
+            "position": position_values,
+            "deviation": self._column_or_default(anomalies, 'Depth_Deficit', 0.0),
+            "recommended_action": np.full(len(anomalies), "Investigate anomaly", dtype=object)
+        }))
 
     def _populate_compliance_metrics(self, standardized: Dict[str, Any]) -> None:
         """
@@ -0,0 +1,120 @@
+"""
+Figure templates module for CBAtool v2.0.
+
+This module contains the cached layout templates used to build figures as plain
+dictionaries. Each template is validated by Plotly once, the first time it is
+used, and every figure then starts from a copy of the validated layout instead
+of validating each property through go.Figure/update_layout on every call. The
+depth and position templates share one copy of the active Plotly theme.
+"""
+
+import copy
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Layout of the depth profile figure (the x-axis title is set per figure)
+DEPTH_LAYOUT = {
+    'title': {
+        'text': 'Cable Burial Depth Analysis',
+        'y': 0.95,
+        'x': 0.5,
+        'xanchor': 'center',
+        'yanchor': 'top'
+    },
+    'xaxis': {
+        'zeroline': True,
+        'zerolinecolor': 'rgba(0,0,0,0.2)',
+        'gridcolor': 'rgba(0,0,0,0.1)'
+    },
+    'yaxis': {
+        'title': {'text': 'Depth (m)'},
+        'autorange': 'reversed',  # Invert y-axis so deeper is lower
+        'zeroline': True,
+        'zerolinecolor': 'rgba(0,0,0,1)',
+        'gridcolor': 'rgba(0,0,0,0.05)'
+    },
+    'hovermode': 'closest',
+    'legend': {'title': {'text': 'Legend'}},
+    'plot_bgcolor': 'white',
+    'margin': {'l': 50, 'r': 50, 't': 80, 'b': 50},
+    'height': 600
+}
+
+# Layout of the position quality dashboard (applied on top of the subplot grid)
+POSITION_LAYOUT = {
+    'title': {'text': 'Position Quality Analysis'},
+    'showlegend': True,
+    'height': 800,
+    'width': 1000
+}
+
+
+@lru_cache(maxsize=None)
+def _validated_layout(name: str, theme: str, grid: Optional[Tuple] = None) -> Dict[str, Any]:
+    """
+    Build and validate a layout template once per name, theme and subplot grid.
+
+    Args:
+        name: Template name ('depth' or 'position').
+        theme: Name of the Plotly theme the template was built with.
+        grid: (rows, cols, subplot titles) of the subplot grid, for 'position'.
+
+    Returns:
+        Validated layout dictionary, including the Plotly theme.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    if name == 'depth':
+        fig = go.Figure(layout=DEPTH_LAYOUT)
+    elif name == 'position':
+        rows, cols, subplot_titles = grid
+        fig = make_subplots(rows=rows, cols=cols, subplot_titles=list(subplot_titles),
+                            vertical_spacing=0.1, horizontal_spacing=0.05)
+        fig.update_layout(POSITION_LAYOUT)
+    else:
+        raise ValueError(f"Unknown layout template '{name}'")
+
+    logger.debug(f"Layout template '{name}' validated for theme '{theme}'")
+    return fig.to_plotly_json()['layout']
+
+
+def get_layout_template(name: str, grid: Optional[Tuple] = None) -> Dict[str, Any]:
+    """
+    Get a copy of a validated layout template.
+
+    The copy can be modified freely; only the (read-only) Plotly theme is shared
+    between the copies.
+
+    Args:
+        name: Template name ('depth' or 'position').
+        grid: (rows, cols, subplot titles) of the subplot grid, for 'position'.
+
+    Returns:
+        Layout dictionary for a plain-dictionary figure.
+    """
+    import plotly.io as pio
+
+    template = _validated_layout(name, str(pio.templates.default), grid)
+    return {key: value if key == 'template' else copy.deepcopy(value) for key, value in template.items()}
+
+
+def subplot_axes(row: int, col: int, cols: int) -> Tuple[str, str]:
+    """
+    Get the axis references of a cell of a make_subplots grid.
+
+    Args:
+        row: Row of the cell (1-based).
+        col: Column of the cell (1-based).
+        cols: Number of columns in the grid.
+
+    Returns:
+        Tuple of the x and y axis references, e.g. ('x2', 'y2').
+    """
+    number = (row - 1) * cols + col
+    suffix = '' if number == 1 else str(number)
+    return f'x{suffix}', f'y{suffix}'
@@ -0,0 +1,177 @@
+"""
+HTML writer module for CBAtool v2.0.
+
+This module contains the compact typed-array encoding of figure data and a
+streaming HTML writer. The writer takes a figure dictionary in which large
+arrays are given as StreamedArray references to data columns, and encodes them
+into the HTML file chunk by chunk, so no full copy of the data is built in
+Plotly's object model or in the JSON text.
+"""
+
+import base64
+import numpy as np
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Compact HTML output: float arrays are stored as float32 when the rounding error
+# stays within this fraction of the median spacing between consecutive values
+FLOAT32_SPACING_TOLERANCE = 0.05
+
+# Values encoded per chunk (a multiple of 3, so base64 chunks join without padding)
+DEFAULT_CHUNK_POINTS = 3 * 65536
+
+_PLACEHOLDER = '__cbatool_streamed_array_{}__'
+
+
+def _chunks(values: np.ndarray, index: Optional[np.ndarray], chunk_points: int):
+    """Yield consecutive chunks of values (optionally selected by row index) as float64."""
+    count = len(values) if index is None else len(index)
+    for start in range(0, count, chunk_points):
+        if index is None:
+            chunk = values[start:start + chunk_points]
+        else:
+            chunk = values[index[start:start + chunk_points]]
+        yield np.asarray(chunk, dtype=np.float64)
+
+
+def typed_array_dtype(values: np.ndarray, index: Optional[np.ndarray] = None,
+                      chunk_points: int = DEFAULT_CHUNK_POINTS) -> str:
+    """
+    Choose the typed array dtype for a float array.
+
+    float32 is chosen when rounding keeps every value within
+    FLOAT32_SPACING_TOLERANCE of the median spacing between consecutive values
+    (so neighbouring points stay distinct), otherwise float64. The check runs
+    chunk by chunk; for arrays longer than one chunk the median spacing is the
+    median of the per-chunk medians.
+
+    Args:
+        values: Float array (or column) to encode.
+        index: Row positions to select from values (optional, all rows if None).
+        chunk_points: Number of values checked at a time.
+
+    Returns:
+        'f4' or 'f8'.
+    """
+    max_error = 0.0
+    spacings = []
+    for chunk in _chunks(values, index, chunk_points):
+        finite = chunk[np.isfinite(chunk)]
+        with np.errstate(over='ignore', invalid='ignore'):
+            error = np.abs(finite.astype(np.float32) - finite)
+        if error.size:
+            max_error = max(max_error, float(error.max()))
+        spacing = np.abs(np.diff(finite))
+        spacing = spacing[spacing > 0]
+        if spacing.size:
+            spacings.append(np.median(spacing))
+
+    if max_error == 0:
+        return 'f4'
+    if not spacings or not max_error <= FLOAT32_SPACING_TOLERANCE * np.median(spacings):
+        return 'f8'
+    return 'f4'
+
+
+def encode_typed_array(values: np.ndarray, compact: bool = True) -> Dict[str, str]:
+    """
+    Encode a float array as a base64 typed array for plotly.js.
+
+    Args:
+        values: Float array to encode.
+        compact: Whether to use float32 where the precision allows (float64 otherwise).
+
+    Returns:
+        Dictionary with the plotly.js typed array ('dtype' and base64 'bdata').
+    """
+    dtype = typed_array_dtype(values) if compact else 'f8'
+    values = np.asarray(values, dtype=np.float64).astype('<' + dtype)
+    return {'dtype': dtype, 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+
+
+class StreamedArray:
+    """
+    Reference to a data column that write_figure_html encodes chunk by chunk.
+
+    Attributes:
+        values (np.ndarray): Column values (not copied).
+        index (np.ndarray): Row positions to write, or None for all rows.
+        dtype (str): Typed array dtype ('f4' or 'f8').
+    """
+
+    def __init__(self, values: Any, index: Optional[np.ndarray] = None, compact: bool = True):
+        """
+        Initialize the streamed array.
+
+        Args:
+            values: Column values (a numpy array or pandas Series).
+            index: Row positions to write (optional, all rows if None).
+            compact: Whether to use float32 where the precision allows.
+        """
+        self.values = np.asarray(values)
+        self.index = index
+        self.dtype = typed_array_dtype(self.values, index) if compact else 'f8'
+
+    def __len__(self) -> int:
+        return len(self.values) if self.index is None else len(self.index)
+
+    def write(self, f, chunk_points: int = DEFAULT_CHUNK_POINTS) -> None:
+        """
+        Write the array as a plotly.js typed array to a text file.
+
+        Args:
+            f: Text file object to write to.
+            chunk_points: Number of values encoded at a time.
+        """
+        f.write(f'{{"dtype":"{self.dtype}","bdata":"')
+        for chunk in _chunks(self.values, self.index, chunk_points):
+            f.write(base64.b64encode(chunk.astype('<' + self.dtype).tobytes()).decode('ascii'))
+        f.write('"}')
+
+
+def _replace_streamed(obj: Any, streamed: List[StreamedArray]) -> Any:
+    """Replace StreamedArray values in a figure dictionary by placeholder strings."""
+    if isinstance(obj, StreamedArray):
+        streamed.append(obj)
+        return _PLACEHOLDER.format(len(streamed) - 1)
+    if isinstance(obj, dict):
+        return {key: _replace_streamed(value, streamed) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_streamed(value, streamed) for value in obj]
+    return obj
+
+
+def write_figure_html(figure: Dict[str, Any], output_file: str,
+                      include_plotlyjs: Union[str, bool] = 'cdn',
+                      config: Optional[Dict[str, Any]] = None,
+                      chunk_points: int = DEFAULT_CHUNK_POINTS) -> None:
+    """
+    Write a figure dictionary to an HTML file, streaming its StreamedArray values.
+
+    Plotly writes the page around placeholder strings; each placeholder is then
+    replaced by its array, encoded one chunk at a time.
+
+    Args:
+        figure: Figure dictionary ('data' and 'layout'); any value may be a StreamedArray.
+        output_file: Path of the HTML file.
+        include_plotlyjs: include_plotlyjs argument for plotly ('cdn', True or a .js path).
+        config: Plotly config for the page (optional).
+        chunk_points: Number of values encoded at a time.
+    """
+    import plotly.io as pio
+
+    streamed = []
+    page = pio.to_html(_replace_streamed(figure, streamed), include_plotlyjs=include_plotlyjs,
+                       full_html=True, config=config, validate=False)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for number, array in enumerate(streamed):
+            before, page = page.split(f'"{_PLACEHOLDER.format(number)}"', 1)
+            f.write(before)
+            array.write(f, chunk_points)
+        f.write(page)
+
+    logger.info(f"Streamed {sum(len(array) for array in streamed)} values to: {output_file}")
@@ -0,0 +1,185 @@
+"""
+KP interval index module for CBAtool v2.0.
+
+This module contains the KPIntervalIndex class, which indexes problem sections
+and anomalies by their KP (kilometer point) extent so that range and point
+queries do not need to scan the analysis DataFrames.
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class KPIntervalIndex:
+    """
+    Static interval index over KP ranges.
+
+    Intervals are sorted by start KP, so the intervals starting at or before the
+    end of a query range form a prefix found with one binary search. An implicit
+    balanced tree over that order stores the minimum and maximum end KP of each
+    node: nodes whose maximum end is before the query start are skipped, and
+    nodes whose minimum end reaches it are reported whole as one slice. Every
+    node visited below the root path holds at least one match, so a query costs
+    O(log n + k) when the matches are contiguous in start order (sections that
+    do not overlap, anomaly points) and never more than O(k log n), whatever
+    the nesting or overlap of the intervals.
+
+    Attributes:
+        intervals (pd.DataFrame): Indexed intervals with Start_KP, End_KP,
+            Source, Severity and Label columns (plus any extra columns given),
+            sorted by Start_KP.
+    """
+
+    COLUMNS = ['Start_KP', 'End_KP', 'Source', 'Severity', 'Label']
+
+    def __init__(self, intervals: Optional[pd.DataFrame] = None):
+        """
+        Build the index from a DataFrame of intervals.
+
+        Args:
+            intervals: DataFrame with Start_KP and End_KP columns, and optionally
+                Source, Severity, Label and any other columns describing each interval.
+        """
+        if intervals is None:
+            intervals = pd.DataFrame(columns=self.COLUMNS)
+
+        extra_columns = [column for column in intervals.columns if column not in self.COLUMNS]
+        intervals = intervals.reindex(columns=self.COLUMNS + extra_columns)
+        start = intervals['Start_KP'].to_numpy(dtype=float)
+        end = intervals['End_KP'].to_numpy(dtype=float)
+
+        # Drop intervals without a KP extent and normalise reversed intervals
+        valid = np.isfinite(start) & np.isfinite(end)
+        intervals = intervals[valid]
+        start, end = np.minimum(start[valid], end[valid]), np.maximum(start[valid], end[valid])
+
+        order = np.lexsort((end, start))
+        self.intervals = intervals.iloc[order].reset_index(drop=True)
+        self.intervals['Start_KP'] = start[order]
+        self.intervals['End_KP'] = end[order]
+
+        self._starts = start[order]
+        self._build_tree(end[order])
+
+        logger.info(f"KP index built: {len(self.intervals)} intervals")
+
+    def _build_tree(self, end: np.ndarray) -> None:
+        """
+        Build the implicit tree of minimum and maximum end KP over the sorted intervals.
+
+        Node 1 is the root and node i has children 2i and 2i + 1; the leaves
+        (intervals padded to a power of two) start at node self._size.
+        """
+        size = 1
+        while size < len(end):
+            size *= 2
+        self._size = size
+
+        # Padding leaves are never reported (they lie after every query prefix)
+        self._min_end = np.full(2 * size, -np.inf)
+        self._max_end = np.full(2 * size, -np.inf)
+        self._min_end[size:size + len(end)] = end
+        self._max_end[size:size + len(end)] = end
+
+        level = size
+        while level > 1:
+            children = slice(level, 2 * level)
+            parents = slice(level // 2, level)
+            self._min_end[parents] = np.minimum(self._min_end[children][0::2], self._min_end[children][1::2])
+            self._max_end[parents] = np.maximum(self._max_end[children][0::2], self._max_end[children][1::2])
+            level //= 2
+
+    @classmethod
+    def concat(cls, indexes: Iterable['KPIntervalIndex']) -> 'KPIntervalIndex':
+        """
+        Combine several indexes (e.g. from depth and position analyzers) into one.
+
+        Args:
+            indexes: Indexes to combine.
+
+        Returns:
+            KPIntervalIndex over the intervals of all indexes.
+        """
+        frames = [index.intervals for index in indexes if index is not None and len(index)]
+        if not frames:
+            return cls()
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def query_range(self, start_kp: float, end_kp: float) -> pd.DataFrame:
+        """
+        Find all intervals overlapping a KP range.
+
+        Args:
+            start_kp: Start of the query range (KP).
+            end_kp: End of the query range (KP).
+
+        Returns:
+            DataFrame of overlapping intervals, sorted by Start_KP.
+        """
+        return self.intervals.iloc[self._query_positions(start_kp, end_kp)]
+
+    def query_point(self, kp: float) -> pd.DataFrame:
+        """
+        Find all intervals containing a KP value.
+
+        Args:
+            kp: KP value to look up.
+
+        Returns:
+            DataFrame of intervals containing the KP, sorted by Start_KP.
+        """
+        return self.query_range(kp, kp)
+
+    def count_range(self, start_kp: float, end_kp: float) -> int:
+        """
+        Count the intervals overlapping a KP range without materialising them.
+
+        Args:
+            start_kp: Start of the query range (KP).
+            end_kp: End of the query range (KP).
+
+        Returns:
+            int: Number of overlapping intervals.
+        """
+        return int(sum(stop - start for start, stop in self._query_slices(start_kp, end_kp)))
+
+    def _query_slices(self, start_kp: float, end_kp: float) -> List[Tuple[int, int]]:
+        """Get the (start, stop) row slices of intervals overlapping [start_kp, end_kp], in order."""
+        start_kp, end_kp = min(start_kp, end_kp), max(start_kp, end_kp)
+
+        # An interval overlaps when it starts at/before the range end (a prefix
+        # of the sorted rows) and ends at/after the range start
+        prefix = int(np.searchsorted(self._starts, end_kp, side='right'))
+        if prefix == 0:
+            return []
+
+        slices = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, first, last = stack.pop()
+            if first >= prefix or self._max_end[node] < start_kp:
+                continue
+            if last <= prefix and self._min_end[node] >= start_kp:
+                if slices and slices[-1][1] == first:
+                    slices[-1] = (slices[-1][0], last)
+                else:
+                    slices.append((first, last))
+                continue
+            middle = (first + last) // 2
+            stack.append((2 * node + 1, middle, last))  # Left child is popped first
+            stack.append((2 * node, first, middle))
+        return slices
+
+    def _query_positions(self, start_kp: float, end_kp: float) -> np.ndarray:
+        """Get the sorted row positions of intervals overlapping [start_kp, end_kp]."""
+        slices = self._query_slices(start_kp, end_kp)
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, stop) for start, stop in slices])
@@ -5,6 +5,7 @@ This module contains the PositionAnalyzer class responsible for analyzing
 position data quality and detecting anomalies in cable position measurements.
 """
 
+import os
 import pandas as pd
 import numpy as np
 import logging
@@ -12,10 +13,87 @@ from typing import Optional, Dict, List, Tuple, Any, Union
 from datetime import datetime
 
 from .base_analyzer import BaseAnalyzer
+from .route_index import RouteIndex
+from .process_pool import create_process_pool
+from .projection import latlon_to_utm, utm_zone
+from .along_track import (segment_lengths, cumulative_distance, windowed_change,
+                          windowed_distance_ratio, reconstruct_kp)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def compute_kp_continuity(kp: np.ndarray, jump_threshold: float, reversal_threshold: float,
+                          median_increment: Optional[float] = None,
+                          kp_diff: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Compute KP differences, anomaly flags and continuity scores in one kernel.
+    
+    All outputs are written into preallocated arrays with in-place ufuncs, so the
+    only full-length temporaries are the returned arrays themselves.
+    
+    Args:
+        kp: KP values in survey order.
+        jump_threshold: Threshold for detecting KP jumps.
+        reversal_threshold: Threshold for detecting KP reversals and duplicates.
+        median_increment: Reference KP increment (optional, the median KP
+            difference is used when not provided).
+        kp_diff: Precomputed KP differences with NaN for the first point (optional,
+            used as-is and not modified).
+        
+    Returns:
+        Dictionary with 'kp_diff', 'is_jump', 'is_reversal', 'is_duplicate' and
+        'score' arrays, plus the 'median_increment' used.
+    """
+    kp = np.asarray(kp, dtype=float)
+    n = len(kp)
+    
+    score = np.empty(n)
+    is_jump = np.empty(n, dtype=bool)
+    is_reversal = np.empty(n, dtype=bool)
+    is_duplicate = np.empty(n, dtype=bool)
+    
+    # KP differences between consecutive points (first point has none)
+    if kp_diff is None:
+        kp_diff = np.empty(n)
+        kp_diff[:1] = np.nan
+        np.subtract(kp[1:], kp[:-1], out=kp_diff[1:])
+    has_diff = ~np.isnan(kp_diff)
+    
+    if median_increment is None:
+        valid_diff = kp_diff[has_diff]
+        median_increment = float(np.median(valid_diff)) if valid_diff.size else np.nan
+    
+    # Flags (comparisons with NaN are False, so the first point is never flagged)
+    np.greater(kp_diff, median_increment + jump_threshold, out=is_jump)
+    np.less(kp_diff, -reversal_threshold, out=is_reversal)
+    np.abs(kp_diff, out=score)
+    np.less(score, reversal_threshold, out=is_duplicate)
+    
+    # Sigmoid score based on deviation from the expected increment:
+    # 1 / (1 + exp(5 * (|diff / median - 1| - 0.5)))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        np.divide(kp_diff, median_increment, out=score)
+        np.subtract(score, 1.0, out=score)
+        np.abs(score, out=score)
+        np.subtract(score, 0.5, out=score)
+        np.multiply(score, 5, out=score)
+        np.exp(score, out=score)
+        np.add(score, 1.0, out=score)
+        np.divide(1.0, score, out=score)
+    
+    # Override scores for special cases
+    score[is_jump | is_reversal] = 0.0
+    score[~has_diff] = 1.0  # First point
+    
+    return {
+        'kp_diff': kp_diff,
+        'is_jump': is_jump,
+        'is_reversal': is_reversal,
+        'is_duplicate': is_duplicate,
+        'score': score,
+        'median_increment': median_increment
+    }
+
 class PositionAnalyzer(BaseAnalyzer):
     """
     Class for analyzing cable position data quality and detecting position anomalies.
@@ -26,6 +104,10 @@ class PositionAnalyzer(BaseAnalyzer):
         dcc_column (str): Name of the column containing DCC (distance cross course) values.
         lat_column (str): Name of the column containing latitude values.
         lon_column (str): Name of the column containing longitude values.
+        route_index (RouteIndex): Spatial index of the design route used to compute
+            DCC and route KP when the data has no DCC column.
+        utm_zone (Tuple[int, bool]): UTM zone number and southern hemisphere flag
+            used when latitude/longitude were projected to easting/northing.
         analysis_results (Dict): Dictionary containing results of various analyses.
     """
     
@@ -42,6 +124,9 @@ class PositionAnalyzer(BaseAnalyzer):
         self.lon_column = None
         self.easting_column = None
         self.northing_column = None
+        self.route_index = None
+        self.utm_zone = None
+        self._derived_columns = {}  # Column attributes pointing at columns the analysis added
         
     def _set_specific_columns(self, dcc_column: Optional[str] = None, 
                              lat_column: Optional[str] = None, 
@@ -63,6 +148,9 @@ class PositionAnalyzer(BaseAnalyzer):
         Returns:
             bool: True if columns were set successfully, False otherwise.
         """
+        # Columns set here are the caller's choice, not derived by an earlier analysis
+        self._derived_columns = {}
+        
         # Set DCC column if provided
         if dcc_column and dcc_column in self.data.columns:
             self.dcc_column = dcc_column
@@ -108,31 +196,96 @@ class PositionAnalyzer(BaseAnalyzer):
             
         return True
     
+    def set_design_route(self, route: Union[RouteIndex, pd.DataFrame, str],
+                         easting_column: Optional[str] = None,
+                         northing_column: Optional[str] = None,
+                         kp_column: Optional[str] = None) -> bool:
+        """
+        Set the design route (RPL) used to compute DCC and route KP from coordinates.
+        
+        Args:
+            route: A prebuilt RouteIndex, a DataFrame of route vertices, or the path
+                to a route file.
+            easting_column: Name of the route easting column (required unless a
+                RouteIndex is given).
+            northing_column: Name of the route northing column (required unless a
+                RouteIndex is given).
+            kp_column: Name of the route KP column (optional).
+            
+        Returns:
+            bool: True if the design route was set successfully, False otherwise.
+        """
+        try:
+            if isinstance(route, RouteIndex):
+                self.route_index = route
+            elif not easting_column or not northing_column:
+                logger.error("Route easting and northing columns are required to load a design route")
+                return False
+            elif isinstance(route, pd.DataFrame):
+                self.route_index = RouteIndex.from_dataframe(
+                    route, easting_column, northing_column, kp_column=kp_column)
+            else:
+                self.route_index = RouteIndex.from_file(
+                    route, easting_column, northing_column, kp_column=kp_column)
+            
+            # A DCC column derived from a previous route no longer applies
+            self._reset_derived_columns()
+            logger.info("Design route set for position analysis")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error setting design route: {str(e)}")
+            return False
+    
     def analyze_position_data(self, kp_jump_threshold: float = 0.1, 
-                        kp_reversal_threshold: float = 0.0001) -> bool:
+                        kp_reversal_threshold: float = 0.0001, lean: bool = False,
+                        n_jobs: int = 1, chunk_size: Optional[int] = None) -> bool:
         """
         Perform analysis on position data to detect anomalies and assess quality.
         
         Args:
             kp_jump_threshold: Threshold for detecting jumps in KP values.
             kp_reversal_threshold: Threshold for detecting reversals in KP values.
+            lean: Whether to skip adding intermediate columns to the results.
+            n_jobs: Number of worker processes (-1 uses all CPU cores).
+            chunk_size: Number of rows per chunk when running in parallel.
             
         Returns:
             bool: True if analysis was successful, False otherwise.
         """
         return self.analyze_data(
             kp_jump_threshold=kp_jump_threshold, 
-            kp_reversal_threshold=kp_reversal_threshold
+            kp_reversal_threshold=kp_reversal_threshold,
+            lean=lean,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size
         )
     
     def analyze_data(self, kp_jump_threshold: float = 0.1, 
-                   kp_reversal_threshold: float = 0.0001, **kwargs) -> bool:
+                   kp_reversal_threshold: float = 0.0001, lean: bool = False,
+                   n_jobs: int = 1, chunk_size: Optional[int] = None,
+                   kp_drift_threshold: float = 0.01, kp_drift_window: float = 1.0,
+                   consistency_window: int = 5, project_coordinates: bool = True, **kwargs) -> bool:
         """
         Perform analysis on position data to detect anomalies and assess quality.
         
         Args:
             kp_jump_threshold: Threshold for detecting jumps in KP values.
             kp_reversal_threshold: Threshold for detecting reversals in KP values.
+            lean: Whether to skip adding intermediate columns (KP_Diff and the
+                coordinate differences) to the results, keeping only flags and scores.
+            n_jobs: Number of worker processes used to score the data in chunks
+                (1 runs serially, -1 uses all CPU cores).
+            chunk_size: Number of rows per chunk when running in parallel (optional,
+                defaults to an even split across the worker processes).
+            kp_drift_threshold: Deviation (kilometers) of the reported KP from the
+                along-track distance above which a point is flagged as drifting.
+            kp_drift_window: Length of track (kilometers) over which the local
+                relation between KP and along-track distance is fitted for each point.
+            consistency_window: Number of points over which coordinate progress is
+                compared with KP progress.
+            project_coordinates: Whether to project latitude/longitude to UTM
+                easting/northing when the data has no easting/northing columns.
             **kwargs: Additional parameters not used by this analyzer.
             
         Returns:
@@ -144,28 +297,44 @@ class PositionAnalyzer(BaseAnalyzer):
             
         logger.info("Starting position data analysis...")
         
-        # Make a working copy of the data
-        result = self.data.copy()
-        
-        # Analyze KP continuity
-        result = self._analyze_kp_continuity(result, kp_jump_threshold, kp_reversal_threshold)
-        
-        # Analyze cross-track deviation if DCC column is available
-        if self.dcc_column:
-            result = self._analyze_cross_track_deviation(result)
-        
-        # Analyze coordinate consistency if coordinate columns are available
-        if self.lat_column and self.lon_column:
-            result = self._analyze_coordinate_consistency(result)
-        elif self.easting_column and self.northing_column:
-            result = self._analyze_coordinate_consistency(result)
-        
-        # Calculate overall position quality score
-        result = self._calculate_position_quality(result)
+        # Columns derived by a previous run are derived again from the current data
+        self._reset_derived_columns()
+        self.utm_zone = None
+        
+        # Make a working copy of the data (or work in place on a shared frame)
+        result = self._working_data()
+        
+        # Use metric coordinates for the analysis if only latitude/longitude are available
+        if project_coordinates and self.lat_column and self.lon_column and \
+                not (self.easting_column and self.northing_column):
+            result = self._project_coordinates(result)
+        
+        # Derive DCC and route KP from the design route if no DCC column is available
+        if not self.dcc_column and self.route_index is not None:
+            result = self._compute_route_position(result)
+        
+        # Analyze coordinate consistency if coordinate columns are available. Along-track
+        # distance accumulates over the whole survey, so this runs before any chunking.
+        if (self.easting_column and self.northing_column) or (self.lat_column and self.lon_column):
+            result = self._analyze_coordinate_consistency(result, lean=lean,
+                                                          drift_threshold=kp_drift_threshold,
+                                                          drift_window=kp_drift_window,
+                                                          window=consistency_window)
+        
+        # Score every position, in parallel chunks if requested
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs > 1 and len(result) > 1:
+            result = self._score_positions_parallel(
+                result, kp_jump_threshold, kp_reversal_threshold, lean, n_jobs, chunk_size)
+        else:
+            result = self._score_positions(result, kp_jump_threshold, kp_reversal_threshold, lean)
         
         # Store results for later use
+        self._register_derived_columns()
         self.data = result  # Update data with analysis results
         self.analysis_results['position_analysis'] = result
+        self.kp_index = None  # Rebuilt on the next KP query
         
         # Calculate summary statistics
         self._calculate_summary_statistics()
@@ -173,55 +342,218 @@ class PositionAnalyzer(BaseAnalyzer):
         logger.info("Position analysis completed successfully")
         return True
     
-    def _analyze_kp_continuity(self, data: pd.DataFrame, jump_threshold: float, 
-                             reversal_threshold: float) -> pd.DataFrame:
+    def _score_positions(self, data: pd.DataFrame, jump_threshold: float, reversal_threshold: float,
+                         lean: bool = False, median_increment: Optional[float] = None) -> pd.DataFrame:
         """
-        Analyze continuity of KP (Kilometer Point) values.
+        Run the per-point analysis steps and calculate the position quality.
         
         Args:
             data: DataFrame to analyze.
             jump_threshold: Threshold for detecting KP jumps.
             reversal_threshold: Threshold for detecting KP reversals.
+            lean: Whether to skip adding intermediate columns.
+            median_increment: Reference KP increment (optional, computed from the data
+                when not provided).
             
         Returns:
-            DataFrame with added KP continuity analysis columns.
+            DataFrame with added analysis columns.
         """
-        logger.info("Analyzing KP continuity...")
+        # Analyze KP continuity
+        data = self._analyze_kp_continuity(data, jump_threshold, reversal_threshold, lean=lean,
+                                           median_increment=median_increment)
         
-        # Calculate KP differences between consecutive points
-        data['KP_Diff'] = data[self.kp_column].diff()
+        # Analyze cross-track deviation if DCC column is available
+        if self.dcc_column:
+            data = self._analyze_cross_track_deviation(data)
         
-        # Calculate median KP increment for reference
-        median_kp_increment = data['KP_Diff'].median()
-        logger.info(f"Median KP increment: {median_kp_increment:.6f}")
+        # Calculate overall position quality score
+        return self._calculate_position_quality(data)
+    
+    def _score_positions_parallel(self, data: pd.DataFrame, jump_threshold: float,
+                                  reversal_threshold: float, lean: bool, n_jobs: int,
+                                  chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Score positions in row chunks on multiple worker processes.
         
-        # Detect KP jumps (large gaps)
-        data['Is_KP_Jump'] = data['KP_Diff'] > (median_kp_increment + jump_threshold)
+        The median KP increment is computed over the whole survey up front, and every
+        chunk after the first carries one leading overlap row so that differences at
+        chunk boundaries use the true previous point. Every step is point-wise once
+        those are fixed, so the stitched result matches the serial path exactly;
+        problem sections crossing chunk boundaries are found on the stitched data.
         
-        # Detect KP reversals (negative progression)
-        data['Is_KP_Reversal'] = data['KP_Diff'] < -reversal_threshold
+        Args:
+            data: DataFrame to analyze.
+            jump_threshold: Threshold for detecting KP jumps.
+            reversal_threshold: Threshold for detecting KP reversals.
+            lean: Whether to skip adding intermediate columns.
+            n_jobs: Number of worker processes.
+            chunk_size: Number of rows per chunk (optional).
+            
+        Returns:
+            DataFrame with added analysis columns.
+        """
+        median_increment = compute_kp_continuity(
+            data[self.kp_column].to_numpy(dtype=float), jump_threshold, reversal_threshold
+        )['median_increment']
+        
+        if not chunk_size:
+            chunk_size = -(-len(data) // n_jobs)
+        starts = range(0, len(data), chunk_size)
+        
+        columns = {
+            'kp_column': self.kp_column,
+            'dcc_column': self.dcc_column,
+            'lat_column': self.lat_column,
+            'lon_column': self.lon_column,
+            'easting_column': self.easting_column,
+            'northing_column': self.northing_column
+        }
         
-        # Detect KP duplicates (zero progression)
-        data['Is_KP_Duplicate'] = (data['KP_Diff'].abs() < reversal_threshold) & (~data['KP_Diff'].isna())
+        # Only ship the input columns to the workers and get the added columns back
+        input_columns = [column for column in columns.values() if column]
+        if 'Coord_Consistency_Score' in data.columns:
+            input_columns.append('Coord_Consistency_Score')
+        inputs = data[list(dict.fromkeys(input_columns))]
+        
+        logger.info(f"Scoring {len(data)} positions in {len(starts)} chunks on {n_jobs} processes...")
+        
+        try:
+            # Spawned (not forked) when the analysis runs on a worker thread of the UI
+            with create_process_pool(n_jobs) as executor:
+                futures = []
+                for start in starts:
+                    overlap = 1 if start > 0 else 0
+                    chunk = inputs.iloc[start - overlap:start + chunk_size]
+                    futures.append(executor.submit(
+                        _score_position_chunk, chunk, columns, jump_threshold,
+                        reversal_threshold, lean, median_increment, overlap))
+                chunks = [future.result() for future in futures]
+        except Exception as e:
+            logger.warning(f"Parallel position analysis failed ({str(e)}) - running serially")
+            return self._score_positions(data, jump_threshold, reversal_threshold, lean, median_increment)
+        
+        # Stitch the chunk columns back into the working data
+        stitched = pd.concat(chunks)
+        for column in stitched.columns:
+            data[column] = stitched[column].array
+        return data
+    
+    def _project_coordinates(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Project latitude/longitude to UTM easting/northing.
         
-        # Count anomalies
-        jump_count = data['Is_KP_Jump'].sum()
-        reversal_count = data['Is_KP_Reversal'].sum()
-        duplicate_count = data['Is_KP_Duplicate'].sum()
+        All points are projected into the UTM zone of the median position.
         
-        logger.info(f"Found {jump_count} KP jumps, {reversal_count} KP reversals, and {duplicate_count} KP duplicates")
+        Args:
+            data: DataFrame to analyze.
+            
+        Returns:
+            DataFrame with added Easting_UTM and Northing_UTM columns (unchanged
+            if there are no finite positions to project).
+        """
+        lat = data[self.lat_column].to_numpy(dtype=float)
+        lon = data[self.lon_column].to_numpy(dtype=float)
+        data_zone = utm_zone(lat, lon)
+        if data_zone is None:
+            logger.warning("No valid latitude/longitude values - skipping coordinate projection")
+            return data
+        
+        easting, northing, zone, south = latlon_to_utm(lat, lon, *data_zone)
+        data['Easting_UTM'] = easting
+        data['Northing_UTM'] = northing
+        
+        # Use the projected coordinates for the easting/northing analysis path
+        self._use_derived_column('easting_column', 'Easting_UTM')
+        self._use_derived_column('northing_column', 'Northing_UTM')
+        self.utm_zone = (zone, south)
+        logger.info(f"Projected latitude/longitude to UTM zone {zone}{'S' if south else 'N'}")
+        
+        return data
+    
+    def _use_derived_column(self, attribute: str, column: str) -> None:
+        """
+        Point a column attribute at a column added by the analysis.
+        
+        Args:
+            attribute: Name of the column attribute (e.g. 'dcc_column').
+            column: Name of the derived column.
+        """
+        setattr(self, attribute, column)
+        self._derived_columns[attribute] = column
+    
+    def _reset_derived_columns(self) -> None:
+        """Clear column attributes that still point at columns derived by an earlier analysis."""
+        for attribute, column in self._derived_columns.items():
+            if getattr(self, attribute) == column:
+                setattr(self, attribute, None)
+        self._derived_columns = {}
+    
+    def _compute_route_position(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute DCC and route KP by projecting survey positions onto the design route.
+        
+        Args:
+            data: DataFrame to analyze.
+            
+        Returns:
+            DataFrame with added Route_KP and Route_DCC columns.
+        """
+        if not (self.easting_column and self.northing_column):
+            logger.warning("Easting/northing columns are required to compute DCC from the design route")
+            return data
+            
+        logger.info("Computing DCC from design route...")
+        
+        route_kp, route_dcc = self.route_index.project(
+            data[self.easting_column].to_numpy(dtype=float),
+            data[self.northing_column].to_numpy(dtype=float)
+        )
+        data['Route_KP'] = route_kp
+        data['Route_DCC'] = route_dcc
+        
+        # Use the computed DCC for cross-track analysis
+        self._use_derived_column('dcc_column', 'Route_DCC')
+        logger.info(f"Computed route KP and DCC for {np.isfinite(route_dcc).sum()} points")
+        
+        return data
+    
+    def _analyze_kp_continuity(self, data: pd.DataFrame, jump_threshold: float, 
+                             reversal_threshold: float, lean: bool = False,
+                             median_increment: Optional[float] = None) -> pd.DataFrame:
+        """
+        Analyze continuity of KP (Kilometer Point) values.
+        
+        Args:
+            data: DataFrame to analyze.
+            jump_threshold: Threshold for detecting KP jumps.
+            reversal_threshold: Threshold for detecting KP reversals.
+            lean: Whether to skip adding the KP_Diff column.
+            median_increment: Reference KP increment (optional, computed from the data
+                when not provided).
+            
+        Returns:
+            DataFrame with added KP continuity analysis columns.
+        """
+        logger.info("Analyzing KP continuity...")
         
-        # Calculate KP continuity score (1.0 = perfect, 0.0 = problematic)
-        # Normalize KP difference by median increment
-        normalized_diff = data['KP_Diff'] / median_kp_increment
+        continuity = compute_kp_continuity(
+            data[self.kp_column].to_numpy(dtype=float), jump_threshold, reversal_threshold,
+            median_increment=median_increment, kp_diff=self._column_diff(data, self.kp_column))
+        logger.info(f"Median KP increment: {continuity['median_increment']:.6f}")
         
-        # Score based on deviation from expected increment
-        data['KP_Continuity_Score'] = 1.0 / (1.0 + np.exp(5 * (abs(normalized_diff - 1.0) - 0.5)))
+        if not lean:
+            data['KP_Diff'] = continuity['kp_diff']
+        data['Is_KP_Jump'] = continuity['is_jump']
+        data['Is_KP_Reversal'] = continuity['is_reversal']
+        data['Is_KP_Duplicate'] = continuity['is_duplicate']
+        data['KP_Continuity_Score'] = continuity['score']
         
-        # Override scores for special cases
-        data.loc[data['Is_KP_Jump'], 'KP_Continuity_Score'] = 0.0
-        data.loc[data['Is_KP_Reversal'], 'KP_Continuity_Score'] = 0.0
-        data.loc[data['KP_Diff'].isna(), 'KP_Continuity_Score'] = 1.0  # First point
+        # Count anomalies
+        jump_count = np.count_nonzero(continuity['is_jump'])
+        reversal_count = np.count_nonzero(continuity['is_reversal'])
+        duplicate_count = np.count_nonzero(continuity['is_duplicate'])
+        
+        logger.info(f"Found {jump_count} KP jumps, {reversal_count} KP reversals, and {duplicate_count} KP duplicates")
         
         return data
     
@@ -256,62 +588,82 @@ class PositionAnalyzer(BaseAnalyzer):
         
         return data
     
-    def _analyze_coordinate_consistency(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _analyze_coordinate_consistency(self, data: pd.DataFrame, lean: bool = False,
+                                        drift_threshold: float = 0.01, window: int = 5,
+                                        drift_window: float = 1.0) -> pd.DataFrame:
         """
-        Analyze consistency of coordinate progression.
+        Analyze consistency of coordinate progression against KP.
+        
+        Computes the cumulative along-track distance from the coordinates, compares
+        it with the reported KP to flag drift and reconstruct missing KP values, and
+        scores each point by the ratio of distance travelled to KP progress over a
+        window of neighbouring points.
         
         Args:
             data: DataFrame to analyze.
+            lean: Whether to skip adding the intermediate coordinate change columns.
+            drift_threshold: KP drift (kilometers) above which a point is flagged.
+            window: Number of points over which distance and KP progress are compared.
+            drift_window: Length of track (kilometers) of the local KP fit used for drift.
             
         Returns:
             DataFrame with added coordinate consistency analysis columns.
         """
+        intermediates = {}
+        
         # Determine which coordinate system to use
         if self.easting_column and self.northing_column:
             logger.info("Analyzing coordinate consistency using Easting/Northing...")
             
-            # Calculate distance using Easting/Northing (simpler than lat/lon)
-            data['Easting_Diff'] = data[self.easting_column].diff()
-            data['Northing_Diff'] = data[self.northing_column].diff()
-            
-            # Simple Euclidean distance
-            data['Coord_Change'] = np.sqrt(data['Easting_Diff']**2 + data['Northing_Diff']**2)
-            
-            # Expected coordinate change based on KP difference (1 KP = 1000 meters)
-            data['Expected_Coord_Change'] = data['KP_Diff'] * 1000
+            intermediates['Easting_Diff'] = self._column_diff(data, self.easting_column)
+            intermediates['Northing_Diff'] = self._column_diff(data, self.northing_column)
+            coord_change = np.hypot(intermediates['Easting_Diff'], intermediates['Northing_Diff'])
             
         elif self.lat_column and self.lon_column:
             logger.info("Analyzing coordinate consistency using Latitude/Longitude...")
             
-            # Calculate using latitude/longitude
-            data['Lat_Diff'] = data[self.lat_column].diff()
-            data['Lon_Diff'] = data[self.lon_column].diff()
+            intermediates['Lat_Diff'] = self._column_diff(data, self.lat_column)
+            intermediates['Lon_Diff'] = self._column_diff(data, self.lon_column)
             
-            # Simple Euclidean distance (not actual distance but useful for relative comparison)
-            # In a real implementation, use the Haversine formula for actual distances
-            data['Coord_Change'] = np.sqrt(data['Lat_Diff']**2 + data['Lon_Diff']**2)
-            
-            # Expected coordinate change based on KP difference
-            # Rough approximation: 1 KP = 0.01 degrees (very approximate)
-            data['Expected_Coord_Change'] = data['KP_Diff'] * 0.01
+            # Great-circle distance between consecutive points (meters)
+            coord_change = segment_lengths(data[self.lon_column].to_numpy(dtype=float),
+                                           data[self.lat_column].to_numpy(dtype=float),
+                                           geographic=True)
         else:
             logger.warning("No coordinate columns available for coordinate consistency analysis")
-            # Initialize with empty values so subsequent code still works
-            data['Coord_Change'] = 0
-            data['Expected_Coord_Change'] = 0
-        
-        # Detect coordinate inconsistencies
-        data['Coord_Change_Ratio'] = np.where(
-            data['Expected_Coord_Change'] > 0,
-            data['Coord_Change'] / data['Expected_Coord_Change'],
-            np.nan
-        )
+            return data
+        
+        # Cumulative along-track distance (meters)
+        along_track = cumulative_distance(coord_change)
+        kp = data[self.kp_column].to_numpy(dtype=float)
+        
+        # Compare with the reported KP: flag drift and fill missing KP values
+        reconstruction = reconstruct_kp(kp, along_track, drift_threshold, drift_window)
+        logger.info(f"KP vs along-track fit: {reconstruction['scale']:.4f} KP/km, "
+                   f"{np.count_nonzero(reconstruction['is_drift'])} points drift more than {drift_threshold}km, "
+                   f"{np.count_nonzero(reconstruction['is_reconstructed'])} KP values reconstructed")
+        
+        # Distance travelled against KP progress over a window of points
+        change_ratio = windowed_distance_ratio(along_track, kp, window)
+        
+        intermediates['Coord_Change'] = coord_change
+        intermediates['Expected_Coord_Change'] = windowed_change(kp, window) * 1000
+        intermediates['Coord_Change_Ratio'] = change_ratio
+        if not lean:
+            for column, values in intermediates.items():
+                data[column] = values
+        
+        data['Along_Track_Distance'] = along_track
+        data['KP_Reconstructed'] = reconstruction['kp']
+        data['Is_KP_Reconstructed'] = reconstruction['is_reconstructed']
+        data['KP_Drift'] = reconstruction['drift']
+        data['Is_KP_Drift'] = reconstruction['is_drift']
         
         # Score coordinate consistency (1.0 = perfect, 0.0 = problematic)
-        data['Coord_Consistency_Score'] = np.exp(-abs(data['Coord_Change_Ratio'] - 1.0) * 2)
+        consistency_score = np.exp(-np.abs(change_ratio - 1.0) * 2)
         
         # Fill NaNs with 1.0 (first point, etc.)
-        data['Coord_Consistency_Score'] = data['Coord_Consistency_Score'].fillna(1.0)
+        data['Coord_Consistency_Score'] = np.where(np.isnan(consistency_score), 1.0, consistency_score)
         
         return data
     
@@ -380,6 +732,15 @@ class PositionAnalyzer(BaseAnalyzer):
                 'significant_deviations': data['Is_Significant_Deviation'].sum()
             }
         
+        # Add along-track statistics if coordinates were analyzed
+        if 'Along_Track_Distance' in data.columns:
+            summary['along_track_statistics'] = {
+                'along_track_length': data['Along_Track_Distance'].iloc[-1] / 1000 if len(data) else 0.0,
+                'max_kp_drift': data['KP_Drift'].abs().max(),
+                'kp_drift_points': data['Is_KP_Drift'].sum(),
+                'kp_reconstructed_points': data['Is_KP_Reconstructed'].sum()
+            }
+        
         # Store summary
         self.analysis_results['summary'] = summary
         
@@ -399,7 +760,7 @@ class PositionAnalyzer(BaseAnalyzer):
             position_summary = self.analysis_results['summary']
             
             for key, value in position_summary.items():
-                if key not in ['quality_counts', 'anomalies', 'dcc_statistics'] and not isinstance(value, dict):
+                if key not in ['quality_counts', 'anomalies', 'dcc_statistics', 'along_track_statistics'] and not isinstance(value, dict):
                     summary[key] = value
                     
             # Add anomaly counts
@@ -432,89 +793,113 @@ class PositionAnalyzer(BaseAnalyzer):
             return pd.DataFrame()
             
         data = self.analysis_results['position_analysis']
+        self.kp_index = None  # Rebuilt on the next KP query
         
         # Find sections with poor quality
-        data['Is_Problem'] = data['Position_Quality'] == 'Poor'
-        
-        # Mark segment starts
-        data['Segment_Start'] = (data['Is_Problem'] & ~data['Is_Problem'].shift(fill_value=False))
-        
-        # Assign segment IDs
-        data['Segment_ID'] = data['Segment_Start'].cumsum()
+        is_problem = (data['Position_Quality'] == 'Poor').to_numpy()
+        data['Is_Problem'] = is_problem
+        
+        # Locate run boundaries of consecutive problem points
+        padded = np.concatenate(([False], is_problem, [False]))
+        edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+        run_starts = edges[::2]
+        run_ends = edges[1::2]
+        
+        # Mark segment starts and assign segment IDs
+        segment_start = np.zeros(len(data), dtype=bool)
+        segment_start[run_starts] = True
+        data['Segment_Start'] = segment_start
+        segment_ids = np.cumsum(segment_start).astype(float)
+        segment_ids[~is_problem] = np.nan
+        data['Segment_ID'] = segment_ids
+        self._register_derived_columns()
+        
+        # Keep only segments long enough to report
+        run_ids = np.arange(1, len(run_starts) + 1)
+        keep = (run_ends - run_starts) >= min_section_length
+        if not keep.any():
+            logger.info("No position problem sections identified")
+            self.analysis_results['problem_sections'] = pd.DataFrame()
+            return pd.DataFrame()
         
-        # Clear segment IDs for non-problem points
-        data.loc[~data['Is_Problem'], 'Segment_ID'] = np.nan
+        # Aggregate every run in one pass over the problem points
+        problem_positions = np.flatnonzero(is_problem)
+        offsets = np.concatenate(([0], np.cumsum(run_ends - run_starts)[:-1]))
+        counts = run_ends - run_starts
+        
+        def reduce_runs(values: np.ndarray, ufunc: np.ufunc) -> np.ndarray:
+            return ufunc.reduceat(values[problem_positions], offsets)[keep]
+        
+        def mean_runs(values: np.ndarray) -> np.ndarray:
+            finite = np.isfinite(values)
+            totals = reduce_runs(np.where(finite, values, 0.0), np.add)
+            valid = reduce_runs(finite.astype(np.int64), np.add)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return totals / valid
+        
+        kp = data[self.kp_column].to_numpy(dtype=float)
+        start_kp = reduce_runs(kp, np.fmin)
+        end_kp = reduce_runs(kp, np.fmax)
+        
+        index = data.index.to_numpy()
+        if np.issubdtype(index.dtype, np.number):
+            start_index = reduce_runs(index, np.minimum)
+            end_index = reduce_runs(index, np.maximum)
+        else:
+            start_index = index[run_starts[keep]]
+            end_index = index[run_ends[keep] - 1]
+        
+        avg_quality = mean_runs(data['Position_Quality_Score'].to_numpy(dtype=float))
+        has_jumps = reduce_runs(data['Is_KP_Jump'].to_numpy(dtype=bool), np.logical_or)
+        has_reversals = reduce_runs(data['Is_KP_Reversal'].to_numpy(dtype=bool), np.logical_or)
+        
+        sections_df = pd.DataFrame({
+            'Segment_ID': run_ids[keep],
+            'Start_KP': start_kp,
+            'End_KP': end_kp,
+            'Length_KP': end_kp - start_kp,
+            'Point_Count': counts[keep],
+            'Start_Index': start_index,
+            'End_Index': end_index,
+            'Avg_Quality_Score': avg_quality,
+            'Has_KP_Jumps': has_jumps,
+            'Has_KP_Reversals': has_reversals,
+            'Severity': self._determine_segment_severity(has_reversals, has_jumps, avg_quality)
+        })
+        
+        # Add DCC information if available
+        if self.dcc_column:
+            dcc_abs = np.abs(data[self.dcc_column].to_numpy(dtype=float))
+            sections_df['Max_DCC'] = reduce_runs(dcc_abs, np.fmax)
+            sections_df['Avg_DCC'] = mean_runs(dcc_abs)
         
-        sections = []
+        sections_df = sections_df.sort_values('Start_KP')
         
-        # Analyze each segment
-        for segment_id, group in data[data['Is_Problem']].groupby('Segment_ID'):
-            if len(group) < min_section_length:
-                continue
-                
-            segment = {
-                'Segment_ID': int(segment_id),
-                'Start_KP': group[self.kp_column].min(),
-                'End_KP': group[self.kp_column].max(),
-                'Length_KP': group[self.kp_column].max() - group[self.kp_column].min(),
-                'Point_Count': len(group),
-                'Start_Index': group.index.min(),
-                'End_Index': group.index.max(),
-                'Avg_Quality_Score': group['Position_Quality_Score'].mean(),
-                'Has_KP_Jumps': group['Is_KP_Jump'].any(),
-                'Has_KP_Reversals': group['Is_KP_Reversal'].any(),
-                'Severity': self._determine_segment_severity(group)
-            }
-            
-            # Add DCC information if available
-            if self.dcc_column:
-                segment['Max_DCC'] = group[self.dcc_column].abs().max()
-                segment['Avg_DCC'] = group[self.dcc_column].abs().mean()
-            
-            sections.append(segment)
+        # Store in results
+        self.analysis_results['problem_sections'] = sections_df
         
-        # Create DataFrame from sections
-        if sections:
-            sections_df = pd.DataFrame(sections)
-            sections_df = sections_df.sort_values('Start_KP')
-            
-            # Store in results
-            self.analysis_results['problem_sections'] = sections_df
+        logger.info(f"Identified {len(sections_df)} position problem sections")
+        return sections_df
             
-            logger.info(f"Identified {len(sections_df)} position problem sections")
-            return sections_df
-        else:
-            logger.info("No position problem sections identified")
-            self.analysis_results['problem_sections'] = pd.DataFrame()
-            return pd.DataFrame()
-            
-    def _determine_segment_severity(self, segment_group: pd.DataFrame) -> str:
+    def _determine_segment_severity(self, has_reversals: np.ndarray, has_jumps: np.ndarray,
+                                    avg_quality: np.ndarray) -> np.ndarray:
         """
-        Determine severity of a problem segment based on quality score and anomalies.
+        Determine severity of problem segments based on quality score and anomalies.
         
         Args:
-            segment_group: DataFrame containing the segment data
+            has_reversals: Whether each segment contains KP reversals
+            has_jumps: Whether each segment contains KP jumps
+            avg_quality: Average position quality score of each segment
             
         Returns:
-            str: Severity level ('High', 'Medium', or 'Low')
+            np.ndarray: Severity level ('High', 'Medium', or 'Low') per segment
         """
-        # Check for KP reversals (highest priority)
-        if segment_group['Is_KP_Reversal'].any():
-            return 'High'
-            
-        # Check for KP jumps
-        if segment_group['Is_KP_Jump'].any():
-            return 'Medium'
-            
-        # Check average quality score
-        avg_quality = segment_group['Position_Quality_Score'].mean()
-        
-        if avg_quality < 0.2:
-            return 'High'
-        elif avg_quality < 0.5:
-            return 'Medium'
-        else:
-            return 'Low'
+        # KP reversals take the highest priority, then KP jumps, then the quality score
+        return np.select(
+            [has_reversals, has_jumps, avg_quality < 0.2, avg_quality < 0.5],
+            ['High', 'Medium', 'High', 'Medium'],
+            default='Low'
+        ).astype(object)
             
     def _get_analysis_type(self) -> str:
         """Get the type of analysis."""
@@ -550,43 +935,46 @@ class PositionAnalyzer(BaseAnalyzer):
                     standardized["problem_sections"]["severity_breakdown"][severity_key]["total_length"] = total_length
         
         # Populate details
-        for _, section in problem_sections.iterrows():
-            # Extract key information
-            detail = {
-                "section_id": str(section.get('Segment_ID', '')),
-                "severity": section.get('Severity', 'Medium').lower(),
-                "start_position": section.get('Start_KP', 0.0),
-                "end_position": section.get('End_KP', 0.0),
-                "length": section.get('Length_KP', 0.0) * 1000,  # Convert KP to meters
-                "deviation": 0.0,  # Position doesn't have a deviation concept like depth
-                "recommended_action": self._get_position_recommendation(section)
-            }
-            standardized["problem_sections"]["details"].append(detail)
+        length_kp = self._column_or_default(problem_sections, 'Length_KP', 0.0).to_numpy(dtype=float)
+        standardized["problem_sections"]["details"].extend(self._build_detail_records({
+            "section_id": self._column_or_default(problem_sections, 'Segment_ID', '').astype(str),
+            "severity": self._column_or_default(problem_sections, 'Severity', 'Medium').str.lower(),
+            "start_position": self._column_or_default(problem_sections, 'Start_KP', 0.0),
+            "end_position": self._column_or_default(problem_sections, 'End_KP', 0.0),
+            "length": length_kp * 1000,  # Convert KP to meters
+            "deviation": np.zeros(len(problem_sections)),  # Position doesn't have a deviation concept like depth
+            "recommended_action": self._get_position_recommendations(problem_sections)
+        }))
             
-    def _get_position_recommendation(self, section: pd.Series) -> str:
+    def _get_position_recommendations(self, sections: pd.DataFrame) -> np.ndarray:
         """
-        Generate a recommendation for a position problem section.
+        Generate recommendations for position problem sections.
         
         Args:
-            section: Series containing section data
+            sections: DataFrame containing section data
             
         Returns:
-            str: Recommendation text
+            np.ndarray: Recommendation text per section
         """
-        severity = section.get('Severity', 'Medium')
-        
-        if severity == 'High':
-            if section.get('Has_KP_Reversals', False):
-                return "Investigate KP reversals - potential data sequence issue"
-            else:
-                return "Review position data - critical quality issues detected"
-        elif severity == 'Medium':
-            if section.get('Has_KP_Jumps', False):
-                return "Check for gaps in position data"
-            else:
-                return "Validate position measurements"
-        else:
-            return "Monitor position data quality"
+        severity = self._column_or_default(sections, 'Severity', 'Medium').to_numpy()
+        has_reversals = self._column_or_default(sections, 'Has_KP_Reversals', False).to_numpy(dtype=bool)
+        has_jumps = self._column_or_default(sections, 'Has_KP_Jumps', False).to_numpy(dtype=bool)
+        
+        return np.select(
+            [
+                (severity == 'High') & has_reversals,
+                severity == 'High',
+                (severity == 'Medium') & has_jumps,
+                severity == 'Medium'
+            ],
+            [
+                "Investigate KP reversals - potential data sequence issue",
+                "Review position data - critical quality issues detected",
+                "Check for gaps in position data",
+                "Validate position measurements"
+            ],
+            default="Monitor position data quality"
+        )
 
     def _populate_anomalies(self, standardized: Dict[str, Any]) -> None:
         """
@@ -595,23 +983,7 @@ class PositionAnalyzer(BaseAnalyzer):
         Args:
             standardized: Dictionary with standardized structure to populate
         """
-        # Get position analysis data
-        if 'position_analysis' not in self.analysis_results or self.analysis_results['position_analysis'] is None:
-            return
-            
-        position_data = self.analysis_results['position_analysis']
-        
-        # Find all anomalies (KP jumps, reversals, duplicates, significant deviations)
-        anomaly_flags = ['Is_KP_Jump', 'Is_KP_Reversal', 'Is_KP_Duplicate', 'Is_Significant_Deviation']
-        
-        # Create mask for any anomaly
-        anomaly_mask = False
-        for flag in anomaly_flags:
-            if flag in position_data.columns:
-                anomaly_mask |= position_data[flag]
-                
-        # Filter anomalies
-        anomalies = position_data[anomaly_mask]
+        anomalies = self._get_anomaly_points()
         
         if anomalies.empty:
             return
@@ -629,36 +1001,107 @@ class PositionAnalyzer(BaseAnalyzer):
         standardized["anomalies"]["severity_breakdown"]["medium"]["count"] = medium_count 
         standardized["anomalies"]["severity_breakdown"]["low"]["count"] = low_count
         
+        anomaly_types, severities = self._classify_anomalies(anomalies)
+        recommendations = {anomaly_type: self._get_anomaly_recommendation(anomaly_type)
+                           for anomaly_type in anomaly_types.unique()}
+        
         # Populate details
-        for idx, anomaly in anomalies.iterrows():
-            # Determine anomaly type and severity
-            anomaly_type = "Unknown"
-            severity = "low"
-            
-            if 'Is_KP_Reversal' in anomalies.columns and anomaly['Is_KP_Reversal']:
-                anomaly_type = "KP Reversal"
-                severity = "high"
-            elif 'Is_KP_Jump' in anomalies.columns and anomaly['Is_KP_Jump']:
-                anomaly_type = "KP Jump"
-                severity = "medium"
-            elif 'Is_KP_Duplicate' in anomalies.columns and anomaly['Is_KP_Duplicate']:
-                anomaly_type = "KP Duplicate"
-                severity = "low"
-            elif 'Is_Significant_Deviation' in anomalies.columns and anomaly['Is_Significant_Deviation']:
-                anomaly_type = "Significant Cross-Track Deviation"
-                severity = "medium"
+        standardized["anomalies"]["details"].extend(self._build_detail_records({
+            "anomaly_id": anomalies.index.astype(str),
+            "type": anomaly_types,
+            "severity": severities,
+            "position": self._column_or_default(anomalies, self.kp_column, 0.0),
+            "deviation": self._column_or_default(anomalies, 'DCC_Abs', 0.0),
+            "recommended_action": anomaly_types.map(recommendations)
+        }))
+            
+    def _get_anomaly_points(self) -> pd.DataFrame:
+        """
+        Get the analyzed points flagged with any position anomaly.
+        
+        Returns:
+            DataFrame of anomalous points (empty if analysis has not been run).
+        """
+        # Get position analysis data
+        if 'position_analysis' not in self.analysis_results or self.analysis_results['position_analysis'] is None:
+            return pd.DataFrame()
+            
+        position_data = self.analysis_results['position_analysis']
+        
+        # Find all anomalies (KP jumps, reversals, duplicates, significant deviations)
+        anomaly_flags = ['Is_KP_Jump', 'Is_KP_Reversal', 'Is_KP_Duplicate', 'Is_Significant_Deviation']
+        
+        # Create mask for any anomaly
+        anomaly_mask = np.zeros(len(position_data), dtype=bool)
+        for flag in anomaly_flags:
+            if flag in position_data.columns:
+                anomaly_mask |= position_data[flag].to_numpy(dtype=bool)
                 
-            # Extract key information and create standardized entry
-            detail = {
-                "anomaly_id": str(idx),
-                "type": anomaly_type,
-                "severity": severity,
-                "position": anomaly.get(self.kp_column, 0.0),
-                "deviation": anomaly.get('DCC_Abs', 0.0) if 'DCC_Abs' in anomaly else 0.0,
-                "recommended_action": self._get_anomaly_recommendation(anomaly_type)
-            }
-            standardized["anomalies"]["details"].append(detail)
+        return position_data[anomaly_mask]
+    
+    def _classify_anomalies(self, anomalies: pd.DataFrame) -> Tuple[pd.Series, np.ndarray]:
+        """
+        Determine the type and severity of anomalous points.
+        
+        A point with several flags takes the type of the highest priority flag
+        (reversal > jump > duplicate > deviation).
+        
+        Args:
+            anomalies: DataFrame of anomalous points
             
+        Returns:
+            Tuple of (anomaly type per point, lower-case severity per point)
+        """
+        is_reversal = self._column_or_default(anomalies, 'Is_KP_Reversal', False).to_numpy(dtype=bool)
+        is_jump = self._column_or_default(anomalies, 'Is_KP_Jump', False).to_numpy(dtype=bool)
+        is_duplicate = self._column_or_default(anomalies, 'Is_KP_Duplicate', False).to_numpy(dtype=bool)
+        is_deviation = self._column_or_default(anomalies, 'Is_Significant_Deviation', False).to_numpy(dtype=bool)
+        conditions = [is_reversal, is_jump, is_duplicate, is_deviation]
+        
+        anomaly_types = pd.Series(np.select(
+            conditions,
+            ["KP Reversal", "KP Jump", "KP Duplicate", "Significant Cross-Track Deviation"],
+            default="Unknown"
+        ))
+        severities = np.select(conditions, ["high", "medium", "low", "medium"], default="low")
+        return anomaly_types, severities
+    
+    def _get_kp_intervals(self) -> pd.DataFrame:
+        """
+        Get the KP intervals of problem segments and anomalies for the KP index.
+        
+        Returns:
+            DataFrame with Start_KP, End_KP, Source, Severity and Label columns.
+        """
+        frames = []
+        
+        sections = self.analysis_results.get('problem_sections')
+        if isinstance(sections, pd.DataFrame) and not sections.empty:
+            frames.append(pd.DataFrame({
+                'Start_KP': sections['Start_KP'].to_numpy(),
+                'End_KP': sections['End_KP'].to_numpy(),
+                'Source': 'position_section',
+                'Severity': sections['Severity'].to_numpy(),
+                'Label': sections['Segment_ID'].to_numpy()
+            }))
+        
+        anomalies = self._get_anomaly_points()
+        if not anomalies.empty:
+            anomaly_types, severities = self._classify_anomalies(anomalies)
+            kp = anomalies[self.kp_column].to_numpy()
+            frames.append(pd.DataFrame({
+                'Start_KP': kp,
+                'End_KP': kp,
+                'Source': 'position_anomaly',
+                'Severity': pd.Series(severities).str.capitalize().to_numpy(),
+                'Label': anomalies.index.to_numpy(),
+                'Type': anomaly_types.to_numpy()
+            }))
+        
+        if not frames:
+            return super()._get_kp_intervals()
+        return pd.concat(frames, ignore_index=True)
+    
     def _get_anomaly_recommendation(self, anomaly_type: str) -> str:
         """
         Generate a recommendation for an anomaly.
@@ -816,4 +1259,31 @@ class PositionAnalyzer(BaseAnalyzer):
                     if not sections.empty:
                         total_length = sections['Length_KP'].sum() * 1000  # Convert KP to meters
                         percentage = (total_length / total_cable_length) * 100
-                        standardized["compliance_metrics"]["compliance_by_severity"][severity_key] = percentage
\ No newline at end of file
+                        standardized["compliance_metrics"]["compliance_by_severity"][severity_key] = percentage
+
+
+def _score_position_chunk(chunk: pd.DataFrame, columns: Dict[str, Optional[str]],
+                          jump_threshold: float, reversal_threshold: float, lean: bool,
+                          median_increment: float, overlap: int) -> pd.DataFrame:
+    """
+    Score one chunk of positions in a worker process.
+    
+    Args:
+        chunk: Rows of the chunk, preceded by `overlap` rows of the previous chunk.
+        columns: Column names configured on the parent analyzer.
+        jump_threshold: Threshold for detecting KP jumps.
+        reversal_threshold: Threshold for detecting KP reversals.
+        lean: Whether to skip adding intermediate columns.
+        median_increment: Median KP increment of the whole survey.
+        overlap: Number of leading overlap rows to drop from the result.
+        
+    Returns:
+        DataFrame with added analysis columns for the rows of the chunk.
+    """
+    analyzer = PositionAnalyzer()
+    for attribute, column in columns.items():
+        setattr(analyzer, attribute, column)
+    
+    result = analyzer._score_positions(chunk.copy(), jump_threshold, reversal_threshold,
+                                       lean, median_increment)
+    return result.iloc[overlap:].drop(columns=chunk.columns)
@@ -11,10 +11,32 @@ import numpy as np
 import logging
 from typing import Optional, Dict, List, Any, Union
 
+from .visualizer import get_scatter_type, WEBGL_POINT_THRESHOLD, DEFAULT_DASHBOARD_POINTS
+from .decimation import decimate
+from .figure_templates import get_layout_template, subplot_axes
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def create_kp_continuity_plot(fig, data, kp_column, row=1, col=1, show_anomalies=True):
+def _column_mask(data, column):
+    """Get a boolean column as an array, or all False if the column is missing."""
+    if column not in data.columns:
+        return np.zeros(len(data), dtype=bool)
+    return data[column].fillna(False).to_numpy(dtype=bool)
+
+
+def _add_traces(fig, traces, axis_titles, row, col):
+    """Add trace dictionaries and axis titles to a cell of a go.Figure subplot grid."""
+    for trace in traces:
+        fig.add_trace(trace, row=row, col=col)
+    fig.update_xaxes(axis_titles[0], row=row, col=col)
+    fig.update_yaxes(axis_titles[1], row=row, col=col)
+    return fig
+
+
+def create_kp_continuity_plot(fig, data, kp_column, row=1, col=1, show_anomalies=True,
+                              render_mode='auto', webgl_threshold=WEBGL_POINT_THRESHOLD,
+                              max_points=DEFAULT_DASHBOARD_POINTS):
     """
     Add a KP continuity plot to an existing figure.
     
@@ -25,68 +47,70 @@ def create_kp_continuity_plot(fig, data, kp_column, row=1, col=1, show_anomalies
         row: Row in subplot grid.
         col: Column in subplot grid.
         show_anomalies: Whether to highlight anomalies.
+        render_mode: Trace rendering mode ('auto', 'svg' or 'webgl').
+        webgl_threshold: Point count above which 'auto' mode uses WebGL.
+        max_points: Maximum number of points in the KP progression trace (None
+            plots every point). KP jumps and reversals are always kept.
         
     Returns:
         Updated figure.
     """
-    try:
-        import plotly.graph_objects as go
-    except ImportError:
-        logger.error("Plotly not available - visualization will be limited")
-        return fig
-    
+    traces, axis_titles = _kp_continuity_traces(data, kp_column, show_anomalies, render_mode,
+                                                webgl_threshold, max_points)
+    return _add_traces(fig, traces, axis_titles, row, col)
+
+def _kp_continuity_traces(data, kp_column, show_anomalies=True, render_mode='auto',
+                          webgl_threshold=WEBGL_POINT_THRESHOLD, max_points=DEFAULT_DASHBOARD_POINTS):
+    """Build the KP continuity trace dictionaries and the (x, y) axis properties."""
     # Create index array for x-axis
-    point_indices = list(range(len(data)))
+    point_indices = np.arange(len(data))
+    kp = data[kp_column].to_numpy(dtype=float)
+    is_jump = _column_mask(data, 'Is_KP_Jump')
+    is_reversal = _column_mask(data, 'Is_KP_Reversal')
+    
+    # Reduce the KP line to the point budget, keeping every anomaly
+    plot_index = decimate(point_indices, kp, max_points, keep=is_jump | is_reversal)
     
     # Add main KP line
-    fig.add_trace(
-        go.Scatter(
-            x=point_indices,
-            y=data[kp_column],
-            mode='lines',
-            name='KP Progression',
-            line=dict(color='blue', width=1)
-        ),
-        row=row, col=col
-    )
+    traces = [dict(
+        type=get_scatter_type(len(plot_index), render_mode, webgl_threshold),
+        x=point_indices[plot_index],
+        y=kp[plot_index],
+        mode='lines',
+        name='KP Progression',
+        line=dict(color='blue', width=1)
+    )]
     
     # Add anomalies if requested
     if show_anomalies and 'Is_KP_Jump' in data.columns:
         # Add KP jumps
-        jump_indices = [i for i, jump in enumerate(data['Is_KP_Jump']) if jump]
-        if jump_indices:
-            fig.add_trace(
-                go.Scatter(
-                    x=[point_indices[i] for i in jump_indices],
-                    y=data.iloc[jump_indices][kp_column],
-                    mode='markers',
-                    name='KP Jumps',
-                    marker=dict(color='orange', size=8, symbol='triangle-up')
-                ),
-                row=row, col=col
-            )
+        if is_jump.any():
+            traces.append(dict(
+                type=get_scatter_type(int(is_jump.sum()), render_mode, webgl_threshold),
+                x=point_indices[is_jump],
+                y=kp[is_jump],
+                mode='markers',
+                name='KP Jumps',
+                marker=dict(color='orange', size=8, symbol='triangle-up')
+            ))
         
         # Add KP reversals
-        reversal_indices = [i for i, rev in enumerate(data['Is_KP_Reversal']) if rev]
-        if reversal_indices:
-            fig.add_trace(
-                go.Scatter(
-                    x=[point_indices[i] for i in reversal_indices],
-                    y=data.iloc[reversal_indices][kp_column],
-                    mode='markers',
-                    name='KP Reversals',
-                    marker=dict(color='red', size=8, symbol='x')
-                ),
-                row=row, col=col
-            )
-    
-    # Update layout for this subplot
-    fig.update_xaxes(title_text="Point Index", row=row, col=col)
-    fig.update_yaxes(title_text="KP Value", row=row, col=col)
+        if is_reversal.any():
+            traces.append(dict(
+                type=get_scatter_type(int(is_reversal.sum()), render_mode, webgl_threshold),
+                x=point_indices[is_reversal],
+                y=kp[is_reversal],
+                mode='markers',
+                name='KP Reversals',
+                marker=dict(color='red', size=8, symbol='x')
+            ))
     
-    return fig
+    # Axis titles for this subplot
+    return traces, (dict(title_text="Point Index"), dict(title_text="KP Value"))
 
-def create_cross_track_plot(fig, data, kp_column, dcc_column, quality_column='Position_Quality_Score', row=1, col=2):
+def create_cross_track_plot(fig, data, kp_column, dcc_column, quality_column='Position_Quality_Score', row=1, col=2,
+                            render_mode='auto', webgl_threshold=WEBGL_POINT_THRESHOLD,
+                            max_points=DEFAULT_DASHBOARD_POINTS):
     """
     Add a cross-track deviation plot to an existing figure.
     
@@ -98,57 +122,64 @@ def create_cross_track_plot(fig, data, kp_column, dcc_column, quality_column='Po
         quality_column: Name of the quality score column.
         row: Row in subplot grid.
         col: Column in subplot grid.
+        render_mode: Trace rendering mode ('auto', 'svg' or 'webgl').
+        webgl_threshold: Point count above which 'auto' mode uses WebGL.
+        max_points: Maximum number of points in the deviation trace (None plots
+            every point). The largest deviations of each bucket are kept.
         
     Returns:
         Updated figure.
     """
-    try:
-        import plotly.graph_objects as go
-    except ImportError:
-        logger.error("Plotly not available - visualization will be limited")
-        return fig
+    traces, axis_titles = _cross_track_traces(data, kp_column, dcc_column, quality_column, render_mode,
+                                              webgl_threshold, max_points)
+    return _add_traces(fig, traces, axis_titles, row, col)
+
+def _cross_track_traces(data, kp_column, dcc_column, quality_column='Position_Quality_Score',
+                        render_mode='auto', webgl_threshold=WEBGL_POINT_THRESHOLD,
+                        max_points=DEFAULT_DASHBOARD_POINTS):
+    """Build the cross-track deviation trace dictionaries and the (x, y) axis properties."""
+    kp = data[kp_column].to_numpy(dtype=float)
+    dcc = data[dcc_column].to_numpy(dtype=float)
+    
+    # Reduce to the point budget by per-bucket extremes, so peak deviations stay visible
+    plot_index = decimate(kp, dcc, max_points, method='minmax')
     
     # Add scatter plot with color based on quality
-    fig.add_trace(
-        go.Scatter(
-            x=data[kp_column],
-            y=data[dcc_column],
-            mode='markers',
-            marker=dict(
-                size=5,
-                color=data[quality_column],
-                colorscale='RdYlGn',  # Red (poor) to Green (good)
-                colorbar=dict(
-                    title='Position Quality',
-                    x=1.0,
-                    y=0.5,
-                    len=0.5
-                ),
+    traces = [dict(
+        type=get_scatter_type(len(plot_index), render_mode, webgl_threshold),
+        x=kp[plot_index],
+        y=dcc[plot_index],
+        mode='markers',
+        marker=dict(
+            size=5,
+            color=data[quality_column].to_numpy()[plot_index],
+            colorscale='RdYlGn',  # Red (poor) to Green (good)
+            colorbar=dict(
+                title=dict(text='Position Quality'),
+                x=1.0,
+                y=0.5,
+                len=0.5
             ),
-            name='Cross-Track Deviation'
         ),
-        row=row, col=col
-    )
+        name='Cross-Track Deviation'
+    )]
     
     # Add zero line representing planned route
-    fig.add_trace(
-        go.Scatter(
-            x=[data[kp_column].min(), data[kp_column].max()],
-            y=[0, 0],
-            mode='lines',
-            line=dict(color='black', width=1, dash='dash'),
-            name='Planned Route'
-        ),
-        row=row, col=col
-    )
+    traces.append(dict(
+        type='scatter',
+        x=[np.nanmin(kp), np.nanmax(kp)],
+        y=[0, 0],
+        mode='lines',
+        line=dict(color='black', width=1, dash='dash'),
+        name='Planned Route'
+    ))
     
-    # Update layout for this subplot
-    fig.update_xaxes(title_text="KP", row=row, col=col)
-    fig.update_yaxes(title_text="Cross-Track Deviation (m)", row=row, col=col)
-    
-    return fig
+    # Axis titles for this subplot
+    return traces, (dict(title_text="KP"), dict(title_text="Cross-Track Deviation (m)"))
 
-def create_quality_heatmap(fig, data, kp_column, quality_column='Position_Quality_Score', row=2, col=1):
+def create_quality_heatmap(fig, data, kp_column, quality_column='Position_Quality_Score', row=2, col=1,
+                           render_mode='auto', webgl_threshold=WEBGL_POINT_THRESHOLD,
+                           max_points=DEFAULT_DASHBOARD_POINTS):
     """
     Add a position quality heatmap to an existing figure.
     
@@ -159,70 +190,88 @@ def create_quality_heatmap(fig, data, kp_column, quality_column='Position_Qualit
         quality_column: Name of the quality score column.
         row: Row in subplot grid.
         col: Column in subplot grid.
+        render_mode: Trace rendering mode ('auto', 'svg' or 'webgl').
+        webgl_threshold: Point count above which 'auto' mode uses WebGL.
+        max_points: Maximum number of points in the quality trace (None plots
+            every point). The lowest and highest scores of each bucket are kept.
         
     Returns:
         Updated figure.
     """
-    try:
-        import plotly.graph_objects as go
-    except ImportError:
-        logger.error("Plotly not available - visualization will be limited")
-        return fig
+    traces, axis_titles = _quality_heatmap_traces(data, kp_column, quality_column, render_mode,
+                                                  webgl_threshold, max_points)
+    return _add_traces(fig, traces, axis_titles, row, col)
+
+def _quality_heatmap_traces(data, kp_column, quality_column='Position_Quality_Score', render_mode='auto',
+                            webgl_threshold=WEBGL_POINT_THRESHOLD, max_points=DEFAULT_DASHBOARD_POINTS):
+    """Build the position quality trace dictionaries and the (x, y) axis properties."""
+    kp = data[kp_column].to_numpy(dtype=float)
+    quality = data[quality_column].to_numpy(dtype=float)
+    plot_index = decimate(kp, quality, max_points, method='minmax')
     
     # Add heatmap-like visualization of position quality
-    fig.add_trace(
-        go.Scatter(
-            x=data[kp_column],
-            y=[0] * len(data),  # All at y=0
-            mode='markers',
-            marker=dict(
-                size=10,
-                color=data[quality_column],
-                colorscale='RdYlGn',
-                showscale=False
-            ),
-            name='Position Quality'
+    traces = [dict(
+        type=get_scatter_type(len(plot_index), render_mode, webgl_threshold),
+        x=kp[plot_index],
+        y=np.zeros(len(plot_index)),  # All at y=0
+        mode='markers',
+        marker=dict(
+            size=10,
+            color=quality[plot_index],
+            colorscale='RdYlGn',
+            showscale=False
         ),
-        row=row, col=col
-    )
+        name='Position Quality'
+    )]
     
-    # Add colored sections for problem segments if available
+    # Add all problem segments as one trace of line pieces separated by gaps
     if 'Segment_ID' in data.columns:
-        segments = data.dropna(subset=['Segment_ID']).groupby('Segment_ID')
+        segment_extent = data.groupby('Segment_ID')[kp_column].agg(['min', 'max'])
         
-        for segment_id, group in segments:
-            fig.add_trace(
-                go.Scatter(
-                    x=[group[kp_column].min(), group[kp_column].max()],
-                    y=[0, 0],
-                    mode='lines',
-                    line=dict(color='red', width=5),
-                    name=f'Problem Segment {int(segment_id)}'
-                ),
-                row=row, col=col
-            )
-    
-    # Update layout for this subplot
-    fig.update_xaxes(title_text="KP", row=row, col=col)
-    fig.update_yaxes(title_text="", showticklabels=False, row=row, col=col)
+        if len(segment_extent):
+            segment_x = np.column_stack([
+                segment_extent['min'].to_numpy(dtype=float),
+                segment_extent['max'].to_numpy(dtype=float),
+                np.full(len(segment_extent), np.nan)
+            ]).ravel()
+            segment_y = np.tile([0.0, 0.0, np.nan], len(segment_extent))
+            
+            traces.append(dict(
+                type='scatter',
+                x=segment_x,
+                y=segment_y,
+                mode='lines',
+                line=dict(color='red', width=5),
+                name=f'Problem Segments ({len(segment_extent)})'
+            ))
     
-    return fig
+    # Axis titles for this subplot
+    return traces, (dict(title_text="KP"), dict(title_text="", showticklabels=False))
 
-def create_position_dashboard(data, kp_column, dcc_column=None):
+def create_position_dashboard(data, kp_column, dcc_column=None, render_mode='auto',
+                              webgl_threshold=WEBGL_POINT_THRESHOLD,
+                              max_points=DEFAULT_DASHBOARD_POINTS, as_dict=False):
     """
     Create a comprehensive position quality dashboard.
     
+    The dashboard is assembled as a figure dictionary from the cached subplot
+    layout template, so Plotly validates it at most once.
+    
     Args:
         data: DataFrame containing position analysis results.
         kp_column: Name of the KP column.
         dcc_column: Name of the DCC column (optional).
+        render_mode: Trace rendering mode ('auto', 'svg' or 'webgl').
+        webgl_threshold: Point count above which 'auto' mode uses WebGL.
+        max_points: Maximum number of points per trace (None plots every point).
+        as_dict: Whether to return the plain figure dictionary instead of a
+            validated go.Figure.
         
     Returns:
-        Plotly figure object with the dashboard.
+        Plotly figure object (or figure dictionary) with the dashboard.
     """
     try:
         import plotly.graph_objects as go
-        from plotly.subplots import make_subplots
     except ImportError:
         logger.error("Plotly not available - visualization will be limited")
         return None
@@ -233,35 +282,34 @@ def create_position_dashboard(data, kp_column, dcc_column=None):
     if dcc_column and dcc_column in data.columns:
         cols = 2
     
-    # Create subplot figure
-    fig = make_subplots(
-        rows=rows, cols=cols,
-        subplot_titles=[
-            'KP Progression', 
-            'Cross-Track Deviation' if dcc_column else None,
-            'Position Quality', 
-            None
-        ],
-        vertical_spacing=0.1,
-        horizontal_spacing=0.05
+    # Subplot grid from the cached layout template
+    subplot_titles = (
+        'KP Progression', 
+        'Cross-Track Deviation' if dcc_column else None,
+        'Position Quality', 
+        None
     )
+    layout = get_layout_template('position', grid=(rows, cols, subplot_titles))
     
-    # Add KP continuity plot
-    fig = create_kp_continuity_plot(fig, data, kp_column, row=1, col=1)
-    
-    # Add cross-track plot if DCC column is available
+    # KP continuity plot, cross-track plot if DCC column is available, and position quality heatmap
+    cells = [((1, 1), _kp_continuity_traces(data, kp_column, render_mode=render_mode,
+                                            webgl_threshold=webgl_threshold, max_points=max_points))]
     if dcc_column and dcc_column in data.columns:
-        fig = create_cross_track_plot(fig, data, kp_column, dcc_column, row=1, col=2)
+        cells.append(((1, 2), _cross_track_traces(data, kp_column, dcc_column, render_mode=render_mode,
+                                                  webgl_threshold=webgl_threshold, max_points=max_points)))
+    cells.append(((2, 1), _quality_heatmap_traces(data, kp_column, render_mode=render_mode,
+                                                  webgl_threshold=webgl_threshold, max_points=max_points)))
     
-    # Add position quality heatmap
-    fig = create_quality_heatmap(fig, data, kp_column, row=2, col=1)
-    
-    # Update overall layout
-    fig.update_layout(
-        title="Position Quality Analysis",
-        showlegend=True,
-        height=800,
-        width=1000
-    )
+    traces = []
+    for (row, col), (cell_traces, axis_titles) in cells:
+        x_ref, y_ref = subplot_axes(row, col, cols)
+        for trace in cell_traces:
+            trace.update(xaxis=x_ref, yaxis=y_ref)
+            traces.append(trace)
+        for axis_ref, axis_props in zip((x_ref, y_ref), axis_titles):
+            axis = layout[axis_ref[0] + 'axis' + axis_ref[1:]]
+            axis['title'] = {'text': axis_props['title_text']}
+            axis.update({key: value for key, value in axis_props.items() if key != 'title_text'})
     
-    return fig
\ No newline at end of file
+    fig = {'data': traces, 'layout': layout}
+    return fig if as_dict else go.Figure(fig)
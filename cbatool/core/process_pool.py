@@ -0,0 +1,38 @@
+"""
+Process pool module for CBAtool v2.0.
+
+This module contains the helper used to create the process pools for parallel
+analysis and chart rendering. The analysis workers run on threads next to the
+Tk main loop, and forking a process while other threads hold locks (logging,
+I/O, Tk) copies those held locks into the child, which can then deadlock.
+"""
+
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def get_pool_context():
+    """
+    Get the multiprocessing context for a new process pool.
+
+    Returns:
+        The 'spawn' context (fresh interpreters) when other threads are running,
+        otherwise None for the platform default (fork on Linux, which starts faster).
+    """
+    if threading.active_count() > 1:
+        return multiprocessing.get_context('spawn')
+    return None
+
+
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool that is safe to start from any thread.
+
+    Args:
+        max_workers: Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor using the context from get_pool_context.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=get_pool_context())
@@ -0,0 +1,284 @@
+"""
+Map projection module for CBAtool v2.0.
+
+This module contains a vectorised Transverse Mercator projection (Krüger series,
+as used for UTM) to convert whole columns of WGS84 latitude/longitude to metric
+easting/northing and back without external dependencies.
+"""
+
+import numpy as np
+import logging
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+# UTM projection parameters
+UTM_SCALE_FACTOR = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+# Number of Newton iterations used to recover latitude in the inverse transform
+_INVERSE_ITERATIONS = 3
+
+
+@lru_cache(maxsize=None)
+def _series_constants(a: float, f: float) -> Tuple[float, float, np.ndarray, np.ndarray]:
+    """
+    Compute the Krüger series constants of an ellipsoid (to sixth order in n).
+
+    Args:
+        a: Semi-major axis in meters.
+        f: Flattening.
+
+    Returns:
+        Tuple of (eccentricity, rectifying radius, forward coefficients,
+        inverse coefficients).
+    """
+    n = f / (2 - f)
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+
+    eccentricity = np.sqrt(f * (2 - f))
+    rectifying_radius = a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+
+    alpha = np.array([
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400
+    ])
+    beta = np.array([
+        n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+        n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+        17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+        4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+        4583 * n5 / 161280 - 108847 * n6 / 3991680,
+        20648693 * n6 / 638668800
+    ])
+    return eccentricity, rectifying_radius, alpha, beta
+
+
+def _sine_series(zeta: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+    """
+    Evaluate sum(c_j * sin(2 j zeta)) for complex zeta with Clenshaw summation.
+
+    The real and imaginary parts give the northing and easting corrections of
+    the Krüger series with a single complex sine and cosine per point.
+    """
+    two_zeta = 2 * zeta
+    y = 2 * np.cos(two_zeta)
+    b1 = np.zeros_like(zeta)
+    b2 = np.zeros_like(zeta)
+    for coefficient in coefficients[::-1]:
+        b1, b2 = coefficient + y * b1 - b2, b1
+    return b1 * np.sin(two_zeta)
+
+
+class TransverseMercator:
+    """
+    Transverse Mercator projection on an ellipsoid.
+
+    The series constants depend only on the ellipsoid and are computed once and
+    cached; the forward and inverse transforms operate on whole arrays.
+
+    Attributes:
+        central_meridian (float): Longitude of the central meridian in degrees.
+        scale_factor (float): Scale factor on the central meridian.
+        false_easting (float): Easting of the central meridian in meters.
+        false_northing (float): Northing of the equator in meters.
+    """
+
+    def __init__(self, central_meridian: float, scale_factor: float = UTM_SCALE_FACTOR,
+                 false_easting: float = UTM_FALSE_EASTING, false_northing: float = 0.0,
+                 a: float = WGS84_A, f: float = WGS84_F):
+        """
+        Initialize the projection.
+
+        Args:
+            central_meridian: Longitude of the central meridian in degrees.
+            scale_factor: Scale factor on the central meridian.
+            false_easting: Easting of the central meridian in meters.
+            false_northing: Northing of the equator in meters.
+            a: Semi-major axis of the ellipsoid in meters.
+            f: Flattening of the ellipsoid.
+        """
+        self.central_meridian = central_meridian
+        self.scale_factor = scale_factor
+        self.false_easting = false_easting
+        self.false_northing = false_northing
+
+        self._eccentricity, rectifying_radius, self._alpha, self._beta = _series_constants(a, f)
+        self._radius = scale_factor * rectifying_radius
+
+    def forward(self, lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project latitude/longitude to easting/northing.
+
+        Args:
+            lat: Latitudes in degrees.
+            lon: Longitudes in degrees.
+
+        Returns:
+            Tuple of (easting, northing) arrays in meters.
+        """
+        e = self._eccentricity
+        phi = np.radians(np.asarray(lat, dtype=float))
+        lam = np.radians(np.asarray(lon, dtype=float) - self.central_meridian)
+
+        # Conformal latitude (as its tangent) and Gauss-Schreiber coordinates
+        sin_phi = np.sin(phi)
+        tau_prime = np.sinh(np.arctanh(sin_phi) - e * np.arctanh(e * sin_phi))
+        xi_prime = np.arctan2(tau_prime, np.cos(lam))
+        eta_prime = np.arctanh(np.sin(lam) / np.hypot(1, tau_prime))
+
+        zeta_prime = xi_prime + 1j * eta_prime
+        zeta = zeta_prime + _sine_series(zeta_prime, self._alpha)
+
+        easting = self.false_easting + self._radius * zeta.imag
+        northing = self.false_northing + self._radius * zeta.real
+        return easting, northing
+
+    def inverse(self, easting: np.ndarray, northing: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert easting/northing back to latitude/longitude.
+
+        Args:
+            easting: Eastings in meters.
+            northing: Northings in meters.
+
+        Returns:
+            Tuple of (lat, lon) arrays in degrees.
+        """
+        e = self._eccentricity
+        e2m = 1 - e ** 2
+        xi = (np.asarray(northing, dtype=float) - self.false_northing) / self._radius
+        eta = (np.asarray(easting, dtype=float) - self.false_easting) / self._radius
+
+        zeta = xi + 1j * eta
+        zeta_prime = zeta - _sine_series(zeta, self._beta)
+        xi_prime, eta_prime = zeta_prime.real, zeta_prime.imag
+
+        sinh_eta = np.sinh(eta_prime)
+        cos_xi = np.cos(xi_prime)
+        tau_prime = np.sin(xi_prime) / np.hypot(sinh_eta, cos_xi)
+        lam = np.arctan2(sinh_eta, cos_xi)
+
+        # Recover tan(latitude) from the conformal latitude by Newton's method
+        tau = tau_prime / e2m
+        for _ in range(_INVERSE_ITERATIONS):
+            tau_hypot = np.hypot(1, tau)
+            sigma = np.sinh(e * np.arctanh(e * tau / tau_hypot))
+            tau_i = tau * np.hypot(1, sigma) - sigma * tau_hypot
+            tau = tau + (tau_prime - tau_i) / np.hypot(1, tau_i) * (1 + e2m * tau ** 2) / (e2m * tau_hypot)
+
+        lat = np.degrees(np.arctan(tau))
+        lon = np.degrees(lam) + self.central_meridian
+        return lat, (lon + 180) % 360 - 180
+
+
+def utm_zone(lat: np.ndarray, lon: np.ndarray) -> Optional[Tuple[int, bool]]:
+    """
+    Choose the UTM zone for a dataset from its median position.
+
+    Args:
+        lat: Latitudes in degrees.
+        lon: Longitudes in degrees.
+
+    Returns:
+        Tuple of (zone number, south) where south is True for the southern hemisphere,
+        or None if no point has both a finite latitude and longitude.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    if not valid.any():
+        return None
+
+    median_lat = float(np.median(lat[valid]))
+    median_lon = float(np.median(lon[valid]))
+
+    zone = int((median_lon + 180) // 6) % 60 + 1
+
+    # Exceptions for south-west Norway and Svalbard
+    if 56 <= median_lat < 64 and 3 <= median_lon < 12:
+        zone = 32
+    elif 72 <= median_lat < 84 and 0 <= median_lon < 42:
+        zone = 31 + 2 * int((median_lon + 3) // 12)
+
+    return zone, median_lat < 0
+
+
+@lru_cache(maxsize=None)
+def utm_projection(zone: int, south: bool = False) -> TransverseMercator:
+    """
+    Get the (cached) Transverse Mercator projection of a WGS84 UTM zone.
+
+    Args:
+        zone: UTM zone number (1-60).
+        south: Whether to use the southern hemisphere false northing.
+
+    Returns:
+        TransverseMercator projection for the zone.
+    """
+    return TransverseMercator(
+        central_meridian=6 * zone - 183,
+        false_northing=UTM_FALSE_NORTHING_SOUTH if south else 0.0
+    )
+
+
+def latlon_to_utm(lat: np.ndarray, lon: np.ndarray, zone: Optional[int] = None,
+                  south: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray, int, bool]:
+    """
+    Project WGS84 latitude/longitude columns to UTM.
+
+    All points are projected into a single zone so that distances between them
+    stay consistent, even when the data crosses a zone boundary.
+
+    Args:
+        lat: Latitudes in degrees.
+        lon: Longitudes in degrees.
+        zone: UTM zone number (optional, chosen from the data if not provided).
+        south: Whether to use the southern hemisphere (optional, chosen from the
+            data if not provided).
+
+    Returns:
+        Tuple of (easting, northing, zone, south).
+
+    Raises:
+        ValueError: If the zone must be chosen from the data and no point has a
+            finite latitude and longitude.
+    """
+    if zone is None or south is None:
+        data_zone = utm_zone(lat, lon)
+        if data_zone is None:
+            raise ValueError("No finite latitude/longitude to choose a UTM zone from")
+        data_zone, data_south = data_zone
+        zone = data_zone if zone is None else zone
+        south = data_south if south is None else south
+
+    easting, northing = utm_projection(zone, south).forward(lat, lon)
+    return easting, northing, zone, south
+
+
+def utm_to_latlon(easting: np.ndarray, northing: np.ndarray, zone: int,
+                  south: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert UTM easting/northing columns back to WGS84 latitude/longitude.
+
+    Args:
+        easting: Eastings in meters.
+        northing: Northings in meters.
+        zone: UTM zone number.
+        south: Whether the coordinates are in the southern hemisphere.
+
+    Returns:
+        Tuple of (lat, lon) arrays in degrees.
+    """
+    return utm_projection(zone, south).inverse(easting, northing)
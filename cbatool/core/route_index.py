@@ -0,0 +1,363 @@
+"""
+Route index module for CBAtool v2.0.
+
+This module contains the RouteIndex class, a spatial index over the segments of a
+design route polyline (RPL) used to compute DCC (distance cross course) and route
+KP for survey points that only carry easting/northing coordinates.
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from typing import Optional, Tuple, Union, Dict, Any
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class RouteIndex:
+    """
+    Multi-level uniform grid index over the segments of a design route polyline.
+
+    Each route segment is registered in every grid cell it passes through, so the
+    nearest segment to a survey point can be found by scanning only the cells
+    around that point instead of every segment of the route. Points that are not
+    resolved on the finest grid are retried on progressively coarser grids, which
+    are built on demand. Queries are fully vectorised and processed in chunks to
+    bound memory use.
+
+    DCC is signed: positive values lie to the right (starboard) of the route
+    direction, negative values to the left (port).
+
+    Attributes:
+        easting (np.ndarray): Easting of the route vertices.
+        northing (np.ndarray): Northing of the route vertices.
+        kp (np.ndarray): KP (kilometer point) of the route vertices.
+        cell_size (float): Size of the finest grid cells in coordinate units (meters).
+    """
+
+    # Ratio between the cell sizes of consecutive grid levels
+    LEVEL_FACTOR = 4
+
+    def __init__(self, easting, northing, kp=None, cell_size: Optional[float] = None):
+        """
+        Build the index from route vertices.
+
+        Args:
+            easting: Easting values of the route vertices, in route order.
+            northing: Northing values of the route vertices, in route order.
+            kp: KP values of the route vertices in kilometers (optional). When not
+                provided, KP is the cumulative route length from the first vertex.
+            cell_size: Finest grid cell size in meters (optional, derived from the
+                route geometry when not provided).
+        """
+        easting = np.asarray(easting, dtype=float)
+        northing = np.asarray(northing, dtype=float)
+
+        valid = np.isfinite(easting) & np.isfinite(northing)
+        if kp is not None:
+            kp = np.asarray(kp, dtype=float)
+            valid &= np.isfinite(kp)
+
+        if valid.sum() < 2:
+            raise ValueError("A design route needs at least two valid vertices")
+
+        self.easting = easting[valid]
+        self.northing = northing[valid]
+
+        # Segment geometry (segment i joins vertex i and vertex i + 1)
+        self._x0 = self.easting[:-1]
+        self._y0 = self.northing[:-1]
+        self._dx = np.diff(self.easting)
+        self._dy = np.diff(self.northing)
+        self._len2 = self._dx ** 2 + self._dy ** 2
+        self._seg_length = np.sqrt(self._len2)
+
+        # Vertex KP values (kilometers)
+        if kp is not None:
+            self.kp = kp[valid]
+        else:
+            self.kp = np.concatenate(([0.0], np.cumsum(self._seg_length))) / 1000.0
+        self._kp0 = self.kp[:-1]
+        self._dkp = np.diff(self.kp)
+
+        self._xmin = self.easting.min()
+        self._ymin = self.northing.min()
+        self._extent = max(np.ptp(self.easting), np.ptp(self.northing), 1.0)
+
+        mean_length = self._seg_length.mean()
+        self.cell_size = float(cell_size) if cell_size else float(mean_length if mean_length > 0 else 1.0)
+
+        self._levels = [self._build_level(self.cell_size)]
+
+        logger.info(f"Route index built: {len(self.easting)} vertices, "
+                   f"{len(self._levels[0]['cells'])} occupied grid cells of {self.cell_size:.1f}m")
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame, easting_column: str, northing_column: str,
+                       kp_column: Optional[str] = None, cell_size: Optional[float] = None) -> 'RouteIndex':
+        """
+        Build a route index from a DataFrame of route vertices.
+
+        Args:
+            data: DataFrame containing the design route vertices in route order.
+            easting_column: Name of the column containing easting values.
+            northing_column: Name of the column containing northing values.
+            kp_column: Name of the column containing vertex KP values (optional).
+            cell_size: Finest grid cell size in meters (optional).
+
+        Returns:
+            RouteIndex built from the route vertices.
+        """
+        for column in (easting_column, northing_column, kp_column):
+            if column and column not in data.columns:
+                raise ValueError(f"Route column '{column}' not found in route data")
+
+        kp = data[kp_column].to_numpy() if kp_column else None
+        return cls(data[easting_column].to_numpy(), data[northing_column].to_numpy(),
+                   kp=kp, cell_size=cell_size)
+
+    @classmethod
+    def from_file(cls, file_path: str, easting_column: str, northing_column: str,
+                  kp_column: Optional[str] = None, sheet_name: Union[str, int] = 0,
+                  cell_size: Optional[float] = None) -> 'RouteIndex':
+        """
+        Load a design route (RPL) file and build a route index from it.
+
+        Args:
+            file_path: Path to the route file (Excel or CSV).
+            easting_column: Name of the column containing easting values.
+            northing_column: Name of the column containing northing values.
+            kp_column: Name of the column containing vertex KP values (optional).
+            sheet_name: Name or index of the sheet to load for Excel files.
+            cell_size: Finest grid cell size in meters (optional).
+
+        Returns:
+            RouteIndex built from the route file.
+        """
+        from .data_loader import DataLoader
+
+        loader = DataLoader()
+        if not loader.set_file_path(file_path):
+            raise ValueError(f"Could not open route file: {file_path}")
+
+        route_data = loader.load_data(sheet_name=sheet_name)
+        if route_data is None or route_data.empty:
+            raise ValueError(f"No route data loaded from: {file_path}")
+
+        logger.info(f"Loaded design route with {len(route_data)} vertices from {file_path}")
+        return cls.from_dataframe(route_data, easting_column, northing_column,
+                                  kp_column=kp_column, cell_size=cell_size)
+
+    def _build_level(self, cell: float) -> Dict[str, Any]:
+        """
+        Register every segment in the grid cells it passes through.
+
+        Segments are sampled at no more than half a cell apart, so every point on a
+        segment lies within a quarter cell of a sample registered in the grid. Only
+        occupied cells are stored, so memory scales with the route length rather
+        than with the area of its bounding box.
+
+        Args:
+            cell: Grid cell size for this level.
+
+        Returns:
+            Dictionary describing the grid level in a CSR layout.
+        """
+        nx = int(np.ptp(self.easting) // cell) + 1
+        ny = int(np.ptp(self.northing) // cell) + 1
+
+        n_segments = len(self._dx)
+        counts = np.ceil(self._seg_length / (cell / 2.0)).astype(np.int64) + 1
+        total = int(counts.sum())
+
+        seg_ids = np.repeat(np.arange(n_segments), counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = local / np.maximum(np.repeat(counts, counts) - 1, 1)
+
+        sx = self._x0[seg_ids] + t * self._dx[seg_ids]
+        sy = self._y0[seg_ids] + t * self._dy[seg_ids]
+        ix = np.clip(((sx - self._xmin) // cell).astype(np.int64), 0, nx - 1)
+        iy = np.clip(((sy - self._ymin) // cell).astype(np.int64), 0, ny - 1)
+        cell_ids = iy * nx + ix
+
+        # Unique (cell, segment) pairs sorted by cell give a CSR layout
+        order = np.lexsort((seg_ids, cell_ids))
+        cell_ids = cell_ids[order]
+        seg_ids = seg_ids[order]
+        keep = np.ones(total, dtype=bool)
+        keep[1:] = (cell_ids[1:] != cell_ids[:-1]) | (seg_ids[1:] != seg_ids[:-1])
+        cell_ids = cell_ids[keep]
+
+        cells, first = np.unique(cell_ids, return_index=True)
+        return {
+            'cell': cell,
+            'nx': nx,
+            'ny': ny,
+            'cells': cells,
+            'ptr': np.append(first, len(cell_ids)),
+            'segments': seg_ids[keep],
+            'tolerance': cell / 4.0
+        }
+
+    def _get_level(self, level: int) -> Optional[Dict[str, Any]]:
+        """Get a grid level, building it on first use. Returns None past the coarsest level."""
+        while len(self._levels) <= level:
+            previous = self._levels[-1]
+            if previous['cell'] >= self._extent:
+                return None
+            self._levels.append(self._build_level(previous['cell'] * self.LEVEL_FACTOR))
+        return self._levels[level]
+
+    def project(self, easting, northing, max_ring: int = 2,
+                chunk_size: int = 250000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project survey points onto the route by nearest-segment projection.
+
+        Args:
+            easting: Easting values of the survey points.
+            northing: Northing values of the survey points.
+            max_ring: Number of grid cell rings searched on each grid level before
+                moving the remaining points to the next, coarser level.
+            chunk_size: Number of points processed per vectorised chunk.
+
+        Returns:
+            Tuple of (route KP in kilometers, signed DCC in meters). Points with
+            missing coordinates get NaN for both values.
+        """
+        easting = np.asarray(easting, dtype=float)
+        northing = np.asarray(northing, dtype=float)
+
+        kp = np.full(len(easting), np.nan)
+        dcc = np.full(len(easting), np.nan)
+        valid_idx = np.flatnonzero(np.isfinite(easting) & np.isfinite(northing))
+
+        for start in range(0, len(valid_idx), chunk_size):
+            idx = valid_idx[start:start + chunk_size]
+            px, py = easting[idx], northing[idx]
+            seg, t, dist = self._nearest_segments(px, py, max_ring)
+
+            kp[idx] = self._kp0[seg] + t * self._dkp[seg]
+
+            # Sign from the cross product: left of the route direction is negative
+            cross = self._dx[seg] * (py - self._y0[seg]) - self._dy[seg] * (px - self._x0[seg])
+            dcc[idx] = np.where(cross > 0, -dist, dist)
+
+        return kp, dcc
+
+    def _nearest_segments(self, px: np.ndarray, py: np.ndarray,
+                          max_ring: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest route segment for each point.
+
+        Returns:
+            Tuple of (segment index, projection parameter along the segment,
+            distance to the segment).
+        """
+        n = len(px)
+        best_d2 = np.full(n, np.inf)
+        best_seg = np.zeros(n, dtype=np.int64)
+        best_t = np.zeros(n)
+
+        pending = np.arange(n)
+        level_number = 0
+        level = self._levels[0]
+
+        while level is not None and len(pending) > 0:
+            cell = level['cell']
+            cx = np.floor((px[pending] - self._xmin) / cell).astype(np.int64)
+            cy = np.floor((py[pending] - self._ymin) / cell).astype(np.int64)
+
+            # Visit points in cell order so the cell directory lookups run on sorted keys
+            order = np.lexsort((cx, cy))
+            pending, cx, cy = pending[order], cx[order], cy[order]
+
+            for ring in range(1, max_ring + 1):
+                if ring == 1:
+                    offsets = [(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)]
+                else:
+                    offsets = [(ox, oy) for ox in range(-ring, ring + 1) for oy in range(-ring, ring + 1)
+                               if max(abs(ox), abs(oy)) == ring]
+
+                pts, segs = self._gather_candidates(level, pending, cx, cy, offsets)
+                self._update_best(pts, segs, px, py, best_d2, best_seg, best_t)
+
+                # The nearest segment is guaranteed found once it is closer than the
+                # searched radius minus the sampling tolerance
+                unresolved = np.sqrt(best_d2[pending]) > ring * cell - level['tolerance']
+                pending = pending[unresolved]
+                cx = cx[unresolved]
+                cy = cy[unresolved]
+                if len(pending) == 0:
+                    break
+
+            level_number += 1
+            level = self._get_level(level_number)
+
+        if len(pending) > 0:
+            logger.info(f"{len(pending)} points lie far outside the route - using brute-force search")
+            n_segments = len(self._dx)
+            block = max(1, 5000000 // n_segments)
+            for start in range(0, len(pending), block):
+                chunk = pending[start:start + block]
+                pts = np.repeat(chunk, n_segments)
+                segs = np.tile(np.arange(n_segments), len(chunk))
+                self._update_best(pts, segs, px, py, best_d2, best_seg, best_t)
+
+        return best_seg, best_t, np.sqrt(best_d2)
+
+    def _gather_candidates(self, level: Dict[str, Any], pending: np.ndarray, cx: np.ndarray,
+                           cy: np.ndarray, offsets) -> Tuple[np.ndarray, np.ndarray]:
+        """Collect (point, segment) candidate pairs from the cells at the given offsets."""
+        pts_parts = []
+        seg_parts = []
+        nx, ny = level['nx'], level['ny']
+        occupied_cells = level['cells']
+
+        for ox, oy in offsets:
+            ix = cx + ox
+            iy = cy + oy
+            inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+            if not inside.any():
+                continue
+
+            cells = iy[inside] * nx + ix[inside]
+            slots = np.minimum(np.searchsorted(occupied_cells, cells), len(occupied_cells) - 1)
+            occupied = occupied_cells[slots] == cells
+            if not occupied.any():
+                continue
+
+            pts = pending[inside][occupied]
+            slots = slots[occupied]
+            starts = level['ptr'][slots]
+            counts = level['ptr'][slots + 1] - starts
+
+            positions = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+            pts_parts.append(np.repeat(pts, counts))
+            seg_parts.append(level['segments'][positions])
+
+        if not pts_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(pts_parts), np.concatenate(seg_parts)
+
+    def _update_best(self, pts: np.ndarray, segs: np.ndarray, px: np.ndarray, py: np.ndarray,
+                     best_d2: np.ndarray, best_seg: np.ndarray, best_t: np.ndarray) -> None:
+        """Project candidate pairs and keep the closest segment for each point."""
+        if len(pts) == 0:
+            return
+
+        qx = px[pts] - self._x0[segs]
+        qy = py[pts] - self._y0[segs]
+        dx = self._dx[segs]
+        dy = self._dy[segs]
+        len2 = self._len2[segs]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.where(len2 > 0, (qx * dx + qy * dy) / len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        d2 = (qx - t * dx) ** 2 + (qy - t * dy) ** 2
+
+        # Keep the closest candidate per point (ties resolve to any closest segment)
+        np.minimum.at(best_d2, pts, d2)
+        closest = d2 == best_d2[pts]
+        best_seg[pts[closest]] = segs[closest]
+        best_t[pts[closest]] = t[closest]
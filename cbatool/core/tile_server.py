@@ -0,0 +1,316 @@
+"""
+Tile server module for CBAtool v2.0.
+
+This module contains the local multi-resolution viewer for long profiles. A
+min/max pyramid of the profile is precomputed and saved as binary tiles, and a
+small stdlib HTTP server serves them to a viewer page that only fetches the
+tiles covering the visible KP window at a suitable resolution.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+import logging
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from typing import Any, Dict, Optional
+
+from .decimation import bucket_extreme_indices
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Points per tile, bucket growth between pyramid levels and points drawn per view
+DEFAULT_TILE_POINTS = 8192
+LEVEL_FACTOR = 4
+DEFAULT_VIEW_POINTS = 20000
+
+# Plotly.js matching the installed plotly package (the viewer does not need plotly itself)
+try:
+    from plotly.offline import get_plotlyjs_version
+    PLOTLYJS_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+except ImportError:
+    PLOTLYJS_URL = "https://cdn.plot.ly/plotly-latest.min.js"
+
+MANIFEST_FILE = 'manifest.json'
+VIEWER_FILE = 'index.html'
+TILES_DIR = 'tiles'
+
+
+def build_tile_pyramid(x: np.ndarray, y: np.ndarray, output_dir: str,
+                       tile_points: int = DEFAULT_TILE_POINTS,
+                       metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Precompute a min/max pyramid of a profile and save it as binary tiles.
+
+    Level 0 holds every point. Each further level keeps the minimum and maximum
+    point of buckets LEVEL_FACTOR times larger than the previous level, until
+    a level fits in a single tile. Each tile is stored as little-endian float64
+    x values followed by float32 y values.
+
+    Args:
+        x: X values (KP or position) in survey order.
+        y: Y values (e.g. depth) in survey order.
+        output_dir: Directory to write the tiles and manifest to.
+        tile_points: Number of points per tile.
+        metadata: Extra entries to store in the manifest (e.g. axis labels).
+
+    Returns:
+        Dictionary with the manifest describing levels and tiles.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    tiles_dir = os.path.join(output_dir, TILES_DIR)
+    os.makedirs(tiles_dir, exist_ok=True)
+
+    levels = []
+    level = 0
+    bucket_size = 1
+    while True:
+        if bucket_size == 1:
+            indices = np.arange(n)
+        else:
+            indices = bucket_extreme_indices(y, np.arange(0, n, bucket_size))
+
+        level_x = x[indices]
+        level_y = y[indices].astype('<f4')
+
+        tiles = []
+        for tile, start in enumerate(range(0, max(len(indices), 1), tile_points)):
+            tile_x = level_x[start:start + tile_points]
+            tile_y = level_y[start:start + tile_points]
+            with open(os.path.join(tiles_dir, f"L{level}_{tile}.bin"), 'wb') as f:
+                f.write(tile_x.astype('<f8').tobytes())
+                f.write(tile_y.tobytes())
+
+            finite_x = tile_x[np.isfinite(tile_x)]
+            tiles.append({
+                'count': int(len(tile_x)),
+                'x0': float(finite_x.min()) if finite_x.size else None,
+                'x1': float(finite_x.max()) if finite_x.size else None
+            })
+
+        levels.append({'level': level, 'bucket': bucket_size, 'points': int(len(indices)), 'tiles': tiles})
+
+        if len(indices) <= tile_points:
+            break
+        level += 1
+        bucket_size *= LEVEL_FACTOR
+
+    finite_x = x[np.isfinite(x)]
+    manifest = dict(metadata or {})
+    manifest.update({
+        'x_min': float(finite_x.min()) if finite_x.size else 0.0,
+        'x_max': float(finite_x.max()) if finite_x.size else 0.0,
+        'tile_points': tile_points,
+        # Coarsest level first: the viewer starts from the overview
+        'levels': levels[::-1]
+    })
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    logger.info(f"Tile pyramid written to {output_dir}: {len(levels)} levels, "
+                f"{sum(len(level['tiles']) for level in levels)} tiles")
+    return manifest
+
+
+def write_tile_viewer(output_dir: str, view_points: int = DEFAULT_VIEW_POINTS,
+                      plotlyjs_src: Optional[str] = None) -> str:
+    """
+    Write the viewer page for a tile pyramid.
+
+    Args:
+        output_dir: Directory containing the tile pyramid.
+        view_points: Maximum number of points to draw for the visible window.
+        plotlyjs_src: URL or relative path of plotly.js (defaults to the CDN).
+
+    Returns:
+        Path of the viewer page.
+    """
+    viewer_file = os.path.join(output_dir, VIEWER_FILE)
+    with open(viewer_file, 'w', encoding='utf-8') as f:
+        f.write(_VIEWER_TEMPLATE.replace('__VIEW_POINTS__', str(int(view_points)))
+                .replace('__PLOTLYJS_URL__', plotlyjs_src or PLOTLYJS_URL))
+    return viewer_file
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that logs requests at debug level."""
+
+    def log_message(self, format, *args):
+        logger.debug("Tile server: " + format % args)
+
+
+class TileServer:
+    """
+    Local HTTP server for a tile pyramid and its viewer page.
+
+    Attributes:
+        directory (str): Directory served (containing the viewer and tiles).
+        host (str): Host name the server is bound to.
+        port (int): Port the server listens on (chosen automatically if 0).
+    """
+
+    def __init__(self, directory: str, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the server (it is not started until start() is called).
+
+        Args:
+            directory: Directory containing the viewer page and tiles.
+            host: Host name to bind to.
+            port: Port to listen on (0 picks a free port).
+        """
+        self.directory = os.path.abspath(directory)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL of the viewer page."""
+        return f"http://{self.host}:{self.port}/{VIEWER_FILE}"
+
+    def start(self) -> str:
+        """
+        Start serving in a background thread.
+
+        Returns:
+            URL of the viewer page.
+        """
+        if self._server is None:
+            handler = partial(_QuietHandler, directory=self.directory)
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+            self.port = self._server.server_address[1]
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+            logger.info(f"Tile viewer serving {self.directory} at {self.url}")
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+            logger.info("Tile viewer stopped")
+
+
+_VIEWER_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>CBAtool Profile Viewer</title>
+<script src="__PLOTLYJS_URL__"></script>
+<style>
+body { font-family: sans-serif; margin: 10px; }
+#plot { width: 100%; height: 85vh; }
+#status { color: #666; font-size: 12px; }
+</style>
+</head>
+<body>
+<div id="plot"></div>
+<div id="status">Loading...</div>
+<script>
+const VIEW_POINTS = __VIEW_POINTS__;
+const plot = document.getElementById('plot');
+const status = document.getElementById('status');
+const cache = new Map();
+let manifest = null;
+let requestId = 0;
+
+function overlaps(tile, x0, x1) {
+    return tile.x0 !== null && tile.x1 >= x0 && tile.x0 <= x1;
+}
+
+function chooseLevel(x0, x1) {
+    // Finest level whose visible points fit the budget (levels are coarsest first)
+    let chosen = manifest.levels[0];
+    for (const level of manifest.levels) {
+        let count = 0;
+        for (const tile of level.tiles) {
+            if (!overlaps(tile, x0, x1)) continue;
+            const span = tile.x1 - tile.x0;
+            const share = span > 0 ? (Math.min(tile.x1, x1) - Math.max(tile.x0, x0)) / span : 1;
+            count += tile.count * share;
+        }
+        if (count > VIEW_POINTS) break;
+        chosen = level;
+    }
+    return chosen;
+}
+
+async function loadTile(level, index) {
+    const key = level.level + '_' + index;
+    if (!cache.has(key)) {
+        cache.set(key, fetch('tiles/L' + key + '.bin')
+            .then(response => response.arrayBuffer())
+            .then(buffer => {
+                const count = level.tiles[index].count;
+                return {x: new Float64Array(buffer, 0, count), y: new Float32Array(buffer, 8 * count, count)};
+            }));
+    }
+    return cache.get(key);
+}
+
+async function update(x0, x1) {
+    const id = ++requestId;
+    const level = chooseLevel(x0, x1);
+    const indices = level.tiles.map((tile, index) => index).filter(index => overlaps(level.tiles[index], x0, x1));
+    const tiles = await Promise.all(indices.map(index => loadTile(level, index)));
+    if (id !== requestId) return;  // A newer view was requested meanwhile
+
+    const total = tiles.reduce((sum, tile) => sum + tile.x.length, 0);
+    const x = new Float64Array(total);
+    const y = new Float32Array(total);
+    let offset = 0;
+    for (const tile of tiles) {
+        x.set(tile.x, offset);
+        y.set(tile.y, offset);
+        offset += tile.x.length;
+    }
+    Plotly.restyle(plot, {x: [x], y: [y]}, [0]);
+    status.textContent = 'Level ' + level.level + ' (bucket ' + level.bucket + ' points): ' +
+        total + ' points from ' + tiles.length + ' tiles';
+}
+
+fetch('manifest.json').then(response => response.json()).then(data => {
+    manifest = data;
+    const shapes = [];
+    if (manifest.target_depth !== undefined && manifest.target_depth !== null) {
+        shapes.push({type: 'line', xref: 'paper', x0: 0, x1: 1, y0: manifest.target_depth,
+                     y1: manifest.target_depth, line: {color: 'green', width: 1, dash: 'dash'}});
+    }
+    Plotly.newPlot(plot, [{x: [], y: [], mode: 'lines', type: 'scattergl', name: manifest.y_label || 'Value',
+                           line: {color: 'brown', width: 1},
+                           hovertemplate: (manifest.x_label || 'Position') + ': %{x}<br>' +
+                                          (manifest.y_label || 'Value') + ': %{y:.2f}<extra></extra>'}],
+                   {title: {text: manifest.title || 'Profile'},
+                    xaxis: {title: {text: manifest.x_label || 'Position'}},
+                    yaxis: {title: {text: manifest.y_label || 'Value'}, autorange: manifest.reverse_y ? 'reversed' : true},
+                    shapes: shapes, plot_bgcolor: 'white', hovermode: 'closest'},
+                   {responsive: true});
+    plot.on('plotly_relayout', event => {
+        // Zoom and pan send 'xaxis.range[0]'/'xaxis.range[1]', programmatic relayouts and
+        // some modebar actions send 'xaxis.range' or a nested 'xaxis' object: read the
+        // applied range from the layout for all of them
+        const nested = event.xaxis || {};
+        if (event['xaxis.autorange'] || nested.autorange) {
+            update(manifest.x_min, manifest.x_max);
+        } else if (Object.keys(event).some(key => key === 'xaxis' || key.startsWith('xaxis.range'))) {
+            const range = plot.layout.xaxis.range;
+            update(Math.min(range[0], range[1]), Math.max(range[0], range[1]));
+        }
+    });
+    update(manifest.x_min, manifest.x_max);
+});
+</script>
+</body>
+</html>
+"""
@@ -7,15 +7,148 @@ visualizations of cable burial data analysis results.
 """
 
 import os
+import html
+import threading
 import webbrowser
 import pandas as pd
 import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Tuple, Any, Union
 
+from .decimation import decimate
+from .html_writer import encode_typed_array, StreamedArray, write_figure_html
+from .figure_templates import get_layout_template
+from .kp_index import KPIntervalIndex
+from .tile_server import build_tile_pyramid, write_tile_viewer, TileServer, DEFAULT_TILE_POINTS
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Rendering modes: 'auto' switches to WebGL above the point threshold
+RENDER_MODES = ('auto', 'svg', 'webgl')
+WEBGL_POINT_THRESHOLD = 50000
+
+def get_scatter_type(point_count: int, render_mode: str = 'auto',
+					 threshold: int = WEBGL_POINT_THRESHOLD) -> str:
+	"""
+	Get the Plotly scatter trace type to use for a trace.
+	
+	Args:
+		point_count: Number of points in the trace.
+		render_mode: 'auto' (WebGL above the threshold), 'svg' or 'webgl'.
+		threshold: Point count above which 'auto' uses WebGL.
+		
+	Returns:
+		'scattergl' for WebGL rendering, otherwise 'scatter'.
+	"""
+	if render_mode == 'webgl' or (render_mode == 'auto' and point_count > threshold):
+		return 'scattergl'
+	return 'scatter'
+
+def get_scatter_class(point_count: int, render_mode: str = 'auto',
+					  threshold: int = WEBGL_POINT_THRESHOLD) -> Any:
+	"""
+	Get the Plotly scatter trace class to use for a trace.
+	
+	Args:
+		point_count: Number of points in the trace.
+		render_mode: 'auto' (WebGL above the threshold), 'svg' or 'webgl'.
+		threshold: Point count above which 'auto' uses WebGL.
+		
+	Returns:
+		go.Scattergl for WebGL rendering, otherwise go.Scatter.
+	"""
+	import plotly.graph_objects as go
+	
+	if get_scatter_type(point_count, render_mode, threshold) == 'scattergl':
+		return go.Scattergl
+	return go.Scatter
+
+# Paginated output: points per page and points in the decimated overview trace
+DEFAULT_PAGE_POINTS = 20000
+OVERVIEW_POINTS = 5000
+
+# Unpaginated depth profiles with more points than this are streamed to file on save
+STREAM_POINT_THRESHOLD = 200000
+
+# Maximum number of points per position dashboard trace (flagged points are always kept)
+DEFAULT_DASHBOARD_POINTS = 20000
+
+# Plotly config used for all saved HTML files
+HTML_CONFIG = {
+	'responsive': True,
+	'displayModeBar': True,
+	'modeBarButtonsToAdd': ['drawline', 'eraseshape']
+}
+
+# How saved HTML files load plotly.js: 'cdn' (online), 'local' (one shared
+# plotly.min.js per output directory, works offline) or 'inline' (embedded in every file)
+PLOTLYJS_MODES = ('cdn', 'local', 'inline')
+PLOTLYJS_FILE = 'plotly.min.js'
+
+def write_plotlyjs_asset(output_dir: str) -> str:
+	"""
+	Write the plotly.js library to an output directory, once.
+	
+	The asset is only rewritten if it is missing or does not match the
+	installed plotly version, so every HTML file in the directory can share it.
+	
+	Args:
+		output_dir: Directory to write plotly.min.js to.
+		
+	Returns:
+		Path of the plotly.js asset.
+	"""
+	from plotly.offline import get_plotlyjs
+	
+	asset_file = os.path.join(output_dir, PLOTLYJS_FILE)
+	plotlyjs = get_plotlyjs().encode('utf-8')
+	if os.path.exists(asset_file) and os.path.getsize(asset_file) == len(plotlyjs):
+		return asset_file
+	
+	# Write to a temporary file first so readers never see a partial asset
+	os.makedirs(output_dir, exist_ok=True)
+	# (one per process and thread: several outputs may be saved at the same time)
+	temp_file = f"{asset_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+	with open(temp_file, 'wb') as f:
+		f.write(plotlyjs)
+	os.replace(temp_file, asset_file)
+	logger.info(f"plotly.js asset written to: {asset_file}")
+	return asset_file
+
+def _encode_arrays(obj: Any, compact: bool) -> Any:
+	"""Encode the float arrays of a trace dictionary (at any depth) as typed arrays."""
+	if isinstance(obj, np.ndarray) and obj.dtype.kind == 'f':
+		return encode_typed_array(obj, compact)
+	if isinstance(obj, dict):
+		return {key: _encode_arrays(value, compact) for key, value in obj.items()}
+	return obj
+
+def compact_figure(figure: Any, compact: bool = True) -> Dict[str, Any]:
+	"""
+	Convert a figure to a dictionary with its float arrays as base64 typed arrays.
+	
+	Args:
+		figure: Plotly figure object or plain figure dictionary.
+		compact: Whether to use float32 where the precision allows (float64 otherwise).
+		
+	Returns:
+		Figure dictionary for plotly.io (write with validate=False).
+	"""
+	if isinstance(figure, dict):
+		return dict(figure, data=[_encode_arrays(trace, compact) for trace in figure.get('data', [])])
+	
+	# Plotly already encodes a figure's arrays as float64 typed arrays
+	fig_dict = figure.to_plotly_json()
+	if compact:
+		for trace, trace_dict in zip(figure.data, fig_dict['data']):
+			for key in ('x', 'y'):
+				values = trace[key]
+				if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+					trace_dict[key] = encode_typed_array(values)
+	return fig_dict
+
 class Visualizer:
 	"""
 	Class for creating interactive visualizations of cable burial data analysis.
@@ -27,7 +160,18 @@ class Visualizer:
 		kp_column (str): Name of the column containing KP values.
 		position_column (str): Name of the column containing position values.
 		target_depth (float): Target burial depth for compliance checking.
+		render_mode (str): Trace rendering mode ('auto', 'svg' or 'webgl').
+		webgl_threshold (int): Point count above which 'auto' mode uses WebGL.
+		plotlyjs_mode (str): How saved HTML files load plotly.js ('cdn', 'local' or 'inline').
+		compact_html (bool): Whether saved HTML files store float data as float32
+			typed arrays where the precision allows.
+		fast_figures (bool): Whether figures are returned as plain dictionaries built
+			from cached layout templates instead of validated go.Figure objects.
 		figure: The visualization figure object.
+		pagination (Dict): Page settings when the figure is the overview of a
+			paginated visualization, None otherwise.
+		stream_threshold (int): Point count above which save_visualization(stream=True)
+			streams an unpaginated depth figure to file instead of serialising it.
 	"""
 	
 	def __init__(self):
@@ -38,7 +182,15 @@ class Visualizer:
 		self.kp_column = None
 		self.position_column = None
 		self.target_depth = 1.5  # Default target depth in meters
+		self.render_mode = 'auto'
+		self.webgl_threshold = WEBGL_POINT_THRESHOLD
+		self.plotlyjs_mode = 'cdn'
+		self.compact_html = True
+		self.fast_figures = False
+		self.stream_threshold = STREAM_POINT_THRESHOLD
 		self.figure = None
+		self.pagination = None
+		self._stream_options = None
 		
 		# Try to import plotly
 		try:
@@ -65,6 +217,7 @@ class Visualizer:
 			return False
 			
 		self.data = data
+		self._stream_options = None  # An existing figure no longer matches the data
 		
 		if problem_sections is not None:
 			self.problem_sections = problem_sections
@@ -95,6 +248,7 @@ class Visualizer:
 			return False
 			
 		self.depth_column = depth_column
+		self._stream_options = None
 		logger.info(f"Using depth column for visualization: {depth_column}")
 		
 		# Validate KP column if provided
@@ -127,17 +281,135 @@ class Visualizer:
 		self.target_depth = target_depth
 		logger.info(f"Target depth for visualization set to {target_depth}m")
 	
+	def set_render_mode(self, render_mode: str, webgl_threshold: Optional[int] = None) -> bool:
+		"""
+		Set how large traces are rendered.
+		
+		Args:
+			render_mode: 'auto' (WebGL above the threshold), 'svg' (always SVG) or
+				'webgl' (always WebGL).
+			webgl_threshold: Point count above which 'auto' mode uses WebGL (optional).
+			
+		Returns:
+			bool: True if the mode was set successfully, False otherwise.
+		"""
+		if render_mode not in RENDER_MODES:
+			logger.error(f"Unknown render mode '{render_mode}' - expected one of {RENDER_MODES}")
+			return False
+			
+		self.render_mode = render_mode
+		if webgl_threshold is not None:
+			self.webgl_threshold = webgl_threshold
+		logger.info(f"Render mode for visualization set to {render_mode}")
+		return True
+	
+	def set_plotlyjs_mode(self, plotlyjs_mode: str) -> bool:
+		"""
+		Set how saved HTML files load the plotly.js library.
+		
+		Args:
+			plotlyjs_mode: 'cdn' (reference the online CDN), 'local' (write one
+				plotly.min.js next to the HTML files and reference it relatively,
+				for offline use) or 'inline' (embed plotly.js in every file).
+				
+		Returns:
+			bool: True if the mode was set successfully, False otherwise.
+		"""
+		if plotlyjs_mode not in PLOTLYJS_MODES:
+			logger.error(f"Unknown plotly.js mode '{plotlyjs_mode}' - expected one of {PLOTLYJS_MODES}")
+			return False
+			
+		self.plotlyjs_mode = plotlyjs_mode
+		logger.info(f"plotly.js mode for saved visualizations set to {plotlyjs_mode}")
+		return True
+	
+	def set_compact_html(self, compact: bool) -> None:
+		"""
+		Set whether saved HTML files store float data as float32 typed arrays.
+		
+		Args:
+			compact: True to store x/y values as float32 where the rounding error is
+				negligible relative to the point spacing, False to keep float64.
+		"""
+		self.compact_html = bool(compact)
+		logger.info(f"Compact HTML output {'enabled' if self.compact_html else 'disabled'}")
+	
+	def set_fast_figures(self, fast: bool) -> None:
+		"""
+		Set whether figures are built as plain dictionaries without validation.
+		
+		Plain-dictionary figures skip Plotly's per-property validation and are
+		written directly by save_visualization. Keep this off to get go.Figure
+		objects for interactive use and debugging.
+		
+		Args:
+			fast: True to return plain figure dictionaries, False for go.Figure objects.
+		"""
+		self.fast_figures = bool(fast)
+		logger.info(f"Fast figure construction {'enabled' if self.fast_figures else 'disabled'}")
+	
+	def _to_figure(self, fig_dict: Dict[str, Any]) -> Any:
+		"""Return a figure dictionary as is in fast mode, otherwise as a validated go.Figure."""
+		if self.fast_figures:
+			return fig_dict
+		
+		import plotly.graph_objects as go
+		return go.Figure(fig_dict)
+	
+	def _write_html(self, figure: Any, output_file: str, include_plotlyjs: Union[str, bool]) -> None:
+		"""
+		Write a figure to a full HTML file, compacting its data if enabled.
+		
+		Args:
+			figure: Plotly figure object or figure dictionary.
+			output_file: Path of the HTML file.
+			include_plotlyjs: include_plotlyjs argument for plotly.
+		"""
+		import plotly.io as pio
+		
+		pio.write_html(compact_figure(figure, self.compact_html), output_file,
+					   include_plotlyjs=include_plotlyjs, full_html=True, config=HTML_CONFIG,
+					   validate=False)
+	
+	def _get_include_plotlyjs(self, html_file: str, asset_dir: str) -> Union[str, bool]:
+		"""
+		Get the include_plotlyjs argument for writing an HTML file.
+		
+		Args:
+			html_file: Path of the HTML file being written.
+			asset_dir: Directory holding the shared plotly.js asset in 'local' mode.
+			
+		Returns:
+			'cdn', True (inline) or the relative path of the local plotly.js asset.
+		"""
+		if self.plotlyjs_mode == 'inline':
+			return True
+		if self.plotlyjs_mode == 'local':
+			asset_file = write_plotlyjs_asset(asset_dir)
+			relative = os.path.relpath(asset_file, os.path.dirname(os.path.abspath(html_file)))
+			return relative.replace(os.sep, '/')
+		return 'cdn'
+	
 	def create_visualization(self, include_anomalies: bool = True, 
-						   segmented: bool = False) -> Any:
+						   segmented: bool = False, max_points: Optional[int] = None,
+						   decimation: str = 'lttb', page_points: int = DEFAULT_PAGE_POINTS) -> Any:
 		"""
 		Create an interactive visualization of burial depth with problem areas highlighted.
 		
 		Args:
 			include_anomalies: Whether to highlight anomalies on the chart.
-			segmented: Whether to create a segmented visualization for very large datasets.
+			segmented: Whether to paginate very large datasets. The returned figure is
+				then a decimated overview, and save_visualization writes one page per
+				KP range plus an index page linking to them.
+			max_points: Maximum number of points in the depth profile trace (optional,
+				all points are plotted if not provided). Anomalies and problem section
+				boundaries are always kept.
+			decimation: Downsampling method used when max_points is set, 'lttb'
+				(Largest-Triangle-Three-Buckets) or 'minmax' (per-bucket min/max).
 			
 		Returns:
-			Plotly figure object with the interactive visualization.
+			Plotly figure object with the interactive visualization (a plain figure
+			dictionary if fast figures are enabled).
 		"""
 		if not self.plotly_available:
 			logger.error("Plotly is not available - cannot create visualization")
@@ -147,65 +419,143 @@ class Visualizer:
 			logger.error("Data or depth column not set for visualization")
 			return None
 			
-		# Import plotly here to ensure it's available
-		import plotly.graph_objects as go
-		from plotly.subplots import make_subplots
-		
 		logger.info("Creating interactive visualization...")
 		
-		# Determine what to use for x-axis
-		if self.kp_column and self.kp_column in self.data.columns:
-			x_values = self.data[self.kp_column]
-			x_label = 'Cable Position (KP)'
-			hover_pos_label = 'KP'
-		elif self.position_column and self.position_column in self.data.columns:
-			x_values = self.data[self.position_column]
-			x_label = f'Cable Position ({self.position_column})'
-			hover_pos_label = self.position_column
-		else:
-			x_values = self.data.index
-			x_label = 'Cable Position (Index)'
-			hover_pos_label = 'Position'
+		x_values, x_label, hover_pos_label = self._get_x_axis()
 		
-		if segmented and len(self.data) > 5000:
-			fig = self._create_segmented_visualization(x_values, hover_pos_label, include_anomalies)
+		if segmented and len(self.data) > page_points:
+			# Paginate: the figure is a decimated overview of the whole route
+			self.pagination = {
+				'page_points': page_points,
+				'include_anomalies': include_anomalies,
+				'decimation': decimation
+			}
+			plot_index = self._get_plot_index(x_values, max_points or OVERVIEW_POINTS, decimation)
 		else:
-			fig = self._create_standard_visualization(x_values, hover_pos_label, include_anomalies)
-		
-		# Update common layout
-		fig.update_layout(
-			title={
-				'text': 'Cable Burial Depth Analysis',
-				'y': 0.95,
-				'x': 0.5,
-				'xanchor': 'center',
-				'yanchor': 'top'
-			},
-			xaxis_title=x_label,
-			yaxis_title='Depth (m)',
-			yaxis=dict(
-				autorange="reversed",  # Invert y-axis so deeper is lower
-				zeroline=True,
-				zerolinecolor='rgba(0,0,0,1)',
-				gridcolor='rgba(0,0,0,0.05)'
-			),
-			xaxis=dict(
-				zeroline=True,
-				zerolinecolor='rgba(0,0,0,0.2)',
-				gridcolor='rgba(0,0,0,0.1)'
-			),
-			hovermode='closest',
-			legend_title='Legend',
-			plot_bgcolor='white',
-			margin=dict(l=50, r=50, t=80, b=50),
-			height=600
+			self.pagination = None
+			plot_index = self._get_plot_index(x_values, max_points, decimation)
+		
+		fig = self._to_figure(
+			self._create_standard_visualization(x_values, x_label, hover_pos_label, include_anomalies, plot_index)
 		)
+		if self.pagination:
+			self.pagination['overview'] = fig
+			self._stream_options = None
+		else:
+			# Lets save_visualization(stream=True) write the same figure with stream_visualization
+			self._stream_options = {
+				'figure': fig,
+				'include_anomalies': include_anomalies,
+				'max_points': max_points,
+				'decimation': decimation
+			}
+		
+		self.figure = fig
+		return fig
+	
+	def stream_visualization(self, output_file: str, include_anomalies: bool = True,
+							 max_points: Optional[int] = None, decimation: str = 'lttb') -> bool:
+		"""
+		Write the depth profile visualization straight to an HTML file.
+		
+		The figure is the same as create_visualization's, but the profile trace is
+		not held in the figure: its values are encoded from the data
+		columns into the file chunk by chunk. Peak memory stays close to the output
+		size instead of several copies of the data. self.figure is not changed.
+		
+		The target depth line, anomaly markers and problem section areas are written
+		from the figure as usual: they hold only the flagged rows and section
+		outlines, so their size does not grow with the profile length.
+		
+		save_visualization(stream=True) uses this for figures from create_visualization
+		whose profile has more than stream_threshold points.
+		
+		Args:
+			output_file: Path where the HTML file should be saved.
+			include_anomalies: Whether to highlight anomalies in the visualization.
+			max_points: Maximum number of depth profile points to plot (optional,
+				all points are written if None).
+			decimation: Downsampling method used when max_points is set ('lttb' or 'minmax').
+			
+		Returns:
+			bool: True if successful, False otherwise.
+		"""
+		if not self.plotly_available:
+			logger.error("Plotly is not available - cannot create visualization")
+			return False
+			
+		if self.data is None or self.depth_column is None:
+			logger.error("Data or depth column not set for visualization")
+			return False
+			
+		try:
+			output_dir = os.path.dirname(output_file)
+			if output_dir and not os.path.exists(output_dir):
+				os.makedirs(output_dir)
+			
+			x_values, x_label, hover_pos_label = self._get_x_axis()
+			if max_points and len(self.data) > max_points:
+				index = self._get_plot_index(x_values, max_points, decimation)
+			else:
+				index = None  # All rows, without materialising an index array
+			
+			# Build every other part of the figure with an empty profile trace
+			fig_dict = compact_figure(
+				self._create_standard_visualization(x_values, x_label, hover_pos_label, include_anomalies,
+													range(len(self.data)) if index is None else index,
+													profile_data=False),
+				self.compact_html
+			)
+			
+			# Reference the profile columns instead of copying them
+			profile = next(trace for trace in fig_dict['data'] if trace.get('name') == 'Burial Depth')
+			profile['x'] = StreamedArray(np.asarray(x_values), index, compact=self.compact_html)
+			profile['y'] = StreamedArray(self.data[self.depth_column].to_numpy(dtype=float), index,
+										 compact=self.compact_html)
+			
+			write_figure_html(fig_dict, output_file,
+							  include_plotlyjs=self._get_include_plotlyjs(
+								  output_file, os.path.dirname(os.path.abspath(output_file))),
+							  config=HTML_CONFIG)
+			logger.info(f"Visualization streamed to: {output_file}")
+			return True
+		except Exception as e:
+			logger.error(f"Failed to stream visualization: {str(e)}")
+			return False
+	
+	def _get_x_axis(self) -> Tuple[Any, str, str]:
+		"""
+		Get the x-axis values and labels of the depth profile.
+		
+		Returns:
+			Tuple of (x values, axis title, hover label).
+		"""
+		if self.kp_column and self.kp_column in self.data.columns:
+			return self.data[self.kp_column], 'Cable Position (KP)', 'KP'
+		if self.position_column and self.position_column in self.data.columns:
+			return (self.data[self.position_column], f'Cable Position ({self.position_column})',
+					self.position_column)
+		return self.data.index, 'Cable Position (Index)', 'Position'
+	
+	def _get_depth_layout(self, x_label: str) -> Dict[str, Any]:
+		"""
+		Get the depth profile layout with its summary annotations.
+		
+		Args:
+			x_label: Title of the x-axis.
+			
+		Returns:
+			Layout dictionary based on the cached depth template.
+		"""
+		layout = get_layout_template('depth')
+		layout['xaxis']['title'] = {'text': x_label}
 		
 		# Add useful annotations
+		annotations = []
 		if 'Is_Anomaly' in self.data.columns:
 			anomaly_count = self.data['Is_Anomaly'].sum()
 			if anomaly_count > 0:
-				fig.add_annotation(
+				annotations.append(dict(
 					text=f"{anomaly_count} anomalous data points detected",
 					align="left",
 					showarrow=False,
@@ -216,7 +566,7 @@ class Visualizer:
 					bgcolor="rgba(255,255,255,0.8)",
 					bordercolor="red",
 					borderwidth=1
-				)
+				))
 		
 		if self.problem_sections is not None and not self.problem_sections.empty:
 			section_count = len(self.problem_sections)
@@ -224,7 +574,7 @@ class Visualizer:
 			# If total_problem_length exists, include it
 			if 'Length_Meters' in self.problem_sections.columns:
 				total_length = self.problem_sections['Length_Meters'].sum()
-				fig.add_annotation(
+				annotations.append(dict(
 					text=f"{section_count} non-compliant sections (total: {total_length:.1f}m)",
 					align="right",
 					showarrow=False,
@@ -235,59 +585,84 @@ class Visualizer:
 					bgcolor="rgba(255,255,255,0.8)",
 					bordercolor="orange",
 					borderwidth=1
-				)
+				))
 		
-		self.figure = fig
-		return fig
+		if annotations:
+			layout['annotations'] = annotations
+		return layout
 	
-	def _create_standard_visualization(self, x_values, hover_pos_label, include_anomalies):
-		"""Create a standard (non-segmented) visualization."""
-		import plotly.graph_objects as go
+	def _create_standard_visualization(self, x_values, x_label, hover_pos_label, include_anomalies,
+									  plot_index, profile_data=True):
+		"""Create the depth profile figure dictionary of the plot_index rows."""
+		traces = []
 		
-		# Create main figure
-		fig = go.Figure()
+		# Add problem section highlighting first so it is drawn below the profile
+		if self.problem_sections is not None and not self.problem_sections.empty:
+			self._add_problem_section_highlighting(traces, x_values)
 		
-		# Add depth profile trace
-		fig.add_trace(
-			go.Scatter(
-				x=x_values,
-				y=self.data[self.depth_column],
-				mode='lines',
-				line=dict(color='brown', width=1),
-				name='Burial Depth',
-				hovertemplate=(
-					f"{hover_pos_label}: %{{x}}<br>"
-					f"Depth: %{{y:.2f}}m<extra></extra>"
-				)
+		# Add depth profile trace (left empty when its data is streamed)
+		traces.append(dict(
+			type=get_scatter_type(len(plot_index), self.render_mode, self.webgl_threshold),
+			x=np.asarray(x_values)[plot_index] if profile_data else [],
+			y=self.data[self.depth_column].to_numpy()[plot_index] if profile_data else [],
+			mode='lines',
+			line=dict(color='brown', width=1),
+			name='Burial Depth',
+			hovertemplate=(
+				f"{hover_pos_label}: %{{x}}<br>"
+				f"Depth: %{{y:.2f}}m<extra></extra>"
 			)
-		)
+		))
 		
 		# Add target depth line
-		fig.add_trace(
-			go.Scatter(
-				x=[x_values.min(), x_values.max()],
-				y=[self.target_depth, self.target_depth],
-				mode='lines',
-				line=dict(color='green', width=1, dash='dash'),
-				name=f'Target Depth ({self.target_depth}m)',
-				hoverinfo='name'
-			)
-		)
-		
-		# Add problem section highlighting if we have problem sections
-		if self.problem_sections is not None and not self.problem_sections.empty:
-			self._add_problem_section_highlighting(fig, x_values)
+		traces.append(dict(
+			type='scatter',
+			x=[x_values.min(), x_values.max()],
+			y=[self.target_depth, self.target_depth],
+			mode='lines',
+			line=dict(color='green', width=1, dash='dash'),
+			name=f'Target Depth ({self.target_depth}m)',
+			hoverinfo='name'
+		))
 		
 		# Add anomaly markers if requested and available
 		if include_anomalies and 'Is_Anomaly' in self.data.columns:
-			self._add_anomaly_markers(fig, x_values, hover_pos_label)
+			self._add_anomaly_markers(traces, x_values, hover_pos_label)
 			
-		return fig
+		return {'data': traces, 'layout': self._get_depth_layout(x_label)}
 	
-	def _add_anomaly_markers(self, fig, x_values, hover_pos_label):
-		"""Add anomaly markers to the visualization."""
-		import plotly.graph_objects as go
+	def _get_plot_index(self, x_values, max_points=None, decimation='lttb'):
+		"""
+		Get the row positions of the depth profile to plot.
 		
+		Args:
+			x_values: X-axis values of the depth profile.
+			max_points: Maximum number of points to plot (optional).
+			decimation: Downsampling method ('lttb' or 'minmax').
+			
+		Returns:
+			Sorted array of row positions (all rows if no budget is set).
+		"""
+		if not max_points or len(self.data) <= max_points:
+			return np.arange(len(self.data))
+		
+		x = np.asarray(x_values)
+		
+		# Always keep anomalies and the boundaries of problem sections
+		keep = np.zeros(len(self.data), dtype=bool)
+		if 'Is_Anomaly' in self.data.columns:
+			keep |= self.data['Is_Anomaly'].fillna(False).to_numpy(dtype=bool)
+		if self.problem_sections is not None and not self.problem_sections.empty:
+			boundary_columns = [column for column in self.problem_sections.columns
+								if column.startswith(('Start_', 'End_'))]
+			boundaries = self.problem_sections[boundary_columns].to_numpy().ravel()
+			keep |= np.isin(x, boundaries)
+		
+		return decimate(x, self.data[self.depth_column].to_numpy(dtype=float), max_points,
+						method=decimation, keep=keep)
+	
+	def _add_anomaly_markers(self, traces, x_values, hover_pos_label):
+		"""Add anomaly marker traces to the list of trace dictionaries."""
 		# If no anomalies column exists, return without adding markers
 		if 'Is_Anomaly' not in self.data.columns:
 			return
@@ -298,9 +673,6 @@ class Visualizer:
 		if len(anomalies) == 0:
 			return
 			
-		# Track which anomaly types we've added to avoid duplicate legend entries
-		added_anomaly_types = set()
-		
 		# Define marker styles for different anomaly types
 		marker_styles = {
 			'Exceeds maximum trenching depth': dict(
@@ -331,18 +703,31 @@ class Visualizer:
 						return key
 				return 'Unknown anomaly'
 			
-			# Add a temporary key column for grouping
-			anomalies['Anomaly_Key'] = anomalies['Anomaly_Type'].apply(get_anomaly_key)
+			# Map each distinct anomaly type to its key once
+			anomaly_types = anomalies['Anomaly_Type']
+			type_keys = {anomaly_type: get_anomaly_key(anomaly_type) for anomaly_type in pd.unique(anomaly_types)}
+			anomaly_keys = anomaly_types.map(type_keys).to_numpy()
+			
+			# Get x values for the anomalies
+			if self.kp_column and self.kp_column in anomalies.columns:
+				anomaly_x = anomalies[self.kp_column].to_numpy()
+			elif self.position_column and self.position_column in anomalies.columns:
+				anomaly_x = anomalies[self.position_column].to_numpy()
+			else:
+				anomaly_x = anomalies.index.to_numpy()
+			anomaly_depth = anomalies[self.depth_column].to_numpy()
+			anomaly_type_values = anomaly_types.to_numpy()
+			
+			# Hover text is formatted in the browser from the anomaly type in customdata
+			hovertemplate = (
+				f"{hover_pos_label}: %{{x}}<br>"
+				f"Depth: %{{y:.2f}}m<br>"
+				f"<b>Anomaly:</b> %{{customdata}}<extra></extra>"
+			)
 			
 			# Add traces for each anomaly type
-			for anomaly_key, group in anomalies.groupby('Anomaly_Key'):
-				# Get x values for this group
-				if self.kp_column and self.kp_column in group.columns:
-					group_x = group[self.kp_column]
-				elif self.position_column and self.position_column in group.columns:
-					group_x = group[self.position_column]
-				else:
-					group_x = group.index
+			for anomaly_key in sorted(set(type_keys.values())):
+				in_group = anomaly_keys == anomaly_key
 				
 				# Get marker style
 				marker = marker_styles.get(
@@ -350,112 +735,33 @@ class Visualizer:
 					dict(symbol='circle', size=8, color='gray')
 				)
 				
-				# Create hover text
-				hover_text = [
-					f"{hover_pos_label}: {x}<br>"
-					f"Depth: {row[self.depth_column]:.2f}m<br>"
-					f"<b>Anomaly:</b> {row['Anomaly_Type']}"
-					for x, (_, row) in zip(group_x, group.iterrows())
-				]
-				
 				# Add the trace
-				fig.add_trace(
-					go.Scatter(
-						x=group_x,
-						y=group[self.depth_column],
-						mode='markers',
-						marker=marker,
-						name=anomaly_key,
-						hovertext=hover_text,
-						hoverinfo='text'
-					)
-				)
+				traces.append(dict(
+					type=get_scatter_type(int(in_group.sum()), self.render_mode, self.webgl_threshold),
+					x=anomaly_x[in_group],
+					y=anomaly_depth[in_group],
+					customdata=anomaly_type_values[in_group],
+					mode='markers',
+					marker=marker,
+					name=anomaly_key,
+					hovertemplate=hovertemplate
+				))
 		else:
 			# If no Anomaly_Type column, just add all anomalies as a single group
 			marker = dict(symbol='circle', size=8, color='red')
-			fig.add_trace(
-				go.Scatter(
-					x=x_values[self.data['Is_Anomaly']],
-					y=self.data.loc[self.data['Is_Anomaly'], self.depth_column],
-					mode='markers',
-					marker=marker,
-					name='Anomaly',
-					hoverinfo='y'
-				)
-			)
-		
-		return fig  
-	
-	def _create_segmented_visualization(self, x_values, hover_pos_label, include_anomalies):
-		"""Create a segmented visualization for large datasets."""
-		import plotly.graph_objects as go
-		from plotly.subplots import make_subplots
-		
-		# Calculate number of segments (aim for ~1000 points per segment)
-		segment_size = 1000
-		num_segments = max(1, int(np.ceil(len(self.data) / segment_size)))
-		
-		logger.info(f"Creating segmented visualization with {num_segments} segments")
-		
-		# Create figure with subplot for each segment
-		fig = make_subplots(
-			rows=num_segments,
-			cols=1,
-			shared_xaxes=False,
-			vertical_spacing=0.02,
-			subplot_titles=[f"Segment {i+1}" for i in range(num_segments)]
-		)
-		
-		# Add data for each segment
-		for i in range(num_segments):
-			start_idx = i * segment_size
-			end_idx = min((i + 1) * segment_size, len(self.data))
-			
-			segment_data = self.data.iloc[start_idx:end_idx]
-			segment_x = x_values.iloc[start_idx:end_idx] if hasattr(x_values, 'iloc') else x_values[start_idx:end_idx]
-			
-			# Add depth profile trace
-			fig.add_trace(
-				go.Scatter(
-					x=segment_x,
-					y=segment_data[self.depth_column],
-					mode='lines',
-					line=dict(color='brown', width=1),
-					name='Burial Depth' if i == 0 else f'Burial Depth (Segment {i+1})',
-					showlegend=(i == 0),  # Only show in legend for first segment
-					hovertemplate=(
-						f"{hover_pos_label}: %{{x}}<br>"
-						f"Depth: %{{y:.2f}}m<extra></extra>"
-					)
-				),
-				row=i+1,
-				col=1
-			)
-			
-			# Add target depth line
-			fig.add_trace(
-				go.Scatter(
-					x=[segment_x.min(), segment_x.max()],
-					y=[self.target_depth, self.target_depth],
-					mode='lines',
-					line=dict(color='green', width=1, dash='dash'),
-					name=f'Target Depth ({self.target_depth}m)' if i == 0 else f'Target Depth (Segment {i+1})',
-					showlegend=(i == 0),  # Only show in legend for first segment
-					hoverinfo='name'
-				),
-				row=i+1,
-				col=1
-			)
-			
-			# Set y-axis to be reversed (deeper is lower)
-			fig.update_yaxes(autorange="reversed", row=i+1, col=1)
-		
-		return fig
+			is_anomaly = self.data['Is_Anomaly'].to_numpy(dtype=bool)
+			traces.append(dict(
+				type=get_scatter_type(len(anomalies), self.render_mode, self.webgl_threshold),
+				x=np.asarray(x_values)[is_anomaly],
+				y=self.data[self.depth_column].to_numpy()[is_anomaly],
+				mode='markers',
+				marker=marker,
+				name='Anomaly',
+				hoverinfo='y'
+			))
 	
-	def _add_problem_section_highlighting(self, fig, x_values):
-		"""Add problem section highlighting to the figure."""
-		import plotly.graph_objects as go
-		
+	def _add_problem_section_highlighting(self, traces, x_values):
+		"""Add problem section highlighting traces to the list of trace dictionaries."""
 		# Get position column names from the problem sections DataFrame
 		if 'Position_Type' not in self.problem_sections.columns:
 			logger.warning("Cannot add problem section highlighting - missing Position_Type column")
@@ -469,51 +775,46 @@ class Visualizer:
 			logger.warning(f"Cannot add problem section highlighting - missing {start_col} or {end_col} columns")
 			return
 		
-		# Add shapes for each severity level with different colors
+		# Fill colors for each severity level (at half opacity, drawn below the profile)
 		severity_colors = {
-			'High': 'rgba(255, 0, 0, 0.3)',    # Red
-			'Medium': 'rgba(255, 165, 0, 0.2)', # Orange
-			'Low': 'rgba(255, 255, 0, 0.15)'    # Yellow
+			'High': 'rgba(255, 0, 0, 0.15)',      # Red
+			'Medium': 'rgba(255, 165, 0, 0.1)',   # Orange
+			'Low': 'rgba(255, 255, 0, 0.075)'     # Yellow
 		}
 		
-		# Track which severities we've added to avoid duplicate legend entries
-		added_severities = set()
-		
-		for _, section in self.problem_sections.iterrows():
-			severity = section['Severity']
-			color = severity_colors.get(severity, 'rgba(128, 128, 128, 0.2)')
-			
-			# Add rectangle shape for this section
-			fig.add_shape(
-				type="rect",
-				x0=section[start_col],
-				x1=section[end_col],
-				y0=self.data[self.depth_column].min() * 0.9,  # Extend below the chart
-				y1=0,  # Up to the surface (y-axis will be inverted)
-				fillcolor=color,
-				opacity=0.5,
-				layer="below",
-				line_width=0
-			)
+		severities = self.problem_sections['Severity'].to_numpy()
+		starts = self.problem_sections[start_col].to_numpy(dtype=float)
+		ends = self.problem_sections[end_col].to_numpy(dtype=float)
+		y_bottom = self.data[self.depth_column].min() * 0.9  # Extend below the chart
+		y_top = 0  # Up to the surface (y-axis will be inverted)
+		
+		# One filled trace per severity: a closed rectangle per section, separated by gaps
+		rectangle_y = np.array([y_bottom, y_top, y_top, y_bottom, y_bottom, np.nan])
+		for severity in pd.unique(severities):
+			in_severity = severities == severity
+			section_starts = starts[in_severity][:, None]
+			section_ends = ends[in_severity][:, None]
 			
-			# Add to legend if we haven't seen this severity before
-			if severity not in added_severities:
-				fig.add_trace(
-					go.Scatter(
-						x=[None],
-						y=[None],
-						mode='markers',
-						marker=dict(
-							size=10,
-							color=color.replace('0.3', '1').replace('0.2', '1').replace('0.15', '1')
-						),
-						name=f'{severity} Severity Area',
-						showlegend=True
-					)
-				)
-				added_severities.add(severity)
-    
-	def create_position_visualization(self, data, kp_column, dcc_column=None):
+			rectangle_x = np.hstack([section_starts, section_starts, section_ends, section_ends,
+									 section_starts, np.full_like(section_starts, np.nan)])
+			
+			traces.append(dict(
+				type='scatter',
+				x=rectangle_x.ravel(),
+				y=np.tile(rectangle_y, len(rectangle_x)),
+				mode='lines',
+				fill='toself',
+				fillcolor=severity_colors.get(severity, 'rgba(128, 128, 128, 0.1)'),
+				line=dict(width=0),
+				hoveron='fills',
+				hoverinfo='name',
+				name=f'{severity} Severity Area',
+				legendrank=1001,  # Keep after the profile traces in the legend
+				showlegend=True
+			))
+	
+	def create_position_visualization(self, data, kp_column, dcc_column=None,
+									  max_points=DEFAULT_DASHBOARD_POINTS):
 		"""
 		Create a visualization specifically for position data quality.
 		
@@ -521,9 +822,11 @@ class Visualizer:
 			data: DataFrame containing position analysis results.
 			kp_column: Name of the KP column.
 			dcc_column: Name of the DCC column (optional).
+			max_points: Maximum number of points per trace (None plots every point).
 			
 		Returns:
-			Plotly figure object with the position visualization.
+			Plotly figure object with the position visualization (a plain figure
+			dictionary if fast figures are enabled).
 		"""
 		if not self.plotly_available:
 			logger.error("Plotly is not available - cannot create visualization")
@@ -533,21 +836,36 @@ class Visualizer:
 		from .position_visualizer import create_position_dashboard
 		
 		# Create the dashboard
-		fig = create_position_dashboard(data, kp_column, dcc_column)
+		fig = create_position_dashboard(data, kp_column, dcc_column,
+										render_mode=self.render_mode,
+										webgl_threshold=self.webgl_threshold,
+										max_points=max_points,
+										as_dict=self.fast_figures)
 	
 		return fig
 			
-	def save_visualization(self, output_file):
+	def save_visualization(self, output_file, figure=None, stream: bool = False):
 		"""
 		Save the interactive visualization to an HTML file.
 		
+		For a paginated visualization, output_file becomes the index page with the
+		overview trace, and the pages are written to a '<name>_pages' folder next to it.
+		
 		Args:
 			output_file: Path where the HTML file should be saved.
+			figure: Figure to save (optional, defaults to the current figure). Passing
+				the figure lets several figures be saved at the same time.
+			stream: Whether to write an unpaginated depth figure from create_visualization
+				with stream_visualization when its profile has more than stream_threshold
+				points, to keep peak memory low. The file is then rebuilt from the data,
+				so only use this if the figure has not been changed since it was created:
+				any edits (titles, layout, added traces) would not be saved.
 			
 		Returns:
 			bool: True if successful, False otherwise.
 		"""
-		if not self.figure:
+		figure = self.figure if figure is None else figure
+		if not figure:
 			logger.error("No visualization to save")
 			return False
 			
@@ -557,23 +875,255 @@ class Visualizer:
 			if output_dir and not os.path.exists(output_dir):
 				os.makedirs(output_dir)
 			
+			# Only the overview figure is saved with pages (the figure may have been replaced)
+			if self.pagination and self.pagination['overview'] is figure:
+				return self._save_paginated_visualization(output_file)
+			
+			# Stream large depth profiles straight from the data columns (if requested)
+			options = self._stream_options
+			if (stream and options and options['figure'] is figure and self.data is not None
+					and len(self.data) > self.stream_threshold):
+				return self.stream_visualization(
+					output_file, options['include_anomalies'], options['max_points'], options['decimation']
+				)
+			
 			# Save the figure
-			self.figure.write_html(
+			self._write_html(
+				figure,
 				output_file,
-				include_plotlyjs='cdn',  # Use CDN version of plotly.js (smaller file)
-				full_html=True,
-				config={
-					'responsive': True,
-					'displayModeBar': True,
-					'modeBarButtonsToAdd': ['drawline', 'eraseshape']
-				}
+				self._get_include_plotlyjs(output_file, os.path.dirname(os.path.abspath(output_file)))
 			)
 			logger.info(f"Visualization saved to: {output_file}")
 			return True
 		except Exception as e:
 			logger.error(f"Failed to save visualization: {str(e)}")
 			return False
+	
+	def _get_pages(self) -> List[Tuple[int, int, float, float]]:
+		"""
+		Split the data into pages of consecutive rows.
+		
+		Returns:
+			List of (start row, end row, start position, end position) per page.
+		"""
+		page_points = self.pagination['page_points']
+		x = self._get_x_values()
+		
+		pages = []
+		for start in range(0, len(self.data), page_points):
+			end = min(start + page_points, len(self.data))
+			page_x = x[start:end]
+			pages.append((start, end, np.nanmin(page_x), np.nanmax(page_x)))
+		return pages
+	
+	def _get_x_values(self) -> np.ndarray:
+		"""Get the x-axis values (KP, position column or index) as an array."""
+		if self.kp_column and self.kp_column in self.data.columns:
+			return self.data[self.kp_column].to_numpy()
+		if self.position_column and self.position_column in self.data.columns:
+			return self.data[self.position_column].to_numpy()
+		return self.data.index.to_numpy()
+	
+	def _create_page_figure(self, start: int, end: int, start_pos: float, end_pos: float) -> Any:
+		"""
+		Create the full-resolution figure of one page.
+		
+		Args:
+			start: First row of the page.
+			end: Row after the last row of the page.
+			start_pos: Position (KP, position or index) of the start of the page.
+			end_pos: Position of the end of the page.
+			
+		Returns:
+			Figure dictionary for the page.
+		"""
+		page = Visualizer()
+		page.data = self.data.iloc[start:end]
+		page.depth_column = self.depth_column
+		page.kp_column = self.kp_column
+		page.position_column = self.position_column
+		page.target_depth = self.target_depth
+		page.render_mode = self.render_mode
+		page.webgl_threshold = self.webgl_threshold
+		page.fast_figures = True  # Pages are only written to file
+		
+		# Only the problem sections overlapping the page
+		section_index = self.pagination.get('section_index')
+		if section_index is not None:
+			rows = np.sort(section_index.query_range(start_pos, end_pos)['Row'].to_numpy(dtype=np.int64))
+			page.problem_sections = self.problem_sections.iloc[rows]
+		
+		fig = page.create_visualization(include_anomalies=self.pagination['include_anomalies'])
+		fig['layout']['title']['text'] = f'Cable Burial Depth Analysis ({start_pos:.3f} - {end_pos:.3f})'
+		return fig
+	
+	def _build_section_index(self) -> Optional[KPIntervalIndex]:
+		"""
+		Index the problem sections by position, for looking up the sections of each page.
+		
+		Returns:
+			KPIntervalIndex with the row of each section in a 'Row' column, or None
+			if there are no problem sections with start and end positions.
+		"""
+		if self.problem_sections is None or self.problem_sections.empty or \
+				'Position_Type' not in self.problem_sections.columns:
+			return None
+		
+		pos_type = self.problem_sections['Position_Type'].iloc[0]
+		start_col, end_col = f'Start_{pos_type}', f'End_{pos_type}'
+		if start_col not in self.problem_sections.columns or end_col not in self.problem_sections.columns:
+			return None
+		
+		return KPIntervalIndex(pd.DataFrame({
+			'Start_KP': self.problem_sections[start_col].to_numpy(dtype=float),
+			'End_KP': self.problem_sections[end_col].to_numpy(dtype=float),
+			'Row': np.arange(len(self.problem_sections))
+		}))
+	
+	def _write_page(self, page_file: str, page: Tuple[int, int, float, float],
+					include_plotlyjs: Union[str, bool]) -> str:
+		"""Create one page figure and write it to an HTML file."""
+		self._write_html(self._create_page_figure(*page), page_file, include_plotlyjs)
+		return page_file
+	
+	def _save_paginated_visualization(self, output_file: str) -> bool:
+		"""
+		Save a paginated visualization: one page per KP range plus an index page.
+		
+		Pages are built and written concurrently.
+		
+		Args:
+			output_file: Path of the index page.
+			
+		Returns:
+			bool: True if successful, False otherwise.
+		"""
+		import plotly.io as pio
+		
+		pages = self._get_pages()
+		
+		base_name = os.path.splitext(os.path.basename(output_file))[0]
+		pages_dir_name = f"{base_name}_pages"
+		pages_dir = os.path.join(os.path.dirname(output_file), pages_dir_name)
+		os.makedirs(pages_dir, exist_ok=True)
+		
+		page_names = [f"page_{number:04d}.html" for number in range(1, len(pages) + 1)]
+		page_files = [os.path.join(pages_dir, name) for name in page_names]
+		
+		# Pages and index share one plotly.js asset next to the index page
+		asset_dir = os.path.dirname(os.path.abspath(output_file))
+		page_plotlyjs = self._get_include_plotlyjs(page_files[0], asset_dir)
+		
+		# Built once, so each page finds its sections without scanning them all
+		self.pagination['section_index'] = self._build_section_index()
+		
+		logger.info(f"Writing {len(pages)} visualization pages to: {pages_dir}")
+		with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4)) as executor:
+			list(executor.map(self._write_page, page_files, pages, [page_plotlyjs] * len(pages)))
+		
+		# Index page: overview figure followed by links to the pages
+		is_anomaly = self.data['Is_Anomaly'].to_numpy(dtype=bool) \
+			if 'Is_Anomaly' in self.data.columns else np.zeros(len(self.data), dtype=bool)
+		rows = []
+		for number, (name, (start, end, start_pos, end_pos)) in enumerate(zip(page_names, pages), 1):
+			rows.append(
+				f'<tr><td><a href="{pages_dir_name}/{name}">Page {number}</a></td>'
+				f'<td>{start_pos:.3f} - {end_pos:.3f}</td><td>{end - start}</td>'
+				f'<td>{int(is_anomaly[start:end].sum())}</td></tr>'
+			)
+		
+		overview = pio.to_html(compact_figure(self.pagination['overview'], self.compact_html),
+							   include_plotlyjs=self._get_include_plotlyjs(output_file, asset_dir),
+							   full_html=False, config=HTML_CONFIG, validate=False)
+		index_html = (
+			'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+			f'<title>{html.escape(base_name)}</title>\n'
+			'<style>body{font-family:sans-serif;margin:20px}table{border-collapse:collapse}'
+			'td,th{border:1px solid #ccc;padding:4px 10px;text-align:right}</style>\n</head>\n<body>\n'
+			f'{overview}\n'
+			f'<h2>Detail pages ({len(pages)})</h2>\n'
+			'<table>\n<tr><th>Page</th><th>Range</th><th>Points</th><th>Anomalies</th></tr>\n'
+			+ '\n'.join(rows) +
+			'\n</table>\n</body>\n</html>\n'
+		)
+		with open(output_file, 'w', encoding='utf-8') as f:
+			f.write(index_html)
+		
+		logger.info(f"Visualization index saved to: {output_file}")
+		return True
 
+	def create_tile_viewer(self, output_dir: str, tile_points: int = DEFAULT_TILE_POINTS) -> Optional[str]:
+		"""
+		Create a local multi-resolution viewer for the full depth profile.
+		
+		A min/max pyramid of the profile is precomputed and written to output_dir
+		together with a viewer page. Serve it with serve_tile_viewer: the page then
+		only fetches the tiles of the visible window at a suitable resolution.
+		
+		Args:
+			output_dir: Directory to write the tiles, manifest and viewer page to.
+			tile_points: Number of points per tile.
+			
+		Returns:
+			Path of the viewer page, or None if it could not be created.
+		"""
+		if self.data is None or self.depth_column is None:
+			logger.error("Data or depth column not set for tile viewer")
+			return None
+			
+		try:
+			if self.kp_column and self.kp_column in self.data.columns:
+				x_label = 'KP'
+			elif self.position_column and self.position_column in self.data.columns:
+				x_label = self.position_column
+			else:
+				x_label = 'Index'
+			
+			build_tile_pyramid(
+				self._get_x_values(),
+				self.data[self.depth_column].to_numpy(dtype=float),
+				output_dir,
+				tile_points=tile_points,
+				metadata={
+					'title': 'Cable Burial Depth Analysis',
+					'x_label': x_label,
+					'y_label': 'Depth (m)',
+					'target_depth': self.target_depth,
+					'reverse_y': True
+				}
+			)
+			# The viewer is served over HTTP, so an inline asset is also written as a file
+			plotlyjs_src = None
+			if self.plotlyjs_mode != 'cdn':
+				plotlyjs_src = os.path.basename(write_plotlyjs_asset(output_dir))
+			return write_tile_viewer(output_dir, plotlyjs_src=plotlyjs_src)
+		except Exception as e:
+			logger.error(f"Failed to create tile viewer: {str(e)}")
+			return None
+	
+	def serve_tile_viewer(self, output_dir: str, port: int = 0,
+						  open_browser: bool = True) -> Optional[TileServer]:
+		"""
+		Serve a tile viewer created with create_tile_viewer from a local HTTP server.
+		
+		Args:
+			output_dir: Directory containing the tile viewer.
+			port: Port to listen on (0 picks a free port).
+			open_browser: Whether to open the viewer in the default web browser.
+			
+		Returns:
+			The running TileServer (call stop() when done), or None on failure.
+		"""
+		try:
+			server = TileServer(output_dir, port=port)
+			url = server.start()
+			if open_browser:
+				webbrowser.open(url)
+			return server
+		except Exception as e:
+			logger.error(f"Failed to start tile viewer: {str(e)}")
+			return None
+	
 	def open_visualization(self, html_file):
 		"""
 		Open the visualization HTML file in the default web browser.
@@ -0,0 +1,75 @@
+"""
+Test module for along-track distance and KP reconstruction.
+
+This module contains tests for the along_track functions and their use in
+position analysis.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.along_track import segment_lengths, cumulative_distance, reconstruct_kp
+from cbatool.core.position_analyzer import PositionAnalyzer
+
+
+class TestAlongTrack(unittest.TestCase):
+    """Test cases for the along-track distance engine."""
+
+    def test_haversine_segment(self):
+        """Test that one degree of latitude is about 111.2 km."""
+        lengths = segment_lengths(np.array([0.0, 0.0]), np.array([0.0, 1.0]), geographic=True)
+        self.assertTrue(np.isnan(lengths[0]))
+        self.assertAlmostEqual(lengths[1] / 1000, 111.195, places=2)
+
+    def test_reconstruct_and_drift(self):
+        """Test filling missing KP and flagging KP that drifts from the distance travelled."""
+        distance = cumulative_distance(np.r_[np.nan, np.full(99, 10.0)])
+        kp = 5.0 + distance / 1000 * 1.02  # Offset and slack are not drift
+        kp[40:45] = np.nan
+        kp[80] += 0.05
+
+        result = reconstruct_kp(kp, distance, drift_threshold=0.01)
+
+        np.testing.assert_array_equal(np.flatnonzero(result['is_reconstructed']), np.arange(40, 45))
+        np.testing.assert_allclose(result['kp'][40:45], 5.0 + distance[40:45] / 1000 * 1.02, atol=1e-3)
+        np.testing.assert_array_equal(np.flatnonzero(result['is_drift']), [80])
+
+    def test_drift_on_curved_slack_route(self):
+        """Test that turns, growing slack and GPS jitter are not reported as drift."""
+        rng = np.random.default_rng(5)
+        route = np.arange(6000) * 5.0  # 30 km along the route, every 5 m
+        heading = 0.6 * np.sin(route / 4000.0)
+        easting = np.cumsum(5.0 * np.cos(heading)) + rng.normal(0, 0.3, 6000)
+        northing = np.cumsum(5.0 * np.sin(heading)) + rng.normal(0, 0.3, 6000)
+        slack = 1.0 + 0.03 * route / route[-1]
+        kp = np.cumsum(np.r_[0.0, np.diff(route) * slack[1:]]) / 1000
+        kp[3000:3040] += 0.03  # 30 m drift over 200 m
+
+        result = reconstruct_kp(kp, cumulative_distance(segment_lengths(easting, northing)))
+
+        np.testing.assert_array_equal(np.flatnonzero(result['is_drift']), np.arange(3000, 3040))
+
+    def test_position_analysis_columns(self):
+        """Test along-track columns added by position analysis, serial and parallel."""
+        rng = np.random.default_rng(11)
+        easting = np.cumsum(rng.uniform(0.5, 1.5, 200))
+        kp = easting / 1000
+        kp[100:110] += 0.2  # Reported KP drifts away from the track
+        data = pd.DataFrame({'KP': kp, 'E': easting, 'N': np.zeros(200)})
+
+        results = []
+        for n_jobs in (1, 2):
+            analyzer = PositionAnalyzer(data)
+            analyzer.set_columns(kp_column='KP', easting_column='E', northing_column='N')
+            analyzer.analyze_data(n_jobs=n_jobs, chunk_size=70)
+            results.append(analyzer.data)
+
+        pd.testing.assert_frame_equal(results[0], results[1])
+        np.testing.assert_allclose(results[0]['Along_Track_Distance'], easting - easting[0])
+        self.assertTrue(results[0]['Is_KP_Drift'].iloc[100:110].all())
+        self.assertFalse(results[0]['Is_KP_Drift'].iloc[:90].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
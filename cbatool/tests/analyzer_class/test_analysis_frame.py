@@ -0,0 +1,68 @@
+"""
+Test module for the shared analysis frame.
+
+This module contains tests for SharedAnalysisFrame and analyzers attached to it.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.analysis_frame import SharedAnalysisFrame
+from cbatool.core.depth_analyzer import DepthAnalyzer
+from cbatool.core.position_analyzer import PositionAnalyzer
+
+
+class TestSharedAnalysisFrame(unittest.TestCase):
+    """Test cases for the SharedAnalysisFrame class."""
+
+    def setUp(self):
+        """Set up survey data with depth and position columns."""
+        rng = np.random.default_rng(3)
+        self.data = pd.DataFrame({
+            'KP': np.cumsum(rng.uniform(0.0005, 0.0015, 300)),
+            'Depth': rng.normal(1.6, 0.3, 300),
+            'DCC': rng.normal(0, 4, 300)
+        })
+
+    def _run(self, depth_analyzer, position_analyzer):
+        depth_analyzer.set_columns(kp_column='KP', depth_column='Depth')
+        depth_analyzer.set_target_depth(1.5)
+        depth_analyzer.analyze_data()
+        position_analyzer.set_columns(kp_column='KP', dcc_column='DCC')
+        position_analyzer.analyze_data()
+        position_analyzer.identify_problem_sections()
+
+    def test_shared_matches_separate(self):
+        """Test that analyzers on a shared frame give the same results as on copies."""
+        depth, position = DepthAnalyzer(self.data.copy()), PositionAnalyzer(self.data.copy())
+        self._run(depth, position)
+
+        frame = SharedAnalysisFrame(self.data.copy())
+        shared_depth, shared_position = DepthAnalyzer(), PositionAnalyzer()
+        shared_depth.set_shared_frame(frame)
+        shared_position.set_shared_frame(frame)
+        self._run(shared_depth, shared_position)
+
+        # One frame holds every derived column
+        self.assertIs(shared_depth.data, frame.data)
+        self.assertIs(shared_position.data, frame.data)
+
+        pd.testing.assert_frame_equal(frame.view('depth'), depth.analysis_results['depth_analysis'])
+        pd.testing.assert_frame_equal(frame.view('position'), position.data)
+        self.assertEqual(frame.get_owner('Is_KP_Jump'), 'position')
+        self.assertEqual(frame.get_owner('Depth_Change'), 'depth')
+        self.assertIsNone(frame.get_owner('KP'))
+
+    def test_diff_cached(self):
+        """Test that column differences are computed once and shared."""
+        frame = SharedAnalysisFrame(self.data)
+        kp_diff = frame.diff('KP')
+
+        self.assertIs(frame.diff('KP'), kp_diff)
+        self.assertTrue(np.isnan(kp_diff[0]))
+        np.testing.assert_allclose(kp_diff[1:], np.diff(self.data['KP']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Test module for profile decimation.
+
+This module contains tests for the decimation functions and their use in the
+depth profile visualization.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.decimation import decimate
+from cbatool.core.visualizer import Visualizer
+
+
+class TestDecimation(unittest.TestCase):
+    """Test cases for shape-preserving decimation."""
+
+    def setUp(self):
+        """Set up a noisy depth profile with a single deep spike."""
+        rng = np.random.default_rng(4)
+        self.x = np.arange(50000) * 0.001
+        self.y = 1.5 + 0.2 * np.sin(self.x) + rng.normal(0, 0.02, 50000)
+        self.y[31234] = 4.0
+
+    def test_methods_keep_shape(self):
+        """Test that both methods respect the budget and keep the extremes."""
+        for method in ('lttb', 'minmax'):
+            selected = decimate(self.x, self.y, 1000, method=method)
+            self.assertLessEqual(len(selected), 1002)
+            self.assertTrue(np.all(np.diff(selected) > 0))
+            self.assertEqual(selected[0], 0)
+            self.assertEqual(selected[-1], len(self.y) - 1)
+            self.assertIn(31234, selected)
+
+        np.testing.assert_array_equal(decimate(self.x[:50], self.y[:50], 1000), np.arange(50))
+
+    def test_visualization_keeps_anomalies(self):
+        """Test that anomalies and section boundaries survive decimation of the depth trace."""
+        is_anomaly = np.zeros(50000, dtype=bool)
+        is_anomaly[[100, 20001, 49000]] = True
+        data = pd.DataFrame({'KP': self.x, 'Depth': self.y, 'Is_Anomaly': is_anomaly})
+        sections = pd.DataFrame({'Position_Type': ['KP'], 'Start_KP': [self.x[777]],
+                                 'End_KP': [self.x[888]], 'Severity': ['High']})
+
+        visualizer = Visualizer()
+        visualizer.set_data(data, sections)
+        visualizer.set_columns(depth_column='Depth', kp_column='KP')
+        fig = visualizer.create_visualization(max_points=2000)
+
+        depth_x = np.asarray(next(trace.x for trace in fig.data if trace.name == 'Burial Depth'))
+        self.assertLess(len(depth_x), 2100)
+        for position in (100, 20001, 49000, 777, 888):
+            self.assertIn(self.x[position], depth_x)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test module for the KP interval index.
+
+This module contains tests for the KPIntervalIndex class and the KP query
+methods exposed on analyzers.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.kp_index import KPIntervalIndex
+from cbatool.core.depth_analyzer import DepthAnalyzer
+
+
+class TestKPIntervalIndex(unittest.TestCase):
+    """Test cases for the KPIntervalIndex class."""
+
+    def test_queries_match_scan(self):
+        """Test range and point queries against a full scan, including nested intervals."""
+        rng = np.random.default_rng(7)
+        start = rng.uniform(0, 50, 400)
+        end = start + rng.exponential(0.5, 400)
+        end[::50] = start[::50] + 20  # Long intervals nesting many others
+        intervals = pd.DataFrame({'Start_KP': start, 'End_KP': end, 'Label': np.arange(400)})
+
+        index = KPIntervalIndex(intervals)
+
+        for query_start, query_end in [(12.3, 14.8), (0, 0.1), (30, 30), (60, 70), (-5, 100)]:
+            expected = np.sort(np.flatnonzero((end >= query_start) & (start <= query_end)))
+            result = index.query_range(query_start, query_end)
+            np.testing.assert_array_equal(np.sort(result['Label'].to_numpy()), expected)
+            self.assertEqual(index.count_range(query_start, query_end), len(expected))
+            self.assertTrue(result['Start_KP'].is_monotonic_increasing)
+
+        point = index.query_point(start[5])
+        self.assertIn(5, point['Label'].tolist())
+
+        # Fully nested intervals
+        nested = KPIntervalIndex(pd.DataFrame({'Start_KP': np.arange(100) * 0.1, 'End_KP': 20 - np.arange(100) * 0.1}))
+        self.assertEqual(nested.count_range(9.95, 10.0), 100)
+        self.assertEqual(nested.count_range(15.05, 15.1), 50)
+
+    def test_empty_index(self):
+        """Test that an empty index answers queries with no results."""
+        index = KPIntervalIndex()
+        self.assertEqual(len(index.query_range(0, 10)), 0)
+        self.assertEqual(len(KPIntervalIndex.concat([index, None])), 0)
+
+    def test_analyzer_kp_queries(self):
+        """Test KP queries over depth analysis results."""
+        kp = np.arange(200) * 0.01
+        depth = np.full(200, 2.0)
+        depth[50:60] = 1.0  # Non-compliant section at KP 0.50-0.59
+        data = pd.DataFrame({'KP': kp, 'Depth': depth})
+
+        analyzer = DepthAnalyzer(data)
+        analyzer.set_columns(kp_column='KP', depth_column='Depth')
+        analyzer.set_target_depth(1.5)
+        analyzer.analyze_data()
+
+        sections = analyzer.query_kp_range(0.4, 0.55)
+        sections = sections[sections['Source'] == 'depth_section']
+        self.assertEqual(len(sections), 1)
+        self.assertAlmostEqual(sections['Start_KP'].iloc[0], 0.5)
+        self.assertEqual(len(analyzer.query_kp(1.5)[lambda frame: frame['Source'] == 'depth_section']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
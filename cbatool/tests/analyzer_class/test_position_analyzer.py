@@ -0,0 +1,131 @@
+"""
+Test module for position analyzer.
+
+This module contains tests for the PositionAnalyzer class.
+"""
+
+import threading
+import unittest
+import unittest.mock
+import pandas as pd
+import numpy as np
+
+from cbatool.core import position_analyzer
+from cbatool.core.position_analyzer import PositionAnalyzer, compute_kp_continuity
+from cbatool.core.process_pool import get_pool_context
+
+
+class TestPositionAnalyzer(unittest.TestCase):
+    """Test cases for the PositionAnalyzer class."""
+
+    def setUp(self):
+        """Set up position data with a short and a long poor quality section."""
+        kp = np.arange(60) * 0.001
+        kp[20] = kp[19] - 0.01  # Single KP reversal
+        kp[40:48:2] -= 0.01  # Stretch of alternating KP reversals
+        dcc = np.zeros(60)
+        dcc[20] = 30.0
+        dcc[40:49] = 30.0
+
+        self.data = pd.DataFrame({'KP': kp, 'DCC': dcc})
+        self.analyzer = PositionAnalyzer(self.data)
+        self.analyzer.set_columns(kp_column='KP', dcc_column='DCC')
+        self.analyzer.analyze_data()
+
+    def test_identify_problem_sections(self):
+        """Test that problem sections match the poor quality runs."""
+        data = self.analyzer.data
+        sections = self.analyzer.identify_problem_sections(min_section_length=1)
+
+        # One section per run of consecutive poor quality points
+        is_poor = (data['Position_Quality'] == 'Poor').to_numpy()
+        run_count = np.count_nonzero(is_poor & ~np.concatenate(([False], is_poor[:-1])))
+        self.assertEqual(len(sections), run_count)
+        self.assertEqual(sections['Point_Count'].sum(), is_poor.sum())
+
+        for _, section in sections.iterrows():
+            group = data.loc[section['Start_Index']:section['End_Index']]
+            self.assertTrue((group['Position_Quality'] == 'Poor').all())
+            self.assertAlmostEqual(section['Start_KP'], group['KP'].min())
+            self.assertAlmostEqual(section['Avg_DCC'], group['DCC'].abs().mean())
+            if group['Is_KP_Reversal'].any():
+                self.assertEqual(section['Severity'], 'High')
+
+    def test_min_section_length(self):
+        """Test that short sections are filtered out."""
+        sections = self.analyzer.identify_problem_sections(min_section_length=5)
+        self.assertTrue((sections['Point_Count'] >= 5).all())
+
+    def test_standardized_anomaly_details(self):
+        """Test that anomaly details follow the reversal > jump > duplicate > deviation priority."""
+        standardized = self.analyzer.get_standardized_results()
+        details = standardized['anomalies']['details']
+        data = self.analyzer.data
+
+        self.assertEqual(len(details), standardized['anomalies']['total_count'])
+        for detail in details:
+            row = data.loc[int(detail['anomaly_id'])]
+            if row['Is_KP_Reversal']:
+                self.assertEqual((detail['type'], detail['severity']), ('KP Reversal', 'high'))
+            elif row['Is_Significant_Deviation'] and not (row['Is_KP_Jump'] or row['Is_KP_Duplicate']):
+                self.assertEqual(detail['type'], 'Significant Cross-Track Deviation')
+            self.assertEqual(detail['position'], row['KP'])
+            self.assertIsInstance(detail['recommended_action'], str)
+
+    def test_kp_continuity_kernel(self):
+        """Test KP continuity flags and scores computed by the kernel."""
+        kp = np.array([0.0, 0.001, 0.002, 0.2, 0.199, 0.199, 0.200])
+        continuity = compute_kp_continuity(kp, jump_threshold=0.1, reversal_threshold=0.0001)
+
+        self.assertTrue(np.isnan(continuity['kp_diff'][0]))
+        np.testing.assert_array_equal(np.flatnonzero(continuity['is_jump']), [3])
+        np.testing.assert_array_equal(np.flatnonzero(continuity['is_reversal']), [4])
+        np.testing.assert_array_equal(np.flatnonzero(continuity['is_duplicate']), [5])
+        self.assertEqual(continuity['score'][0], 1.0)
+        self.assertEqual(continuity['score'][3], 0.0)
+        self.assertEqual(continuity['score'][4], 0.0)
+
+    def test_lean_analysis(self):
+        """Test that lean analysis gives the same scores without intermediate columns."""
+        lean_analyzer = PositionAnalyzer(self.data)
+        lean_analyzer.set_columns(kp_column='KP', dcc_column='DCC')
+        lean_analyzer.analyze_data(lean=True)
+
+        self.assertNotIn('KP_Diff', lean_analyzer.data.columns)
+        pd.testing.assert_series_equal(lean_analyzer.data['Position_Quality_Score'],
+                                       self.analyzer.data['Position_Quality_Score'])
+
+    def test_parallel_matches_serial(self):
+        """Test that chunked parallel analysis stitches to the serial result exactly."""
+        parallel_analyzer = PositionAnalyzer(self.data)
+        parallel_analyzer.set_columns(kp_column='KP', dcc_column='DCC')
+        # Chunk boundary at row 44 falls inside the long problem section
+        parallel_analyzer.analyze_data(n_jobs=2, chunk_size=22)
+
+        pd.testing.assert_frame_equal(parallel_analyzer.data, self.analyzer.data)
+        pd.testing.assert_frame_equal(parallel_analyzer.identify_problem_sections(min_section_length=1),
+                                      self.analyzer.identify_problem_sections(min_section_length=1))
+
+
+    def test_parallel_from_worker_thread(self):
+        """Test that parallel analysis started from a worker thread runs in spawned processes."""
+        threaded_analyzer = PositionAnalyzer(self.data)
+        threaded_analyzer.set_columns(kp_column='KP', dcc_column='DCC')
+        contexts = []
+
+        def analyze():
+            contexts.append(get_pool_context())
+            threaded_analyzer.analyze_data(n_jobs=2, chunk_size=22)
+
+        with unittest.mock.patch.object(position_analyzer.logger, 'warning') as warning:
+            thread = threading.Thread(target=analyze)
+            thread.start()
+            thread.join()
+            warning.assert_not_called()  # No serial fallback
+
+        self.assertEqual(contexts[0].get_start_method(), 'spawn')
+        pd.testing.assert_frame_equal(threaded_analyzer.data, self.analyzer.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test module for the map projection functions.
+
+This module contains tests for the Transverse Mercator projection and the
+projection of latitude/longitude data in position analysis.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.projection import latlon_to_utm, utm_to_latlon
+from cbatool.core.position_analyzer import PositionAnalyzer
+
+
+class TestProjection(unittest.TestCase):
+    """Test cases for the UTM projection."""
+
+    def test_reference_points(self):
+        """Test projection against reference UTM coordinates in both hemispheres."""
+        easting, northing, zone, south = latlon_to_utm(np.array([52.3, 52.3]), np.array([5.5, 5.5]))
+        self.assertEqual((zone, south), (31, False))
+        self.assertAlmostEqual(easting[0], 670463.1230, places=3)
+        self.assertAlmostEqual(northing[0], 5797349.2434, places=3)
+
+        easting, northing, zone, south = latlon_to_utm(np.array([-33.9]), np.array([151.2]))
+        self.assertEqual((zone, south), (56, True))
+        self.assertAlmostEqual(easting[0], 333568.9410, places=3)
+        self.assertAlmostEqual(northing[0], 6247473.3368, places=3)
+
+    def test_round_trip(self):
+        """Test that the inverse transform recovers latitude/longitude."""
+        rng = np.random.default_rng(2)
+        lat = rng.uniform(-70, 70, 1000)
+        lon = rng.uniform(-3, 3, 1000) + 9
+
+        easting, northing, zone, south = latlon_to_utm(lat, lon, zone=32, south=False)
+        lat_back, lon_back = utm_to_latlon(easting, northing, zone, south)
+
+        np.testing.assert_allclose(lat_back, lat, atol=1e-9)
+        np.testing.assert_allclose(lon_back, lon, atol=1e-9)
+
+    def test_position_analysis_uses_projection(self):
+        """Test that latitude/longitude-only data is analyzed on projected coordinates."""
+        lat = 55.0 + np.arange(100) * 0.00001
+        data = pd.DataFrame({'KP': np.arange(100) * 0.0011, 'Lat': lat, 'Lon': np.full(100, 1.0)})
+
+        analyzer = PositionAnalyzer(data)
+        analyzer.set_columns(kp_column='KP', lat_column='Lat', lon_column='Lon')
+        analyzer.analyze_data()
+
+        self.assertEqual(analyzer.easting_column, 'Easting_UTM')
+        self.assertEqual(analyzer.utm_zone, (31, False))
+        self.assertIn('Easting_Diff', analyzer.data.columns)
+        self.assertAlmostEqual(analyzer.data['Along_Track_Distance'].iloc[-1], 99 * 1.113, delta=0.5)
+
+        # New data is projected again, in its own zone
+        analyzer.set_data(data.assign(Lat=-lat, Lon=151.2))
+        self.assertTrue(analyzer.analyze_data())
+        self.assertEqual(analyzer.utm_zone, (56, True))
+
+        # Without any finite positions the projection is skipped
+        analyzer.set_data(data.assign(Lat=np.nan, Lon=np.nan))
+        self.assertTrue(analyzer.analyze_data())
+        self.assertIsNone(analyzer.utm_zone)
+        self.assertIsNone(analyzer.easting_column)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Test module for the ReportGenerator class.
+
+This module contains tests for the Excel and PDF report outputs.
+"""
+
+import os
+import tempfile
+import unittest
+import unittest.mock
+import numpy as np
+import pandas as pd
+
+from cbatool.utils.report_generator import ReportGenerator
+
+
+class TestReportGenerator(unittest.TestCase):
+    """Test cases for the ReportGenerator class."""
+
+    def setUp(self):
+        """Set up depth analysis results with problem sections and anomalies."""
+        rng = np.random.default_rng(3)
+        n = 5000
+        self.data = pd.DataFrame({
+            'KP': np.arange(n) * 0.001,
+            'Depth': rng.normal(1.6, 0.2, n)
+        })
+        starts = np.arange(12) * 0.4 + 0.1
+        self.sections = pd.DataFrame({
+            'Section_ID': np.arange(1, 13),
+            'Position_Type': 'KP',
+            'Start_KP': starts,
+            'End_KP': starts + 0.02,
+            'Severity': np.array(['High', 'Medium', 'Low'])[np.arange(12) % 3]
+        })
+        self.results = {
+            'analysis_complete': True,
+            'depth_analysis': self.data,
+            'target_depth': 1.5,
+            'compliance_percentage': 71.2,
+            'problem_sections': self.sections,
+            'anomalies': self.data.iloc[::250].copy()
+        }
+
+    def test_consolidated_workbook(self):
+        """Test that the workbook is built from the frames, with individual files optional."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = ReportGenerator(output_dir)
+            reports = generator.create_comprehensive_report(self.results)
+
+            self.assertEqual(reports['individual_reports'], {})
+            self.assertEqual(sorted(name for name in os.listdir(output_dir) if name.endswith('.xlsx')),
+                             ['depth_analysis_report.xlsx'])
+            sheets = pd.read_excel(reports['excel_report'], sheet_name=None)
+            self.assertEqual(list(sheets), ['Summary', 'Recommendations', 'Depth Problem Sections',
+                                            'Depth Anomalies', 'Project Information'])
+            self.assertEqual(len(sheets['Depth Anomalies']), 20)
+            self.assertEqual(list(sheets['Summary']['Total Rows'][1:]), [3, 12, 20])
+
+            generator.set_individual_reports(True)
+            reports = generator.create_comprehensive_report(self.results)
+            self.assertEqual(sorted(map(os.path.basename, reports['individual_reports'].values())),
+                             ['depth_anomalies.xlsx', 'depth_problem_sections.xlsx', 'recommendations.xlsx'])
+            summary = pd.read_excel(reports['excel_report'], sheet_name='Summary')
+            self.assertIn('recommendations.xlsx', list(summary['File']))
+
+    def test_streaming_writer(self):
+        """Test that the streaming writer round-trips chunked rows with column-level formatting."""
+        import openpyxl
+        from cbatool.utils.excel_writer import StreamingExcelWriter
+
+        frame = self.sections.assign(Min_Depth=np.where(np.arange(12) % 5 == 0, np.nan, 1.2),
+                                     Surveyed=pd.date_range('2024-01-01', periods=12, freq='D'))
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = os.path.join(output_dir, 'report.xlsx')
+            with StreamingExcelWriter(output_path, chunk_rows=5) as writer:
+                writer.write_sheet('Depth Problem Sections', frame)
+
+            pd.testing.assert_frame_equal(pd.read_excel(output_path), frame, check_dtype=False)
+            worksheet = openpyxl.load_workbook(output_path)['Depth Problem Sections']
+            ranges = list(worksheet.conditional_formatting)
+            self.assertEqual([str(cf.sqref) for cf in ranges], ['E2:E13'])
+            self.assertEqual([rule.formula for rule in ranges[0].rules], [['"High"'], ['"Medium"'], ['"Low"']])
+            self.assertIsNone(worksheet['E2'].fill.fill_type)  # No per-cell styles
+
+    def test_openpyxl_formatting(self):
+        """Test that the openpyxl workbook is formatted with column-level conditional rules."""
+        import openpyxl
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = ReportGenerator(output_dir)
+            generator.report_config['excel_writer'] = 'openpyxl'
+            workbook = openpyxl.load_workbook(generator.create_comprehensive_report(self.results)['excel_report'])
+
+            sections = workbook['Depth Problem Sections']
+            self.assertEqual([str(cf.sqref) for cf in sections.conditional_formatting], ['E2:E13'])
+            self.assertIsNone(sections['E2'].fill.fill_type)  # No per-cell styles
+            self.assertEqual(sections.column_dimensions['A'].width, len('Section_ID') + 2)
+
+            recommendations = workbook['Recommendations']
+            rules = {str(cf.sqref): [rule.type for rule in cf.rules] for cf in recommendations.conditional_formatting}
+            self.assertEqual(rules, {'B2:B4': ['cellIs'] * 3, 'A2:A4': ['expression']})
+
+    def test_pdf_charts(self):
+        """Test that the PDF summary embeds a profile chart and one chart per section."""
+        chart_data = {'data': self.data, 'kp_column': 'KP', 'depth_column': 'Depth',
+                      'target_depth': 1.5, 'problem_sections': self.sections}
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = ReportGenerator(output_dir)
+            reports = generator.create_comprehensive_report(self.results, chart_data=chart_data)
+
+            self.assertTrue(os.path.getsize(reports['pdf_report']) > 0)
+            charts = sorted(os.listdir(os.path.join(output_dir, 'report_charts')))
+            self.assertEqual(len(charts), 13)
+            self.assertEqual(charts[0], 'depth_profile.png')
+            with open(reports['pdf_report'], 'rb') as f:
+                self.assertEqual(f.read().count(b'/Subtype /Image'), 13)
+
+
+    def test_failed_tasks(self):
+        """Test that report tasks that write nothing are returned as failed."""
+        chart_data = {'data': self.data, 'kp_column': 'KP', 'depth_column': 'Depth'}
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = ReportGenerator(output_dir)
+            reports = generator.create_comprehensive_report(self.results, chart_data=chart_data)
+            self.assertEqual(reports['failed_tasks'], [])
+
+            # Both writers log the error and return an empty result
+            with unittest.mock.patch('cbatool.utils.static_charts.render_charts', side_effect=RuntimeError("no fonts")), \
+                    unittest.mock.patch.object(generator, '_load_report_frames', side_effect=OSError("disk full")):
+                reports = generator.create_comprehensive_report(self.results, chart_data=chart_data)
+
+            self.assertEqual(reports['excel_report'], "")
+            self.assertTrue(os.path.exists(reports['pdf_report']))  # Written without charts
+            self.assertEqual(sorted(reports['failed_tasks']), ['charts', 'excel'])
+
+
+if __name__ == '__main__':
+    unittest.main()
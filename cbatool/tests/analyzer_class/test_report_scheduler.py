@@ -0,0 +1,65 @@
+"""
+Test module for the ReportScheduler class.
+
+This module contains tests for running report tasks in dependency order.
+"""
+
+import time
+import threading
+import unittest
+
+from cbatool.utils.report_scheduler import ReportScheduler
+
+
+class TestReportScheduler(unittest.TestCase):
+    """Test cases for the ReportScheduler class."""
+
+    def test_dependency_order(self):
+        """Test that independent tasks overlap and dependent tasks get their inputs."""
+        events = []
+        lock = threading.Lock()
+
+        def task(name, delay, value=None, **inputs):
+            with lock:
+                events.append(('start', name))
+            time.sleep(delay)
+            with lock:
+                events.append(('end', name))
+            return (name, value, inputs)
+
+        scheduler = ReportScheduler()
+        scheduler.add_task('charts', task, 'charts', 0.2)
+        scheduler.add_task('excel', task, 'excel', 0.2)
+        scheduler.add_task('pdf', task, 'pdf', 0.0, value=1, inputs={'charts': 'charts'})
+
+        results = scheduler.run()
+
+        # Both independent tasks start before either ends, so they overlap
+        self.assertEqual(set(events[:2]), {('start', 'charts'), ('start', 'excel')})
+        self.assertLess(events.index(('end', 'charts')), events.index(('start', 'pdf')))
+        self.assertEqual(results['pdf'], ('pdf', 1, {'charts': ('charts', None, {})}))
+
+    def test_failures_and_external_dependencies(self):
+        """Test that a failed task yields None and tasks can wait on another scheduler."""
+        def fail():
+            raise RuntimeError("disk full")
+
+        outer = ReportScheduler()
+        visualization = outer.add_task('visualization', lambda: time.sleep(0.1) or True)
+        inner = ReportScheduler()
+        inner.add_task('excel', fail)
+        inner.add_task('pdf', lambda excel: visualization.done() and excel is None,
+                       depends_on=[visualization], inputs={'excel': 'excel'})
+        outer.add_task('reports', inner.run)
+
+        results = outer.run()
+        self.assertEqual(results['reports'], {'excel': None, 'pdf': True})
+        self.assertEqual(inner.failed, ['excel'])
+        self.assertEqual(outer.failed, [])
+
+        with self.assertRaises(ValueError):
+            inner.add_task('pdf', fail, depends_on=['charts'])
+
+
+if __name__ == '__main__':
+    unittest.main()
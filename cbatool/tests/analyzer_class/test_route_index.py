@@ -0,0 +1,81 @@
+"""
+Test module for the design route spatial index.
+
+This module contains tests for the RouteIndex class and its use by the
+PositionAnalyzer to compute DCC from raw positions.
+"""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from cbatool.core.route_index import RouteIndex
+from cbatool.core.position_analyzer import PositionAnalyzer
+
+
+def brute_force_distance(route_x, route_y, px, py):
+    """Distance from each point to the nearest route segment by checking every segment."""
+    x0, y0 = route_x[:-1], route_y[:-1]
+    dx, dy = np.diff(route_x), np.diff(route_y)
+    t = np.clip(((px[:, None] - x0) * dx + (py[:, None] - y0) * dy) / (dx ** 2 + dy ** 2), 0, 1)
+    return np.hypot(px[:, None] - x0 - t * dx, py[:, None] - y0 - t * dy).min(axis=1)
+
+
+class TestRouteIndex(unittest.TestCase):
+    """Test cases for the RouteIndex class."""
+
+    def setUp(self):
+        """Set up a winding test route and scattered survey points."""
+        rng = np.random.default_rng(42)
+        heading = np.cumsum(rng.normal(0, 0.1, 2000))
+        step = rng.uniform(1.0, 5.0, 2000)
+        self.route_x = 400000 + np.cumsum(step * np.cos(heading))
+        self.route_y = 5600000 + np.cumsum(step * np.sin(heading))
+
+        self.px = rng.uniform(self.route_x.min() - 50, self.route_x.max() + 50, 500)
+        self.py = rng.uniform(self.route_y.min() - 50, self.route_y.max() + 50, 500)
+
+    def test_matches_brute_force(self):
+        """Test that the indexed search finds the same distance as a full search."""
+        index = RouteIndex(self.route_x, self.route_y)
+        kp, dcc = index.project(self.px, self.py, chunk_size=100)
+
+        expected = brute_force_distance(self.route_x, self.route_y, self.px, self.py)
+        np.testing.assert_allclose(np.abs(dcc), expected, atol=1e-6)
+        self.assertTrue(np.all((kp >= 0) & (kp <= index.kp[-1])))
+
+    def test_dcc_sign_and_kp(self):
+        """Test DCC sign convention and KP interpolation on a straight route."""
+        index = RouteIndex([0.0, 1000.0, 2000.0], [0.0, 0.0, 0.0], kp=[10.0, 11.0, 12.0])
+        kp, dcc = index.project([500.0, 1500.0, np.nan], [-20.0, 30.0, 0.0])
+
+        np.testing.assert_allclose(kp[:2], [10.5, 11.5])
+        np.testing.assert_allclose(dcc[:2], [20.0, -30.0])
+        self.assertTrue(np.isnan(kp[2]) and np.isnan(dcc[2]))
+
+    def test_position_analyzer_uses_route(self):
+        """Test that position analysis derives DCC from the design route."""
+        data = pd.DataFrame({
+            'KP': np.linspace(0, 1.9, 20),
+            'Easting': np.linspace(0, 1900, 20),
+            'Northing': np.full(20, -3.0)
+        })
+        route = pd.DataFrame({'E': [0.0, 2000.0], 'N': [0.0, 0.0]})
+
+        analyzer = PositionAnalyzer(data)
+        analyzer.set_columns(kp_column='KP', easting_column='Easting', northing_column='Northing')
+        self.assertTrue(analyzer.set_design_route(route, easting_column='E', northing_column='N'))
+        self.assertTrue(analyzer.analyze_data())
+
+        self.assertEqual(analyzer.dcc_column, 'Route_DCC')
+        np.testing.assert_allclose(analyzer.data['Route_DCC'], 3.0)
+        self.assertIn('Cross_Track_Score', analyzer.data.columns)
+
+        # New data without the derived column is projected onto the route again
+        analyzer.set_data(data.assign(Northing=5.0))
+        self.assertTrue(analyzer.analyze_data())
+        np.testing.assert_allclose(analyzer.data['Route_DCC'], -5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Test module for the tile pyramid and local tile server.
+
+This module contains tests for the multi-resolution profile viewer.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+import numpy as np
+
+from cbatool.core.tile_server import build_tile_pyramid, write_tile_viewer, TileServer
+
+
+class TestTileServer(unittest.TestCase):
+    """Test cases for the tile pyramid and server."""
+
+    def test_pyramid_and_server(self):
+        """Test pyramid levels, tile contents and serving tiles over HTTP."""
+        x = np.arange(10000) * 0.001
+        y = np.full(10000, 1.5)
+        y[7777] = 3.0  # Deepest point must survive every level
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest = build_tile_pyramid(x, y, output_dir, tile_points=1000,
+                                          metadata={'target_depth': 1.5})
+            write_tile_viewer(output_dir)
+
+            levels = manifest['levels']
+            self.assertEqual([level['bucket'] for level in levels], [16, 4, 1])
+            self.assertEqual(levels[-1]['points'], 10000)
+            self.assertEqual(len(levels[-1]['tiles']), 10)
+            self.assertEqual(manifest['target_depth'], 1.5)
+
+            server = TileServer(output_dir)
+            try:
+                base_url = server.start().rsplit('/', 1)[0]
+                with urllib.request.urlopen(f"{base_url}/manifest.json") as response:
+                    self.assertEqual(json.load(response)['levels'], levels)
+
+                coarsest = levels[0]
+                for index, tile in enumerate(coarsest['tiles']):
+                    with urllib.request.urlopen(f"{base_url}/tiles/L{coarsest['level']}_{index}.bin") as response:
+                        data = response.read()
+                    count = tile['count']
+                    tile_x = np.frombuffer(data[:8 * count], '<f8')
+                    tile_y = np.frombuffer(data[8 * count:], '<f4')
+                    if tile['x0'] <= x[7777] <= tile['x1']:
+                        self.assertIn(3.0, tile_y)
+                        self.assertIn(x[7777], tile_x)
+
+                with urllib.request.urlopen(server.url) as response:
+                    self.assertIn(b'plotly_relayout', response.read())
+            finally:
+                server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+Test module for the Visualizer class.
+
+This module contains tests for the depth and position visualizations.
+"""
+
+import os
+import base64
+import tempfile
+import unittest
+import unittest.mock
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from cbatool.core.visualizer import Visualizer, encode_typed_array
+
+
+class TestVisualizer(unittest.TestCase):
+    """Test cases for the Visualizer class."""
+
+    def setUp(self):
+        """Set up a depth and position dataset."""
+        rng = np.random.default_rng(8)
+        n = 2000
+        self.data = pd.DataFrame({
+            'KP': np.arange(n) * 0.001,
+            'Depth': rng.normal(1.6, 0.2, n),
+            'DCC': rng.normal(0, 3, n),
+            'Position_Quality_Score': rng.uniform(0, 1, n),
+            'Is_KP_Jump': np.zeros(n, dtype=bool),
+            'Is_KP_Reversal': np.zeros(n, dtype=bool)
+        })
+        self.visualizer = Visualizer()
+        self.visualizer.set_data(self.data)
+        self.visualizer.set_columns(depth_column='Depth', kp_column='KP')
+
+    def test_render_mode(self):
+        """Test that large traces switch to WebGL while small traces stay SVG."""
+        fig = self.visualizer.create_visualization()
+        self.assertEqual([trace.type for trace in fig.data], ['scatter', 'scatter'])
+
+        self.visualizer.set_render_mode('auto', webgl_threshold=1000)
+        fig = self.visualizer.create_visualization()
+        self.assertEqual([trace.type for trace in fig.data], ['scattergl', 'scatter'])
+        self.assertIn('Depth: %{y:.2f}m', fig.data[0].hovertemplate)
+
+        fig = self.visualizer.create_position_visualization(self.data, 'KP', 'DCC')
+        self.assertEqual(fig.data[0].type, 'scattergl')
+
+        self.assertFalse(self.visualizer.set_render_mode('canvas'))
+
+    def test_paginated_output(self):
+        """Test that a segmented visualization is saved as pages plus an index page."""
+        self.data['Is_Anomaly'] = self.data.index == 1500
+        sections = pd.DataFrame({'Position_Type': ['KP'], 'Start_KP': [0.2], 'End_KP': [0.3],
+                                 'Severity': ['High']})
+        self.visualizer.set_data(self.data, sections)
+
+        self.visualizer.create_visualization(segmented=True, page_points=600)
+        self.assertIsNotNone(self.visualizer.pagination)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            index_file = os.path.join(output_dir, 'depth.html')
+            self.assertTrue(self.visualizer.save_visualization(index_file))
+
+            pages = sorted(os.listdir(os.path.join(output_dir, 'depth_pages')))
+            self.assertEqual(pages, ['page_0001.html', 'page_0002.html', 'page_0003.html', 'page_0004.html'])
+            with open(index_file, encoding='utf-8') as f:
+                index_html = f.read()
+            self.assertIn('href="depth_pages/page_0004.html"', index_html)
+            self.assertIn('<td>1.800 - 1.999</td>', index_html)
+            for page, has_section in (('page_0001.html', True), ('page_0002.html', False)):
+                with open(os.path.join(output_dir, 'depth_pages', page), encoding='utf-8') as f:
+                    self.assertEqual('High Severity Area' in f.read(), has_section)
+
+            # Another figure saved afterwards is written as a single file
+            self.visualizer.figure = self.visualizer.create_position_visualization(self.data, 'KP', 'DCC')
+            self.assertTrue(self.visualizer.save_visualization(os.path.join(output_dir, 'position.html')))
+            self.assertFalse(os.path.exists(os.path.join(output_dir, 'position_pages')))
+
+    def test_local_plotlyjs(self):
+        """Test that 'local' mode writes one shared plotly.js asset referenced relatively."""
+        self.assertTrue(self.visualizer.set_plotlyjs_mode('local'))
+        self.visualizer.create_visualization(segmented=True, page_points=600)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            self.assertTrue(self.visualizer.save_visualization(os.path.join(output_dir, 'depth.html')))
+            self.visualizer.figure = self.visualizer.create_position_visualization(self.data, 'KP', 'DCC')
+            self.assertTrue(self.visualizer.save_visualization(os.path.join(output_dir, 'position.html')))
+
+            self.assertTrue(os.path.exists(os.path.join(output_dir, 'plotly.min.js')))
+            self.assertNotIn('plotly.min.js', os.listdir(os.path.join(output_dir, 'depth_pages')))
+            for name, src in (('depth.html', 'plotly.min.js'), ('position.html', 'plotly.min.js'),
+                              (os.path.join('depth_pages', 'page_0001.html'), '../plotly.min.js')):
+                with open(os.path.join(output_dir, name), encoding='utf-8') as f:
+                    page_html = f.read()
+                self.assertIn(f'src="{src}"', page_html)
+                self.assertNotIn('cdn.plot.ly', page_html)
+
+        self.assertFalse(self.visualizer.set_plotlyjs_mode('bundle'))
+
+    def test_compact_typed_arrays(self):
+        """Test that float data is written as float32 typed arrays only where precise enough."""
+        depth = encode_typed_array(self.data['Depth'].to_numpy())
+        self.assertEqual(depth['dtype'], 'f4')
+        np.testing.assert_allclose(np.frombuffer(base64.b64decode(depth['bdata']), '<f4'),
+                                   self.data['Depth'], rtol=1e-6)
+        # 1 m steps at 5000 km would lose over 5% of the spacing in float32
+        self.assertEqual(encode_typed_array(5000 + np.arange(1000) * 0.001)['dtype'], 'f8')
+
+        self.visualizer.create_visualization()
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'depth.html')
+            self.assertTrue(self.visualizer.save_visualization(output_file))
+            with open(output_file, encoding='utf-8') as f:
+                self.assertIn('"dtype":"f4"', f.read())
+
+    def test_stream_visualization(self):
+        """Test that the streamed HTML holds the same profile data as the figure."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'depth.html')
+            self.assertTrue(self.visualizer.stream_visualization(output_file, max_points=500))
+            with open(output_file, encoding='utf-8') as f:
+                page_html = f.read()
+
+        fig = self.visualizer.create_visualization(max_points=500)
+        profile = next(trace for trace in fig.data if trace.name == 'Burial Depth')
+        for key, values in (('x', profile.x), ('y', profile.y)):
+            encoded = encode_typed_array(values)
+            self.assertIn(f'"{key}":{{"dtype":"{encoded["dtype"]}","bdata":"{encoded["bdata"]}"}}', page_html)
+        self.assertIn('Target Depth (1.5m)', page_html)
+
+    def test_save_streams_large_profile(self):
+        """Test that a large depth figure is streamed on request, with its anomaly and section traces."""
+        self.data['Is_Anomaly'] = self.data.index % 300 == 0
+        sections = pd.DataFrame({'Position_Type': ['KP'], 'Start_KP': [0.2], 'End_KP': [0.3],
+                                 'Severity': ['High'], 'Length_Meters': [100.0]})
+        self.visualizer.set_data(self.data, sections)
+        self.visualizer.stream_threshold = 1000
+        self.visualizer.create_visualization()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'depth.html')
+            with unittest.mock.patch.object(self.visualizer, 'stream_visualization',
+                                            wraps=self.visualizer.stream_visualization) as stream:
+                self.assertTrue(self.visualizer.save_visualization(output_file, stream=True))
+                stream.assert_called_once_with(output_file, True, None, 'lttb')
+            with open(output_file, encoding='utf-8') as f:
+                page_html = f.read()
+        self.assertIn('High Severity Area', page_html)
+        self.assertIn('"name":"Anomaly"', page_html)
+
+        # Without the request the figure is saved as it is, with any edits
+        fig = self.visualizer.create_visualization()
+        fig.update_layout(title_text='Custom Title XYZ')
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, 'depth.html')
+            with unittest.mock.patch.object(self.visualizer, 'stream_visualization') as stream:
+                self.assertTrue(self.visualizer.save_visualization(output_file))
+                stream.assert_not_called()
+            with open(output_file, encoding='utf-8') as f:
+                self.assertIn('Custom Title XYZ', f.read())
+
+        # Small figures are never streamed
+        self.visualizer.set_data(self.data.iloc[:500])
+        self.visualizer.create_visualization()
+        with tempfile.TemporaryDirectory() as output_dir:
+            with unittest.mock.patch.object(self.visualizer, 'stream_visualization') as stream:
+                self.assertTrue(self.visualizer.save_visualization(os.path.join(output_dir, 'depth.html'),
+                                                                   stream=True))
+                stream.assert_not_called()
+
+    def test_fast_figures(self):
+        """Test that fast figure dictionaries match the validated go.Figure output."""
+        self.data['Is_Anomaly'] = self.data.index % 300 == 0
+        sections = pd.DataFrame({'Position_Type': ['KP'], 'Start_KP': [0.2], 'End_KP': [0.3],
+                                 'Severity': ['High'], 'Length_Meters': [100.0]})
+        self.visualizer.set_data(self.data, sections)
+
+        figures = {}
+        for fast in (False, True):
+            self.visualizer.set_fast_figures(fast)
+            figures[fast] = [self.visualizer.create_visualization(),
+                             self.visualizer.create_position_visualization(self.data, 'KP', 'DCC')]
+
+        for validated, fast in zip(figures[False], figures[True]):
+            self.assertIsInstance(fast, dict)
+            self.assertEqual(go.Figure(fast).to_json(), validated.to_json())
+
+    def test_section_highlighting(self):
+        """Test that problem sections are drawn as one filled trace per severity."""
+        starts = np.arange(300) * 0.006
+        sections = pd.DataFrame({'Position_Type': 'KP', 'Start_KP': starts, 'End_KP': starts + 0.003,
+                                 'Severity': np.array(['High', 'Medium', 'Low'])[np.arange(300) % 3]})
+        self.visualizer.set_data(self.data, sections)
+
+        fig = self.visualizer.create_visualization()
+
+        areas = [trace for trace in fig.data if trace.name.endswith('Severity Area')]
+        self.assertEqual([trace.name for trace in areas],
+                         ['High Severity Area', 'Medium Severity Area', 'Low Severity Area'])
+        self.assertEqual(len(fig.layout.shapes), 0)
+        self.assertEqual(len(areas[0].x), 100 * 6)
+        np.testing.assert_allclose(areas[0].x[:5], [0, 0, 0.003, 0.003, 0])
+
+    def test_anomaly_hover_customdata(self):
+        """Test that anomaly hover text comes from customdata and a hover template."""
+        self.data['Is_Anomaly'] = False
+        self.data.loc[[10, 20, 30], 'Is_Anomaly'] = True
+        self.data['Anomaly_Type'] = None
+        self.data.loc[[10, 30], 'Anomaly_Type'] = ['Sudden depth change (0.6m)', 'Statistical outlier']
+        self.data.loc[20, 'Anomaly_Type'] = 'Sudden depth change (0.8m)'
+        self.visualizer.set_data(self.data)
+
+        fig = self.visualizer.create_visualization()
+
+        markers = {trace.name: trace for trace in fig.data if trace.mode == 'markers'}
+        self.assertEqual(sorted(markers), ['Statistical outlier', 'Sudden depth change'])
+        sudden = markers['Sudden depth change']
+        self.assertEqual(list(sudden.customdata), ['Sudden depth change (0.6m)', 'Sudden depth change (0.8m)'])
+        self.assertIn('%{customdata}', sudden.hovertemplate)
+        self.assertIsNone(sudden.hovertext)
+
+    def test_position_dashboard_decimated(self):
+        """Test that dashboard traces respect the point budget and keep KP anomalies."""
+        self.data.loc[[100, 1500], 'Is_KP_Jump'] = True
+        self.data['Segment_ID'] = np.nan
+        self.data.loc[200:210, 'Segment_ID'] = 1
+        self.data.loc[900:950, 'Segment_ID'] = 2
+
+        fig = self.visualizer.create_position_visualization(self.data, 'KP', 'DCC', max_points=500)
+        traces = {trace.name: trace for trace in fig.data}
+
+        progression = traces['KP Progression']
+        self.assertLessEqual(len(progression.x), 502)
+        self.assertTrue({100, 1500} <= set(progression.x))
+        self.assertEqual(list(traces['KP Jumps'].x), [100, 1500])
+        self.assertLessEqual(len(traces['Cross-Track Deviation'].x), 502)
+        np.testing.assert_allclose(traces['Problem Segments (2)'].x, [0.2, 0.21, np.nan, 0.9, 0.95, np.nan])
+
+        fig = self.visualizer.create_position_visualization(self.data, 'KP', 'DCC', max_points=None)
+        self.assertEqual(len({trace.name: trace for trace in fig.data}['KP Progression'].x), len(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -262,6 +262,8 @@ class TestDepthAnalysisWorker(unittest.TestCase):
         """Test the save_outputs method."""
         # Mock the visualizer and report generator methods
         self.worker.visualizer.save_visualization = MagicMock()
+        self.worker.visualizer.create_tile_viewer = MagicMock(return_value='viewer.html')
+        self.worker.visualizer.serve_tile_viewer = MagicMock()
         self.worker.report_generator.create_comprehensive_report = MagicMock(
             return_value={'excel_report': 'test.xlsx', 'pdf_report': 'test.pdf'}
         )
@@ -275,12 +277,32 @@ class TestDepthAnalysisWorker(unittest.TestCase):
         
         # Check that the methods were called correctly
         mock_makedirs.assert_called_once_with(self.test_params['output_dir'], exist_ok=True)
-        self.worker.visualizer.save_visualization.assert_called_once()
+        self.worker.visualizer.save_visualization.assert_called_once_with(
+            os.path.join(self.test_params['output_dir'], 'depth_burial_analysis.html'), figure=None, stream=True
+        )
         self.worker.report_generator.create_comprehensive_report.assert_called_once()
         
         # Check that the report paths were stored
         self.assertEqual(self.worker.results['reports'], 
                          {'excel_report': 'test.xlsx', 'pdf_report': 'test.pdf'})
+        self.worker.visualizer.create_tile_viewer.assert_not_called()
+        
+        # The tile viewer is created (and served) when requested
+        self.worker.params['tile_viewer_mode'] = 'serve'
+        self.worker.save_outputs()
+        self.worker.visualizer.create_tile_viewer.assert_called_once()
+        self.worker.visualizer.serve_tile_viewer.assert_called_once()
+        self.assertEqual(self.worker.results['tile_viewer'], 'viewer.html')
+        self.assertEqual(self.worker.results['failed_tasks'], [])
+        
+        # Failed output tasks are reported instead of being skipped silently
+        self.worker.params['tile_viewer_mode'] = 'off'
+        self.worker.visualizer.save_visualization.return_value = False
+        self.worker.report_generator.create_comprehensive_report.return_value = {
+            'excel_report': 'test.xlsx', 'pdf_report': '', 'failed_tasks': ['pdf']
+        }
+        self.worker.save_outputs()
+        self.assertEqual(self.worker.results['failed_tasks'], ['visualization', 'reports.pdf'])
 
 
 class TestPositionAnalysisWorker(unittest.TestCase):
@@ -9,11 +9,13 @@ import os
 import logging
 from typing import Dict, Any, Optional
 
+from ..core.analysis_frame import SharedAnalysisFrame
 from ..core.depth_analyzer import DepthAnalyzer
 from ..core.position_analyzer import PositionAnalyzer
 from ..core.visualizer import Visualizer
 from ..utils.worker_utils import BaseAnalysisWorker
 from ..utils.report_generator import ReportGenerator
+from ..utils.report_scheduler import ReportScheduler
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -42,6 +44,7 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         # Initialize core analysis components
         self.depth_analyzer = DepthAnalyzer()
         self.position_analyzer = PositionAnalyzer()
+        self.analysis_frame = None
         self.visualizer = Visualizer()
         self.report_generator = ReportGenerator(self.output_dir)
     
@@ -91,9 +94,14 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         """
         print("Setting up analyzers for complete analysis...")
         
+        # Both analyzers add their columns to one copy of the loaded data in place.
+        # The data loader keeps the loaded frame for column detection and re-runs,
+        # so it must not receive the derived columns.
+        self.analysis_frame = SharedAnalysisFrame(self.data.copy())
+        
         # Set up depth analyzer
         print("Setting up depth analyzer...")
-        self.depth_analyzer.set_data(self.data)
+        self.depth_analyzer.set_shared_frame(self.analysis_frame, namespace='depth')
         self.depth_analyzer.set_columns(
             depth_column=self.params['depth_column'],
             kp_column=self.params.get('kp_column'),
@@ -105,7 +113,7 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         
         # Set up position analyzer
         print("Setting up position analyzer...")
-        self.position_analyzer.set_data(self.data)
+        self.position_analyzer.set_shared_frame(self.analysis_frame, namespace='position')
         self.position_analyzer.set_columns(
             kp_column=self.params['kp_column'],
             dcc_column=self.params.get('dcc_column'),
@@ -114,6 +122,18 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
             easting_column=self.params.get('easting_column'),
             northing_column=self.params.get('northing_column')
         )
+        
+        # Compute DCC from a design route when the data has no DCC column
+        route_file = self.params.get('route_file')
+        if route_file:
+            route_set = self.position_analyzer.set_design_route(
+                route_file,
+                easting_column=self.params.get('route_easting_column'),
+                northing_column=self.params.get('route_northing_column'),
+                kp_column=self.params.get('route_kp_column')
+            )
+            if not route_set:
+                raise ValueError(f"Failed to load design route from {route_file}")
         print("Position analyzer configured successfully")
     
     def run_analysis(self):
@@ -142,7 +162,8 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         
         position_success = self.position_analyzer.analyze_position_data(
             kp_jump_threshold=kp_jump_threshold,
-            kp_reversal_threshold=kp_reversal_threshold
+            kp_reversal_threshold=kp_reversal_threshold,
+            n_jobs=self.params.get('n_jobs', 1)
         )
         
         if not position_success:
@@ -157,16 +178,20 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
                 print(f"Identified {len(problem_sections)} position problem sections")
                 self.results['position_problem_sections'] = problem_sections
         
-        # Store results for further processing
-        self.results['depth_analysis_data'] = self.depth_analyzer.data
+        # Store results for further processing (per-analysis data are views of the shared frame)
+        self.results['analysis_data'] = self.analysis_frame.data
+        self.results['depth_analysis_data'] = self.analysis_frame.view('depth')
         self.results['depth_analysis_summary'] = self.depth_analyzer.get_analysis_summary()
-        self.results['position_analysis_data'] = self.position_analyzer.data
+        self.results['position_analysis_data'] = self.analysis_frame.view('position')
         self.results['position_analysis_summary'] = self.position_analyzer.get_analysis_summary()
     
     def create_visualization(self):
         """
         Create visualizations for both depth and position analysis results.
         """
+        # Figures are only saved, so skip per-call Plotly validation
+        self.visualizer.set_fast_figures(self.params.get('fast_figures', True))
+        
         # 1. Create depth analysis visualization
         print("Creating depth analysis visualization...")
         self.visualizer.set_data(
@@ -184,11 +209,15 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
             self.params.get('target_depth', 1.5)
         )
         
-        # Create depth visualization with segmentation for large datasets
-        segmented = len(self.data) > 5000
+        # Create depth visualization with segmentation for large datasets, unless a single
+        # page is requested (large single-page profiles are streamed to file on save)
+        max_points = self.params.get('max_plot_points')
+        segmented = self.params.get('paginate_plots', True) and len(self.data) > 5000 and not max_points
         depth_fig = self.visualizer.create_visualization(
             include_anomalies=True,
-            segmented=segmented
+            segmented=segmented,
+            max_points=max_points,
+            decimation=self.params.get('decimation', 'lttb')
         )
         
         if depth_fig is None:
@@ -203,7 +232,7 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
             position_fig = self.visualizer.create_position_visualization(
                 data=self.position_analyzer.data,
                 kp_column=self.params['kp_column'],
-                dcc_column=self.params.get('dcc_column')
+                dcc_column=self.params.get('dcc_column') or self.position_analyzer.dcc_column
             )
             
             if position_fig is not None:
@@ -219,48 +248,32 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # 1. Save depth visualization
+        # plotly.js source for the HTML files ('local' writes one shared copy for offline use)
+        self.visualizer.set_plotlyjs_mode(self.params.get('plotlyjs_mode', 'cdn'))
+        
+        # Separate .xlsx per report type alongside the consolidated workbook (off by default)
+        self.report_generator.set_individual_reports(self.params.get('write_individual_reports', False))
+        
+        # 1-2. Save the depth and position visualizations concurrently
+        scheduler = ReportScheduler()
         depth_viz_file = os.path.join(self.output_dir, "cable_burial_analysis.html")
-        self.visualizer.figure = self.results.get('depth_visualization')
-        if self.visualizer.figure:
-            self.visualizer.save_visualization(depth_viz_file)
-            print(f"Depth visualization saved to: {depth_viz_file}")
+        depth_fig = self.results.get('depth_visualization')
+        self.visualizer.figure = depth_fig
+        depth_visualization = None
+        if depth_fig:
+            # The figure is saved as created, so a large profile can be streamed to file
+            depth_visualization = scheduler.add_task('depth_visualization', self._save_visualization,
+                                                     depth_viz_file, figure=depth_fig, stream=True)
         
-        # 2. Save position visualization if available
         position_viz_file = os.path.join(self.output_dir, "position_quality_analysis.html")
         position_fig = self.results.get('position_visualization')
         if position_fig:
-            self.visualizer.figure = position_fig
-            self.visualizer.save_visualization(position_viz_file)
-            print(f"Position visualization saved to: {position_viz_file}")
+            scheduler.add_task('position_visualization', self._save_visualization,
+                               position_viz_file, figure=position_fig)
         
-        # 3. Save Excel reports for depth analysis
-        depth_problem_sections = self.depth_analyzer.analysis_results.get('problem_sections')
-        if depth_problem_sections is not None and not depth_problem_sections.empty:
-            sections_file = os.path.join(self.output_dir, "problem_sections_report.xlsx")
-            depth_problem_sections.to_excel(sections_file, index=False)
-            print(f"Depth problem sections report saved to: {sections_file}")
-        
-        depth_anomalies = self.depth_analyzer.analysis_results.get('anomalies')
-        if depth_anomalies is not None and not depth_anomalies.empty:
-            anomaly_file = os.path.join(self.output_dir, "anomaly_report.xlsx")
-            depth_anomalies.to_excel(anomaly_file, index=False)
-            print(f"Depth anomalies report saved to: {anomaly_file}")
-        
-        # 4. Save Excel reports for position analysis
-        if 'position_problem_sections' in self.results:
-            position_problem_sections = self.results['position_problem_sections']
-            if not position_problem_sections.empty:
-                pos_sections_file = os.path.join(self.output_dir, "position_problem_sections_report.xlsx")
-                position_problem_sections.to_excel(pos_sections_file, index=False)
-                print(f"Position problem sections report saved to: {pos_sections_file}")
-        
-        # 5. Extract and save position anomalies if they exist
-        position_anomalies = self._extract_position_anomalies()
-        if position_anomalies is not None and not position_anomalies.empty:
-            pos_anomalies_file = os.path.join(self.output_dir, "position_anomalies_report.xlsx")
-            position_anomalies.to_excel(pos_anomalies_file, index=False)
-            print(f"Position anomalies report saved to: {pos_anomalies_file}")
+        # 3-5. Save individual Excel reports (the consolidated workbook holds the same sheets)
+        if self.params.get('write_individual_reports', False):
+            scheduler.add_task('individual_reports', self._write_individual_reports)
         
         # 6. Generate comprehensive report
         print("\nGenerating comprehensive report...")
@@ -273,10 +286,41 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
             for key, value in self.position_analyzer.analysis_results.items():
                 combined_results[f'position_{key}'] = value
         
-        reports = self.report_generator.create_comprehensive_report(
+        # Report each analysis with its own columns of the shared frame
+        if 'depth_analysis' in combined_results:
+            combined_results['depth_analysis'] = self.analysis_frame.view('depth')
+        if 'position_position_analysis' in combined_results:
+            combined_results['position_position_analysis'] = self.analysis_frame.view('position')
+        
+        # Depth profile and problem sections for the static charts in the PDF
+        chart_data = None
+        if 'depth_analysis' in combined_results:
+            chart_data = {
+                'data': combined_results['depth_analysis'],
+                'kp_column': self.params['kp_column'],
+                'depth_column': self.params['depth_column'],
+                'target_depth': self.params.get('target_depth', 1.5),
+                'problem_sections': combined_results.get('problem_sections')
+            }
+        
+        # The comprehensive report runs alongside the outputs above; only its PDF
+        # waits for the depth visualization
+        scheduler.add_task(
+            'reports',
+            self.report_generator.create_comprehensive_report,
             combined_results,
-            depth_viz_file
+            depth_viz_file,
+            chart_data=chart_data,
+            visualization_ready=depth_visualization
         )
+        outputs = scheduler.run()
+        reports = outputs['reports'] or {}
+        self._check_report_tasks(scheduler, reports)
+        
+        if outputs.get('depth_visualization'):
+            print(f"Depth visualization saved to: {depth_viz_file}")
+        if outputs.get('position_visualization'):
+            print(f"Position visualization saved to: {position_viz_file}")
         
         # Log report locations
         if reports.get('excel_report'):
@@ -289,6 +333,37 @@ class CompleteAnalysisWorker(BaseAnalysisWorker):
         
         print("Complete analysis outputs saved successfully")
     
+    def _write_individual_reports(self):
+        """
+        Save the problem sections and anomalies to their own Excel files.
+        """
+        depth_problem_sections = self.depth_analyzer.analysis_results.get('problem_sections')
+        if depth_problem_sections is not None and not depth_problem_sections.empty:
+            sections_file = os.path.join(self.output_dir, "problem_sections_report.xlsx")
+            depth_problem_sections.to_excel(sections_file, index=False)
+            print(f"Depth problem sections report saved to: {sections_file}")
+        
+        depth_anomalies = self.depth_analyzer.analysis_results.get('anomalies')
+        if depth_anomalies is not None and not depth_anomalies.empty:
+            anomaly_file = os.path.join(self.output_dir, "anomaly_report.xlsx")
+            depth_anomalies.to_excel(anomaly_file, index=False)
+            print(f"Depth anomalies report saved to: {anomaly_file}")
+        
+        # Position analysis reports
+        if 'position_problem_sections' in self.results:
+            position_problem_sections = self.results['position_problem_sections']
+            if not position_problem_sections.empty:
+                pos_sections_file = os.path.join(self.output_dir, "position_problem_sections_report.xlsx")
+                position_problem_sections.to_excel(pos_sections_file, index=False)
+                print(f"Position problem sections report saved to: {pos_sections_file}")
+        
+        # Extract and save position anomalies if they exist
+        position_anomalies = self._extract_position_anomalies()
+        if position_anomalies is not None and not position_anomalies.empty:
+            pos_anomalies_file = os.path.join(self.output_dir, "position_anomalies_report.xlsx")
+            position_anomalies.to_excel(pos_anomalies_file, index=False)
+            print(f"Position anomalies report saved to: {pos_anomalies_file}")
+    
     def _extract_position_anomalies(self):
         """
         Extract anomalous points from position analysis data.
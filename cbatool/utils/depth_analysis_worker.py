@@ -13,6 +13,7 @@ from ..core.depth_analyzer import DepthAnalyzer
 from ..core.visualizer import Visualizer
 from ..utils.worker_utils import BaseAnalysisWorker
 from ..utils.report_generator import ReportGenerator
+from ..utils.report_scheduler import ReportScheduler
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -137,6 +138,9 @@ class DepthAnalysisWorker(BaseAnalysisWorker):
         """
         print("Creating depth analysis visualization...")
         
+        # Figures are only saved, so skip per-call Plotly validation
+        self.visualizer.set_fast_figures(self.params.get('fast_figures', True))
+        
         # Set data for visualization
         self.visualizer.set_data(
             data=self.depth_analyzer.data,
@@ -156,10 +160,15 @@ class DepthAnalysisWorker(BaseAnalysisWorker):
         )
         
         # Create visualization
-        segmented = len(self.data) > 5000  # Use segmented view for large datasets
+        max_points = self.params.get('max_plot_points')
+        # Use segmented view for large datasets, unless a single page is requested
+        # (large single-page profiles are streamed to file on save)
+        segmented = self.params.get('paginate_plots', True) and len(self.data) > 5000 and not max_points
         fig = self.visualizer.create_visualization(
             include_anomalies=True,
-            segmented=segmented
+            segmented=segmented,
+            max_points=max_points,
+            decimation=self.params.get('decimation', 'lttb')
         )
         
         if fig is None:
@@ -179,17 +188,44 @@ class DepthAnalysisWorker(BaseAnalysisWorker):
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Save visualization
-        viz_file = os.path.join(self.output_dir, "depth_burial_analysis.html")
-        self.visualizer.save_visualization(viz_file)
-        print(f"Visualization saved to: {viz_file}")
+        # plotly.js source for the HTML files ('local' writes one shared copy for offline use)
+        self.visualizer.set_plotlyjs_mode(self.params.get('plotlyjs_mode', 'cdn'))
         
-        # Generate comprehensive report
-        reports = self.report_generator.create_comprehensive_report(
+        # Separate .xlsx per report type alongside the consolidated workbook (off by default)
+        self.report_generator.set_individual_reports(self.params.get('write_individual_reports', False))
+        
+        # Save the visualization and generate the comprehensive report (with static
+        # depth charts in the PDF) concurrently; only the PDF waits for the visualization
+        viz_file = os.path.join(self.output_dir, "depth_burial_analysis.html")
+        scheduler = ReportScheduler()
+        # The figure is saved as created, so a large profile can be streamed to file
+        visualization = scheduler.add_task('visualization', self._save_visualization, viz_file, stream=True)
+        scheduler.add_task(
+            'reports',
+            self.report_generator.create_comprehensive_report,
             self.depth_analyzer.analysis_results,
-            viz_file
+            viz_file,
+            chart_data=self._get_chart_data(),
+            visualization_ready=visualization
         )
         
+        # Multi-resolution tile viewer of the full profile ('off', 'create' or 'serve')
+        tile_viewer_mode = self.params.get('tile_viewer_mode', 'off')
+        if tile_viewer_mode in ('create', 'serve'):
+            tile_dir = os.path.join(self.output_dir, "depth_tile_viewer")
+            scheduler.add_task('tile_viewer', self.visualizer.create_tile_viewer, tile_dir)
+        
+        outputs = scheduler.run()
+        reports = outputs['reports'] or {}
+        self._check_report_tasks(scheduler, reports)
+        
+        if outputs['visualization']:
+            print(f"Visualization saved to: {viz_file}")
+        if outputs.get('tile_viewer'):
+            print(f"Tile viewer saved to: {outputs['tile_viewer']}")
+            self.results['tile_viewer'] = outputs['tile_viewer']
+            if tile_viewer_mode == 'serve':
+                self.results['tile_server'] = self.visualizer.serve_tile_viewer(tile_dir)
         # Log report locations
         if reports.get('excel_report'):
             print(f"Excel report saved to: {reports['excel_report']}")
@@ -200,3 +236,22 @@ class DepthAnalysisWorker(BaseAnalysisWorker):
         self.results['reports'] = reports
         
         print("Depth analysis outputs saved successfully")
+    
+    def _get_chart_data(self):
+        """
+        Get the depth profile data for the PDF report charts.
+        
+        Returns:
+            Chart data dictionary, or None if the profile has no KP column
+        """
+        depth_data = self.depth_analyzer.analysis_results.get('depth_analysis')
+        if depth_data is None or not self.params.get('kp_column'):
+            return None
+        
+        return {
+            'data': depth_data,
+            'kp_column': self.params['kp_column'],
+            'depth_column': self.params['depth_column'],
+            'target_depth': self.params.get('target_depth', 1.5),
+            'problem_sections': self.depth_analyzer.analysis_results.get('problem_sections')
+        }
@@ -0,0 +1,175 @@
+"""
+Excel writer module for CBAtool v2.0.
+
+This module contains the streaming Excel writer used for the consolidated
+workbook. Rows are written in chunks with xlsxwriter's constant_memory mode,
+which flushes each row to disk once the next one starts, so memory use does not
+grow with the size of the anomaly sheets. Formatting is expressed per column
+(column formats and conditional formatting rules) rather than per cell.
+"""
+
+import logging
+import pandas as pd
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+    logger.warning("xlsxwriter is not installed. Excel reports will be written with openpyxl.")
+
+# Rows converted and written at a time
+DEFAULT_CHUNK_ROWS = 10000
+
+# Data rows per sheet (Excel's row limit less the header); longer tables continue on further sheets
+EXCEL_MAX_DATA_ROWS = 1048575
+
+# Column widths are estimated from this many evenly spaced rows
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 40
+
+# Severity fill colours (shared with the openpyxl formatting)
+SEVERITY_FILLS = {'High': 'FFCCCC', 'Medium': 'FFEECC', 'Low': 'EEFFCC'}
+HEADER_FILL = 'DDDDDD'
+
+
+def estimate_column_widths(df: pd.DataFrame, sample_rows: int = WIDTH_SAMPLE_ROWS) -> List[int]:
+    """
+    Estimate column widths from the header and a sample of evenly spaced rows.
+
+    Args:
+        df: DataFrame to be written.
+        sample_rows: Number of rows to sample.
+
+    Returns:
+        Width (in characters) of each column, capped at MAX_COLUMN_WIDTH.
+    """
+    sample = df.iloc[::max(1, len(df) // sample_rows)] if len(df) > sample_rows else df
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = sample.iloc[:, position]
+        longest = int(values.astype(str).str.len().max()) if len(values) else 0
+        widths.append(min(max(longest, len(str(column))) + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def _column_values(values: pd.Series) -> list:
+    """Convert a column chunk to Python values, with missing values as None."""
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = values.dt.tz_localize(None)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return [None if pd.isna(value) else value.to_pydatetime() for value in values]
+
+    converted = values.to_numpy(dtype=object, na_value=None)
+    if values.dtype == object:
+        # Mixed columns may hold values xlsxwriter cannot write (lists, dicts, ...)
+        return [value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+                for value in converted]
+    return converted.tolist()
+
+
+class StreamingExcelWriter:
+    """
+    Constant-memory Excel workbook writer.
+
+    Attributes:
+        output_path (str): Path of the workbook.
+        chunk_rows (int): Number of rows converted and written at a time.
+        workbook: xlsxwriter Workbook.
+    """
+
+    def __init__(self, output_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        Initialize the writer.
+
+        Args:
+            output_path: Path of the workbook.
+            chunk_rows: Number of rows converted and written at a time.
+        """
+        if not XLSXWRITER_AVAILABLE:
+            raise ImportError("xlsxwriter is required for the streaming Excel writer")
+
+        self.output_path = output_path
+        self.chunk_rows = chunk_rows
+        self.workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        self._formats = {
+            'header': self.workbook.add_format({'bold': True, 'bg_color': f'#{HEADER_FILL}', 'border': 1}),
+            'bold': self.workbook.add_format({'bold': True}),
+            'wrap': self.workbook.add_format({'text_wrap': True})
+        }
+        for severity, fill in SEVERITY_FILLS.items():
+            self._formats[severity] = self.workbook.add_format({'bg_color': f'#{fill}'})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Close the workbook, writing the file."""
+        self.workbook.close()
+
+    def write_sheet(self, sheet_name: str, df: pd.DataFrame, format_type: str = 'default') -> None:
+        """
+        Write a DataFrame to a new sheet, chunk by chunk.
+
+        Tables longer than the Excel row limit continue on further sheets named
+        "<sheet_name> (2)", "<sheet_name> (3)", ...
+
+        Args:
+            sheet_name: Name of the sheet (at most 31 characters).
+            df: DataFrame to write.
+            format_type: Type of formatting to apply ('default' or 'recommendations').
+        """
+        widths = estimate_column_widths(df)
+        for part, start in enumerate(range(0, max(len(df), 1), EXCEL_MAX_DATA_ROWS), start=1):
+            name = sheet_name if part == 1 else f"{sheet_name[:25]} ({part})"
+            self._write_part(name, df.iloc[start:start + EXCEL_MAX_DATA_ROWS], widths, format_type)
+
+    def _write_part(self, sheet_name: str, df: pd.DataFrame, widths: List[int], format_type: str) -> None:
+        """Write the rows of one sheet, with its column formats and conditional rules."""
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        columns = [str(column) for column in df.columns]
+
+        # Column formats are set before any rows (constant_memory writes rows out as it goes)
+        for position, column in enumerate(columns):
+            column_format = None
+            if format_type == 'recommendations' and column == 'category':
+                column_format = self._formats['bold']
+            elif format_type == 'recommendations' and column == 'action':
+                column_format = self._formats['wrap']
+            worksheet.set_column(position, position, widths[position], column_format)
+
+        worksheet.write_row(0, 0, columns, self._formats['header'])
+
+        row = 1
+        for start in range(0, len(df), self.chunk_rows):
+            chunk = df.iloc[start:start + self.chunk_rows]
+            for values in zip(*[_column_values(chunk.iloc[:, position]) for position in range(len(columns))]):
+                worksheet.write_row(row, 0, values)
+                row += 1
+
+        # Severity colours as conditional rules over the whole column
+        severity_column = 'severity' if format_type == 'recommendations' else 'Severity'
+        if severity_column in columns and len(df):
+            position = columns.index(severity_column)
+            for severity in SEVERITY_FILLS:
+                worksheet.conditional_format(1, position, len(df), position, {
+                    'type': 'cell',
+                    'criteria': '==',
+                    'value': f'"{severity}"',
+                    'format': self._formats[severity]
+                })
+
+        logger.info(f"Wrote {len(df)} rows to sheet '{sheet_name}'")
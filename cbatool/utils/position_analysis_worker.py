@@ -14,6 +14,7 @@ from ..core.position_visualizer import create_position_dashboard
 from ..core.visualizer import Visualizer
 from ..utils.worker_utils import BaseAnalysisWorker
 from ..utils.report_generator import ReportGenerator
+from ..utils.report_scheduler import ReportScheduler
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -109,6 +110,18 @@ class PositionAnalysisWorker(BaseAnalysisWorker):
             northing_column=northing_column
         )
         
+        # Compute DCC from a design route when the data has no DCC column
+        route_file = self.params.get('route_file')
+        if route_file:
+            route_set = self.position_analyzer.set_design_route(
+                route_file,
+                easting_column=self.params.get('route_easting_column'),
+                northing_column=self.params.get('route_northing_column'),
+                kp_column=self.params.get('route_kp_column')
+            )
+            if not route_set:
+                raise ValueError(f"Failed to load design route from {route_file}")
+        
         print("Position analyzer configured successfully")
     
     def run_analysis(self):
@@ -126,7 +139,8 @@ class PositionAnalysisWorker(BaseAnalysisWorker):
         # Use analyze_position_data method
         success = self.position_analyzer.analyze_position_data(
             kp_jump_threshold=kp_jump_threshold,
-            kp_reversal_threshold=kp_reversal_threshold
+            kp_reversal_threshold=kp_reversal_threshold,
+            n_jobs=self.params.get('n_jobs', 1)
         )
         
         if not success:
@@ -148,11 +162,14 @@ class PositionAnalysisWorker(BaseAnalysisWorker):
         """
         print("Creating position analysis visualization...")
         
+        # Figures are only saved, so skip per-call Plotly validation
+        self.visualizer.set_fast_figures(self.params.get('fast_figures', True))
+        
         # Determine KP column for visualization
         kp_column = self.params['kp_column']
         
-        # Determine DCC column if available
-        dcc_column = self.params.get('dcc_column')
+        # Determine DCC column if available (computed from the design route if not provided)
+        dcc_column = self.params.get('dcc_column') or self.position_analyzer.dcc_column
         
         # Create dashboard visualization
         fig = self.visualizer.create_position_visualization(
@@ -178,40 +195,65 @@ class PositionAnalysisWorker(BaseAnalysisWorker):
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Save visualization
-        viz_file = os.path.join(self.output_dir, "position_quality_analysis.html")
-        self.visualizer.save_visualization(viz_file)
-        print(f"Visualization saved to: {viz_file}")
+        # plotly.js source for the HTML files ('local' writes one shared copy for offline use)
+        self.visualizer.set_plotlyjs_mode(self.params.get('plotlyjs_mode', 'cdn'))
+        
+        # Separate .xlsx per report type alongside the consolidated workbook (off by default)
+        self.report_generator.set_individual_reports(self.params.get('write_individual_reports', False))
         
         # Prepare analysis results for report generation
         analysis_results = self.position_analyzer.analysis_results.copy()
         if 'problem_sections' in self.results:
             analysis_results['problem_sections'] = self.results['problem_sections']
         
-        # Generate comprehensive report
-        reports = self.report_generator.create_comprehensive_report(
+        # Save the visualization, generate the comprehensive report and export the
+        # position anomalies concurrently; only the PDF waits for the visualization
+        viz_file = os.path.join(self.output_dir, "position_quality_analysis.html")
+        scheduler = ReportScheduler()
+        visualization = scheduler.add_task('visualization', self._save_visualization, viz_file)
+        scheduler.add_task(
+            'reports',
+            self.report_generator.create_comprehensive_report,
             analysis_results,
-            viz_file
+            viz_file,
+            visualization_ready=visualization
         )
+        scheduler.add_task('anomalies', self._export_position_anomalies)
+        outputs = scheduler.run()
+        reports = outputs['reports'] or {}
+        self._check_report_tasks(scheduler, reports)
+        
+        if outputs['visualization']:
+            print(f"Visualization saved to: {viz_file}")
         
         # Log report locations
         if reports.get('excel_report'):
             print(f"Excel report saved to: {reports['excel_report']}")
         if reports.get('pdf_report'):
             print(f"PDF report saved to: {reports['pdf_report']}")
-        
-        # Export position anomalies if they exist
-        position_anomalies = self._extract_position_anomalies()
-        if position_anomalies is not None and not position_anomalies.empty:
-            anomalies_file = os.path.join(self.output_dir, "position_anomalies_report.xlsx")
-            position_anomalies.to_excel(anomalies_file, index=False)
-            print(f"Position anomalies report saved to: {anomalies_file}")
+        if outputs['anomalies']:
+            print(f"Position anomalies report saved to: {outputs['anomalies']}")
         
         # Store report paths in results
         self.results['reports'] = reports
         
         print("Position analysis outputs saved successfully")
     
+    def _export_position_anomalies(self):
+        """
+        Export the anomalous points of the position analysis to Excel, if any.
+        
+        Returns:
+            Path to the anomalies report, or None if there are no anomalies
+        """
+        position_anomalies = self._extract_position_anomalies()
+        if position_anomalies is None or position_anomalies.empty:
+            return None
+        
+        anomalies_file = os.path.join(self.output_dir, "position_anomalies_report.xlsx")
+        position_anomalies.to_excel(anomalies_file, index=False)
+        return anomalies_file
+    
     def _extract_position_anomalies(self):
         """
         Extract anomalous points from position analysis data.
@@ -8,6 +8,7 @@ import os
 import logging
 import pandas as pd
 import numpy as np
+from concurrent.futures import Future
 from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime
 
@@ -18,11 +19,18 @@ logger = logging.getLogger(__name__)
 try:
 	import openpyxl
 	from openpyxl.styles import PatternFill, Font, Alignment
+	from openpyxl.formatting.rule import CellIsRule, FormulaRule
+	from openpyxl.utils import get_column_letter
 	OPENPYXL_AVAILABLE = True
 except ImportError:
 	OPENPYXL_AVAILABLE = False
 	logger.warning("openpyxl styles not available - Excel formatting will be limited")
 
+from .excel_writer import (
+	StreamingExcelWriter, XLSXWRITER_AVAILABLE, SEVERITY_FILLS, HEADER_FILL, estimate_column_widths
+)
+from .report_scheduler import ReportScheduler
+
 try:
 	from reportlab.lib.pagesizes import A4
 	from reportlab.lib import colors
@@ -54,7 +62,13 @@ class ReportGenerator:
 		
 		Args:
 			output_directory: Directory where reports will be saved
-			report_config: Optional configuration dictionary for report generation
+			report_config: Optional configuration dictionary for report generation.
+				'excel_writer' selects the Excel backend: 'auto' (the default) uses
+				xlsxwriter when it is installed and openpyxl otherwise, 'streaming'
+				requests xlsxwriter and 'openpyxl' always uses openpyxl. PDF charts
+				('include_charts') need matplotlib and Pillow and are left out without
+				them. The optional packages are installed with the 'reports' extra
+				(pip install cbatool[reports]).
 		"""
 		self.output_directory = output_directory
 		
@@ -73,15 +87,29 @@ class ReportGenerator:
 			'company_name': '',
 			'project_name': '',
 			'client_name': '',
-			'regulatory_requirements': ''
+			'regulatory_requirements': '',
+			'include_charts': True,
+			'max_section_charts': None,
+			'write_individual_reports': False,
+			'excel_writer': 'auto'
 		}
 		
 		# Logging setup
 		logger.info(f"ReportGenerator initialized. Output directory: {output_directory}")
 	
+	def set_individual_reports(self, enabled: bool) -> None:
+		"""
+		Set whether each report is also written to its own Excel file.
+		
+		Args:
+			enabled: Whether to write the individual report files
+		"""
+		self.report_config['write_individual_reports'] = bool(enabled)
+	
 	def generate_reports(self, analysis_results: Dict[str, Any], 
 						 visualization_path: Optional[str] = None,
-						 analysis_type: str = 'combined') -> Dict[str, str]:
+						 analysis_type: str = 'combined',
+						 chart_data: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
 		"""
 		Generate a complete set of reports from analysis results.
 		
@@ -94,9 +122,11 @@ class ReportGenerator:
 			analysis_results: Dictionary containing analysis results from any analyzer
 			visualization_path: Optional path to HTML visualization file
 			analysis_type: Type of analysis ('depth', 'position', or 'combined')
+			chart_data: Optional depth profile data for the PDF charts (see generate_pdf_summary)
 			
 		Returns:
-			Dictionary of generated report paths
+			Dictionary of generated report paths, with the names of any report tasks
+			that failed under 'failed_tasks'
 		"""
 		# Validate input
 		if not analysis_results:
@@ -106,30 +136,18 @@ class ReportGenerator:
 		# Normalize analysis results to standard format
 		standardized_results = self._standardize_analysis_results(analysis_results, analysis_type)
 		
-		# Generate individual Excel reports
-		excel_reports = self._generate_excel_reports(standardized_results, analysis_type)
-		
-		# Consolidate Excel reports if we have any
-		consolidated_excel_path = ""
-		if excel_reports:
-			consolidated_excel_path = self.consolidate_excel_reports(
-				excel_reports, 
-				f"{analysis_type}_analysis_report.xlsx"
-			)
-		
-		# Generate PDF summary
-		pdf_path = self.generate_pdf_summary(
-			standardized_results, 
-			visualization_path,
-			f"{analysis_type}_analysis_summary.pdf"
-		)
+		# Build the report DataFrames, then write the files concurrently
+		report_frames = self._build_report_frames(standardized_results)
+		reports = self._schedule_reports(standardized_results, report_frames, analysis_type,
+										 visualization_path, chart_data)
 		
 		# Collect and return all report paths
 		report_paths = {
-			'excel': consolidated_excel_path,
-			'pdf': pdf_path,
+			'excel': reports['excel'] or "",
+			'pdf': reports['pdf'] or "",
 			'visualization': visualization_path,
-			'individual_reports': excel_reports
+			'individual_reports': reports['individual_reports'] or {},
+			'failed_tasks': reports['failed_tasks']
 		}
 		
 		# Store report paths for later reference
@@ -447,66 +465,36 @@ class ReportGenerator:
 		
 		return recommendations
 		
-	def _generate_excel_reports(self, standardized_results: Dict[str, Any], 
-							   analysis_type: str) -> Dict[str, str]:
+	def _build_report_frames(self, standardized_results: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
 		"""
-		Generate individual Excel reports from standardized analysis results.
+		Build the report DataFrames from standardized analysis results.
 		
 		Args:
 			standardized_results: Standardized analysis results
-			analysis_type: Type of analysis ('depth', 'position', or 'combined')
 			
 		Returns:
-			Dictionary mapping report names to file paths
+			Dictionary mapping report names to DataFrames
 		"""
-		excel_reports = {}
+		frames = {}
 		
-		# Generate problem sections reports
+		# Problem sections reports
 		for section_type, sections_df in standardized_results.get('problem_sections', {}).items():
 			if isinstance(sections_df, pd.DataFrame) and not sections_df.empty:
-				report_name = f"{section_type}_problem_sections"
-				file_path = os.path.join(self.output_directory, f"{report_name}.xlsx")
-				
-				# Save to Excel
-				sections_df.to_excel(file_path, index=False)
-				
-				# Add to report dictionary
-				excel_reports[f"{section_type.capitalize()} Problem Sections"] = file_path
+				frames[f"{section_type.capitalize()} Problem Sections"] = sections_df
 		
-		# Generate anomalies reports
+		# Anomalies reports
 		for anomaly_type, anomalies_df in standardized_results.get('anomalies', {}).items():
 			if isinstance(anomalies_df, pd.DataFrame) and not anomalies_df.empty:
-				report_name = f"{anomaly_type}_anomalies"
-				file_path = os.path.join(self.output_directory, f"{report_name}.xlsx")
-				
-				# Save to Excel
-				anomalies_df.to_excel(file_path, index=False)
-				
-				# Add to report dictionary
-				excel_reports[f"{anomaly_type.capitalize()} Anomalies"] = file_path
+				frames[f"{anomaly_type.capitalize()} Anomalies"] = anomalies_df
 		
-		# Generate recommendations report
+		# Recommendations report
 		recommendations = standardized_results.get('recommendations', [])
 		if recommendations:
-			report_name = "recommendations"
-			file_path = os.path.join(self.output_directory, f"{report_name}.xlsx")
-			
-			# Convert to DataFrame
-			recommendations_df = pd.DataFrame(recommendations)
-			
-			# Save to Excel
-			recommendations_df.to_excel(file_path, index=False)
-			
-			# Add to report dictionary
-			excel_reports["Recommendations"] = file_path
+			frames["Recommendations"] = pd.DataFrame(recommendations)
 		
-		# Generate summary report
+		# Summary report (two columns: Metric and Value)
 		summary = standardized_results.get('summary', {})
 		if summary:
-			report_name = "analysis_summary"
-			file_path = os.path.join(self.output_directory, f"{report_name}.xlsx")
-			
-			# Convert to DataFrame (two columns: Metric and Value)
 			summary_rows = []
 			for key, value in summary.items():
 				if not isinstance(value, dict):  # Skip nested dictionaries
@@ -514,26 +502,132 @@ class ReportGenerator:
 						'Metric': key.replace('_', ' ').title(),
 						'Value': value
 					})
+			frames["Analysis Summary"] = pd.DataFrame(summary_rows)
+		
+		return frames
+	
+	def _write_individual_reports(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+		"""
+		Write each report DataFrame to its own Excel file, if enabled.
+		
+		The consolidated workbook is built from the DataFrames directly, so the
+		individual files are only written when 'write_individual_reports' is set
+		in the report configuration.
+		
+		Args:
+			frames: Dictionary mapping report names to DataFrames
 			
-			summary_df = pd.DataFrame(summary_rows)
+		Returns:
+			Dictionary mapping report names to file paths (empty if disabled)
+		"""
+		report_files = self._individual_report_paths(frames)
+		for report_name, file_path in report_files.items():
+			frames[report_name].to_excel(file_path, index=False)
+			logger.info(f"Created {report_name.lower()} report: {file_path}")
+		
+		return report_files
+	
+	def _individual_report_paths(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+		"""
+		Get the paths of the individual Excel reports, if enabled.
+		
+		Args:
+			frames: Dictionary mapping report names to DataFrames
 			
-			# Save to Excel
-			summary_df.to_excel(file_path, index=False)
+		Returns:
+			Dictionary mapping report names to file paths (empty if disabled)
+		"""
+		if not self.report_config.get('write_individual_reports', False):
+			return {}
+		
+		return {
+			report_name: os.path.join(self.output_directory, f"{report_name.lower().replace(' ', '_')}.xlsx")
+			for report_name in frames
+		}
+	
+	def _schedule_reports(self, standardized_results: Dict[str, Any],
+						  report_frames: Dict[str, pd.DataFrame],
+						  analysis_type: str,
+						  visualization_path: Optional[str] = None,
+						  chart_data: Optional[Dict[str, Any]] = None,
+						  visualization_ready: Optional[Future] = None) -> Dict[str, Any]:
+		"""
+		Write the report files concurrently, each as soon as its inputs are ready.
+		
+		The individual Excel files, the consolidated workbook and the chart images
+		are independent; the PDF waits for the charts and for the visualization.
+		
+		Args:
+			standardized_results: Standardized analysis results
+			report_frames: Dictionary mapping report names to DataFrames
+			analysis_type: Type of analysis, used in the file names
+			visualization_path: Optional path to the visualization file
+			chart_data: Optional depth profile data for the PDF charts
+			visualization_ready: Optional Future that completes once the
+				visualization file has been written
 			
-			# Add to report dictionary
-			excel_reports["Analysis Summary"] = file_path
+		Returns:
+			Dictionary with the 'individual_reports', 'excel', 'charts' and 'pdf' task
+			results, and the names of the tasks that failed (raised, or returned
+			no output although one was expected) under 'failed_tasks'
+		"""
+		scheduler = ReportScheduler()
+		scheduler.add_task('individual_reports', self._write_individual_reports, report_frames)
+		scheduler.add_task('charts', self._render_charts, chart_data)
+		
+		# The workbook lists the individual files by name, so it does not wait for them
+		if report_frames:
+			scheduler.add_task('excel', self.consolidate_excel_reports, report_frames,
+							   f"{analysis_type}_analysis_report.xlsx",
+							   self._individual_report_paths(report_frames))
+		
+		scheduler.add_task('pdf', self.generate_pdf_summary, standardized_results, visualization_path,
+						   f"{analysis_type}_analysis_summary.pdf",
+						   depends_on=[visualization_ready] if visualization_ready else None,
+						   inputs={'charts': 'charts'})
+		
+		reports = scheduler.run()
+		reports.setdefault('excel', "")
+		
+		# The writers log their errors and return an empty result instead of raising,
+		# so an output that should have been written but is empty is a failed task too
+		expected = {'excel': bool(report_frames), 'pdf': REPORTLAB_AVAILABLE,
+					'charts': self._charts_expected(chart_data)}
+		reports['failed_tasks'] = list(scheduler.failed) + [
+			name for name, wanted in expected.items()
+			if wanted and not reports.get(name) and name not in scheduler.failed
+		]
+		return reports
+	
+	def _charts_expected(self, chart_data: Optional[Dict[str, Any]]) -> bool:
+		"""
+		Check whether the PDF charts should be rendered for the given chart data.
 		
-		return excel_reports
+		Args:
+			chart_data: Depth profile data for the charts (see generate_pdf_summary)
+			
+		Returns:
+			True if charts are configured and matplotlib is available
+		"""
+		if not chart_data or not self.report_config.get('include_charts', True):
+			return False
+		
+		from ..utils.static_charts import MATPLOTLIB_AVAILABLE
+		return MATPLOTLIB_AVAILABLE
 	
 	def consolidate_excel_reports(self, 
-								 reports: Dict[str, str], 
-								 output_filename: str = 'comprehensive_analysis_report.xlsx') -> str:
+								 reports: Dict[str, Union[pd.DataFrame, str]], 
+								 output_filename: str = 'comprehensive_analysis_report.xlsx',
+								 report_files: Optional[Dict[str, str]] = None) -> str:
 		"""
-		Consolidate multiple Excel reports into a single workbook.
+		Consolidate multiple reports into a single workbook in one pass.
 		
 		Args:
-			reports: Dictionary mapping report names to file paths
+			reports: Dictionary mapping report names to DataFrames (or to the
+				paths of existing Excel reports, which are read in)
 			output_filename: Name of the output consolidated report
+			report_files: Optional dictionary mapping report names to individual
+				report files, listed on the summary sheet
 		
 		Returns:
 			Path to the consolidated Excel report
@@ -547,57 +641,32 @@ class ReportGenerator:
 		output_path = os.path.join(self.output_directory, output_filename)
 		
 		try:
-			# Create Excel writer
-			with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-				# First add a summary sheet
-				summary_data = self._create_summary_sheet(reports)
-				summary_data.to_excel(writer, sheet_name='Summary', index=False)
-				
-				# Add recommendations sheet if it exists
-				if "Recommendations" in reports:
-					try:
-						recommendations_df = pd.read_excel(reports["Recommendations"])
-						recommendations_df.to_excel(writer, sheet_name='Recommendations', index=False)
-						
-						# Apply formatting to recommendations
-						self._apply_excel_formatting(writer, 'Recommendations', recommendations_df, 
-												   format_type='recommendations')
-					except Exception as e:
-						logger.error(f"Error adding recommendations: {e}")
-				
-				# Add each report
-				for report_name, report_path in reports.items():
-					# Skip recommendations as we've already added it
-					if report_name == "Recommendations":
-						continue
-						
-					# Validate report exists
-					if not os.path.exists(report_path):
-						logger.warning(f"Report not found: {report_path}")
-						continue
-					
-					# Read Excel file
-					try:
-						xls = pd.ExcelFile(report_path)
+			frames = self._load_report_frames(reports)
+			report_files = dict(report_files or {})
+			report_files.update({name: path for name, path in reports.items() if isinstance(path, str)})
+			
+			# Recommendations come first, after the summary
+			frames = {name: frames[name] for name in sorted(frames, key=lambda name: name != "Recommendations")}
+			
+			# Sheets in workbook order: (sheet name, DataFrame, format type)
+			sheets = [('Summary', self._create_summary_sheet(frames, report_files), 'default')]
+			for report_name, df in frames.items():
+				format_type = 'recommendations' if report_name == "Recommendations" else 'default'
+				sheets.append((report_name[:31], df, format_type))  # Excel sheet name length limit
+			sheets.append(('Project Information', self._create_project_info_sheet(), 'default'))
+			
+			if self._use_streaming_writer():
+				# Constant-memory writer: rows are written out in chunks
+				with StreamingExcelWriter(output_path) as writer:
+					for sheet_name, df, format_type in sheets:
+						writer.write_sheet(sheet_name, df, format_type)
+			else:
+				with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+					for sheet_name, df, format_type in sheets:
+						df.to_excel(writer, sheet_name=sheet_name, index=False)
 						
-						# Add each sheet to the consolidated workbook
-						for sheet_name in xls.sheet_names:
-							# Create a better sheet name
-							friendly_sheet_name = f"{report_name}"
-							if len(friendly_sheet_name) > 31:  # Excel sheet name length limit
-								friendly_sheet_name = friendly_sheet_name[:31]
-							
-							# Read and write sheet
-							df = pd.read_excel(report_path, sheet_name=sheet_name)
-							df.to_excel(writer, sheet_name=friendly_sheet_name, index=False)
-							
-							# Apply formatting if possible
-							self._apply_excel_formatting(writer, friendly_sheet_name, df)
-					except Exception as e:
-						logger.error(f"Error processing report {report_name}: {e}")
-				
-				# Add project information sheet
-				self._add_project_info_sheet(writer)
+						# Apply formatting if possible
+						self._apply_excel_formatting(writer, sheet_name, df, format_type=format_type)
 			
 			logger.info(f"Consolidated report created: {output_path}")
 			self.report_paths['excel'] = output_path
@@ -606,17 +675,105 @@ class ReportGenerator:
 		except Exception as e:
 			logger.error(f"Error consolidating reports: {e}")
 			return ""
-
+	
+	def _use_streaming_writer(self) -> bool:
+		"""
+		Check whether the consolidated workbook is written with the streaming writer.
+		
+		The 'excel_writer' report configuration selects 'streaming' (xlsxwriter in
+		constant-memory mode), 'openpyxl', or 'auto' (streaming when xlsxwriter is
+		installed, the default).
+		
+		Returns:
+			True to use the streaming writer, False for openpyxl
+		"""
+		excel_writer = self.report_config.get('excel_writer', 'auto')
+		if excel_writer == 'openpyxl':
+			return False
+		if not XLSXWRITER_AVAILABLE:
+			if excel_writer == 'streaming':
+				logger.warning("xlsxwriter not available - writing the Excel report with openpyxl")
+			return False
+		return True
+	
+	def _load_report_frames(self, reports: Dict[str, Union[pd.DataFrame, str]]) -> Dict[str, pd.DataFrame]:
+		"""
+		Get the DataFrame of each report, reading reports given as file paths.
+		
+		Args:
+			reports: Dictionary mapping report names to DataFrames or Excel file paths
+			
+		Returns:
+			Dictionary mapping report names to DataFrames
+		"""
+		frames = {}
+		for report_name, report in reports.items():
+			if isinstance(report, pd.DataFrame):
+				frames[report_name] = report
+			elif not os.path.exists(report):
+				logger.warning(f"Report not found: {report}")
+			else:
+				try:
+					frames[report_name] = pd.read_excel(report)
+				except Exception as e:
+					logger.error(f"Error processing report {report_name}: {e}")
+		return frames
+	
+	def _create_summary_sheet(self, frames: Dict[str, pd.DataFrame], 
+							  report_files: Dict[str, str]) -> pd.DataFrame:
+		"""
+		Create the summary sheet listing the reports in the workbook.
+		
+		Args:
+			frames: Dictionary mapping report names to DataFrames
+			report_files: Dictionary mapping report names to individual report files
+			
+		Returns:
+			DataFrame for the summary sheet
+		"""
+		now = datetime.now().strftime('%Y-%m-%d %H:%M')
+		
+		# Add timestamp and metadata
+		summary_rows = [{
+			'Report Type': 'METADATA',
+			'Sheet': 'N/A',
+			'Total Rows': 'N/A',
+			'File': 'N/A',
+			'Date Generated': now
+		}]
+		
+		# Add report information
+		for report_name, df in frames.items():
+			file_path = report_files.get(report_name)
+			summary_rows.append({
+				'Report Type': report_name,
+				'Sheet': report_name[:31],
+				'Total Rows': len(df),
+				'File': os.path.basename(file_path) if file_path else '',
+				'Date Generated': now
+			})
+		
+		return pd.DataFrame(summary_rows)
+	
 	def generate_pdf_summary(self, standardized_results: Dict[str, Any], 
                         visualization_path: Optional[str] = None,
-                        output_filename: str = 'analysis_summary.pdf') -> str:
+                        output_filename: str = 'analysis_summary.pdf',
+                        chart_data: Optional[Dict[str, Any]] = None,
+                        charts: Optional[Dict[str, Any]] = None) -> str:
 		"""
 		Generate a PDF summary report from analysis results.
 		
+		When chart data is given, a decimated depth profile chart and one zoomed
+		chart per problem section are rendered (in parallel) and embedded.
+		
 		Args:
 			standardized_results: Standardized analysis results
 			visualization_path: Optional path to visualization file
 			output_filename: Name of the output PDF file
+			chart_data: Optional dictionary with the survey 'data' and its 'kp_column'
+				and 'depth_column', plus optional 'target_depth' and 'problem_sections'
+			charts: Optional charts already rendered by _render_charts (chart_data
+				is then not used)
 			
 		Returns:
 			Path to the generated PDF file or empty string if generation failed
@@ -648,6 +805,10 @@ class ReportGenerator:
 				bottomMargin=72
 			)
 			
+			# Render the static charts before building the story
+			if charts is None:
+				charts = self._render_charts(chart_data)
+			
 			# Initialize story (content elements)
 			story = []
 			
@@ -740,6 +901,11 @@ class ReportGenerator:
 				story.append(Paragraph("No summary data available.", normal_style))
 				story.append(Spacer(1, 0.25 * inch))
 			
+			# Add the depth profile chart
+			if charts.get('overview'):
+				story.append(self._chart_image(charts['overview'], doc.width))
+				story.append(Spacer(1, 0.25 * inch))
+			
 			# Add problem sections if available
 			problem_sections = standardized_results.get('problem_sections', {})
 			if problem_sections:
@@ -767,6 +933,11 @@ class ReportGenerator:
 					story.append(Paragraph(f"Severity distribution: {severity_text}", normal_style))
 				
 				story.append(Spacer(1, 0.15 * inch))
+				
+				# Add the zoomed chart of each section
+				for title, chart_path in charts.get('sections', []):
+					story.append(self._chart_image(chart_path, doc.width))
+					story.append(Spacer(1, 0.1 * inch))
 			
 			# Add recommendations if available
 			recommendations = standardized_results.get('recommendations', [])
@@ -828,55 +999,50 @@ class ReportGenerator:
 		except Exception as e:
 			logger.error(f"Error generating PDF summary: {str(e)}", exc_info=True)
 			return ""
+	
+	def _render_charts(self, chart_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+		"""
+		Render the static PDF charts, if configured.
+		
+		Args:
+			chart_data: Depth profile data for the charts (see generate_pdf_summary)
 			
-			# Add report information
-			for report_name, report_path in reports.items():
-				if os.path.exists(report_path):
-					try:
-						xls = pd.ExcelFile(report_path)
-						total_rows = 0
-						
-						# Count total rows across all sheets
-						for sheet_name in xls.sheet_names:
-							df = pd.read_excel(report_path, sheet_name=sheet_name)
-							total_rows += len(df)
-						
-						summary_rows.append({
-							'Report Type': report_name,
-							'File': os.path.basename(report_path),
-							'Sheets': len(xls.sheet_names),
-							'Total Rows': total_rows,
-							'Date Generated': datetime.fromtimestamp(os.path.getmtime(report_path)).strftime('%Y-%m-%d %H:%M')
-						})
-					except Exception as e:
-						logger.error(f"Error analyzing report {report_name}: {e}")
-						summary_rows.append({
-							'Report Type': report_name,
-							'File': os.path.basename(report_path),
-							'Sheets': 'Error',
-							'Total Rows': 'Error',
-							'Date Generated': datetime.fromtimestamp(os.path.getmtime(report_path)).strftime('%Y-%m-%d %H:%M')
-						})
-			
-			# Add timestamp and metadata
-			metadata = [{
-				'Report Type': 'METADATA',
-				'File': 'N/A',
-				'Sheets': 'N/A',
-				'Total Rows': 'N/A',
-				'Date Generated': datetime.now().strftime('%Y-%m-%d %H:%M')
-			}]
-			
-			return pd.DataFrame(metadata + summary_rows)
+		Returns:
+			Dictionary of chart paths from render_report_charts (empty if none)
+		"""
+		if not chart_data or not self.report_config.get('include_charts', True):
+			return {}
+		
+		from ..utils.static_charts import render_report_charts
+		return render_report_charts(
+			chart_data,
+			os.path.join(self.output_directory, 'report_charts'),
+			max_sections=self.report_config.get('max_section_charts')
+		)
 	
-	def _add_project_info_sheet(self, writer):
+	def _chart_image(self, chart_path: str, width: float) -> 'Image':
 		"""
-		Add a project information sheet to the Excel report.
+		Create a PDF image flowable for a chart, scaled to the given width.
 		
 		Args:
-			writer: Excel writer object
+			chart_path: Path to the chart PNG file
+			width: Width of the image in points
+			
+		Returns:
+			ReportLab Image flowable
+		"""
+		from reportlab.lib.utils import ImageReader
+		
+		image_width, image_height = ImageReader(chart_path).getSize()
+		return Image(chart_path, width=width, height=width * image_height / image_width)
+	
+	def _create_project_info_sheet(self) -> pd.DataFrame:
+		"""
+		Create the project information sheet of the Excel report.
+		
+		Returns:
+			DataFrame for the project information sheet
 		"""
-		# Create project info
 		project_info = [
 			{'Field': 'Project Name', 'Value': self.report_config.get('project_name', '')},
 			{'Field': 'Client Name', 'Value': self.report_config.get('client_name', '')},
@@ -885,41 +1051,15 @@ class ReportGenerator:
 			{'Field': 'Regulatory Requirements', 'Value': self.report_config.get('regulatory_requirements', '')}
 		]
 		
-		# Convert to DataFrame
-		df = pd.DataFrame(project_info)
-		
-		# Write to Excel
-		df.to_excel(writer, sheet_name='Project Information', index=False)
-		
-		# Apply formatting
-		if OPENPYXL_AVAILABLE:
-			try:
-				worksheet = writer.sheets['Project Information']
-				
-				# Format headers
-				for cell in worksheet["A1:B1"]:
-					for c in cell:
-						c.font = Font(bold=True)
-						c.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-				
-				# Auto-fit columns
-				for idx, col in enumerate(['A', 'B']):
-					max_length = 0
-					for cell in worksheet[col]:
-						try:
-							if len(str(cell.value)) > max_length:
-								max_length = len(str(cell.value))
-						except:
-							pass
-					adjusted_width = (max_length + 2)
-					worksheet.column_dimensions[col].width = adjusted_width
-			except Exception as e:
-				logger.warning(f"Error formatting project info sheet: {e}")
+		return pd.DataFrame(project_info)
 	
 	def _apply_excel_formatting(self, writer, sheet_name, df, format_type='default'):
 		"""
 		Apply formatting to Excel worksheet.
 		
+		Formatting is set per column (widths estimated from a sample of rows and
+		conditional formatting rules), so its cost does not grow with the rows.
+		
 		Args:
 			writer: Excel writer object
 			sheet_name: Name of the sheet to format
@@ -931,27 +1071,17 @@ class ReportGenerator:
 			if not OPENPYXL_AVAILABLE:
 				return
 				
-			# Get the workbook and worksheet
-			workbook = writer.book
+			# Get the worksheet
 			worksheet = writer.sheets[sheet_name]
 			
-			# Auto-fit columns if possible
-			for idx, col in enumerate(df.columns):
-				# Calculate max width
-				max_len = max(
-					df[col].astype(str).map(len).max(),
-					len(str(col))
-				) + 2  # Add a little extra space
-				
-				# Set column width (using Excel column letters A, B, C...)
-				col_letter = chr(65 + idx) if idx < 26 else chr(64 + idx // 26) + chr(65 + idx % 26)
-				if hasattr(worksheet, 'column_dimensions'):
-					worksheet.column_dimensions[col_letter].width = min(max_len, 40)
+			# Column widths from a sample of the rows
+			for idx, width in enumerate(estimate_column_widths(df), start=1):
+				worksheet.column_dimensions[get_column_letter(idx)].width = width
 			
 			# Format header row
-			for cell in worksheet["1:1"]:
+			for cell in worksheet[1]:
 				cell.font = Font(bold=True)
-				cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+				cell.fill = PatternFill(start_color=HEADER_FILL, end_color=HEADER_FILL, fill_type="solid")
 			
 			# Apply specific formatting based on format_type
 			if format_type == 'recommendations':
@@ -963,28 +1093,41 @@ class ReportGenerator:
 			# Don't let formatting errors prevent report generation
 			logger.warning(f"Error applying Excel formatting: {e}")
 	
-	def _format_severity_column(self, worksheet, df):
+	def _column_range(self, df, column):
+		"""
+		Get the cell range of a column's data rows (below the header).
+		
+		Args:
+			df: DataFrame containing the data
+			column: Name of the column
+			
+		Returns:
+			Range string such as "D2:D301"
+		"""
+		col_letter = get_column_letter(list(df.columns).index(column) + 1)
+		return f"{col_letter}2:{col_letter}{len(df) + 1}"
+	
+	def _format_severity_column(self, worksheet, df, column='Severity'):
 		"""
 		Format the Severity column with color coding.
 		
+		The colors are conditional formatting rules on the whole column.
+		
 		Args:
 			worksheet: Excel worksheet
 			df: DataFrame containing the data
+			column: Name of the severity column
 		"""
-		# Find the severity column
-		severity_col_idx = list(df.columns).index('Severity')
-		severity_col_letter = chr(65 + severity_col_idx) if severity_col_idx < 26 else chr(64 + severity_col_idx // 26) + chr(65 + severity_col_idx % 26)
-		
-		# Apply formatting to each cell in the severity column
-		for row_idx, severity in enumerate(df['Severity'], start=2):  # Start from row 2 (after header)
-			cell = worksheet[f"{severity_col_letter}{row_idx}"]
-			
-			if severity == 'High':
-				cell.fill = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
-			elif severity == 'Medium':
-				cell.fill = PatternFill(start_color='FFEECC', end_color='FFEECC', fill_type='solid')
-			elif severity == 'Low':
-				cell.fill = PatternFill(start_color='EEFFCC', end_color='EEFFCC', fill_type='solid')
+		if df.empty:
+			return
+		
+		cell_range = self._column_range(df, column)
+		for severity, fill in SEVERITY_FILLS.items():
+			worksheet.conditional_formatting.add(cell_range, CellIsRule(
+				operator='equal',
+				formula=[f'"{severity}"'],
+				fill=PatternFill(start_color=fill, end_color=fill, fill_type='solid')
+			))
 	
 	def _format_recommendations(self, worksheet, df):
 		"""
@@ -994,56 +1137,47 @@ class ReportGenerator:
 			worksheet: Excel worksheet
 			df: DataFrame containing the data
 		"""
-		# Check if 'severity' column exists
+		if df.empty:
+			return
+		
+		# Color-code the 'severity' column
 		if 'severity' in df.columns:
-			severity_col_idx = list(df.columns).index('severity')
-			severity_col_letter = chr(65 + severity_col_idx) if severity_col_idx < 26 else chr(64 + severity_col_idx // 26) + chr(65 + severity_col_idx % 26)
-			
-			# Apply formatting to each cell in the severity column
-			for row_idx, severity in enumerate(df['severity'], start=2):  # Start from row 2 (after header)
-				cell = worksheet[f"{severity_col_letter}{row_idx}"]
-				
-				if severity == 'High':
-					cell.fill = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
-				elif severity == 'Medium':
-					cell.fill = PatternFill(start_color='FFEECC', end_color='FFEECC', fill_type='solid')
-				elif severity == 'Low':
-					cell.fill = PatternFill(start_color='EEFFCC', end_color='EEFFCC', fill_type='solid')
-				
-		# Check if 'category' column exists
+			self._format_severity_column(worksheet, df, column='severity')
+		
+		# Make the 'category' column bold (a rule that always applies)
 		if 'category' in df.columns:
-			# Format category column
-			category_col_idx = list(df.columns).index('category')
-			category_col_letter = chr(65 + category_col_idx) if category_col_idx < 26 else chr(64 + category_col_idx // 26) + chr(65 + category_col_idx % 26)
-			
-			# Make category bold
-			for row_idx in range(2, len(df) + 2):  # Start from row 2 (after header)
-				cell = worksheet[f"{category_col_letter}{row_idx}"]
-				cell.font = Font(bold=True)
+			worksheet.conditional_formatting.add(
+				self._column_range(df, 'category'),
+				FormulaRule(formula=['TRUE'], font=Font(bold=True))
+			)
 		
-		# Check if 'action' column exists
+		# Word wrap the 'action' column. Conditional formats cannot set alignment,
+		# so this stays per cell; there is at most one row per recommendation rule.
 		if 'action' in df.columns:
-			# Apply word wrap to action column
-			action_col_idx = list(df.columns).index('action')
-			action_col_letter = chr(65 + action_col_idx) if action_col_idx < 26 else chr(64 + action_col_idx // 26) + chr(65 + action_col_idx % 26)
-			
-			for row_idx in range(2, len(df) + 2):  # Start from row 2 (after header)
-				cell = worksheet[f"{action_col_letter}{row_idx}"]
+			for (cell,) in worksheet[self._column_range(df, 'action')]:
 				cell.alignment = Alignment(wrap_text=True)
 	
 	# Targeted fix for the create_comprehensive_report method
 	def create_comprehensive_report(self, 
 								analyzer_results: Dict[str, Any], 
-								visualization_path: Optional[str] = None) -> Dict[str, str]:
+								visualization_path: Optional[str] = None,
+								chart_data: Optional[Dict[str, Any]] = None,
+								visualization_ready: Optional[Future] = None) -> Dict[str, str]:
 		"""
 		Create a comprehensive report from analyzer results.
 		
+		The Excel and PDF reports are written concurrently (see _schedule_reports).
+		
 		Args:
 			analyzer_results: Dictionary containing analyzer results or an Analyzer instance
 			visualization_path: Optional path to visualization file
+			chart_data: Optional depth profile data for the PDF charts (see generate_pdf_summary)
+			visualization_ready: Optional Future that completes once the visualization
+				file has been written (e.g. while it is saved on another thread)
 		
 		Returns:
-			Dictionary of generated report paths
+			Dictionary of generated report paths, with the names of any report tasks
+			that failed under 'failed_tasks'
 		"""
 		# Import the report utility functions
 		from ..utils.report_utils import (
@@ -1083,64 +1217,47 @@ class ReportGenerator:
 			logger.error("Invalid standardized data structure")
 			return {}
 		
-		# Step 3: Check visualization path
-		if visualization_path and not os.path.exists(visualization_path):
-			logger.warning(f"Visualization file not found: {visualization_path}")
-			visualization_path = None
-		
-		# Step 4: Get analysis type for consistent filenames
+		# Step 3: Get analysis type for consistent filenames
 		analysis_type = standardized_data.get('analysis_type', 'combined')
 		
-		# Step 5: Create individual Excel reports based on extracted data
-		report_files = {}
+		# Step 4: Build the report DataFrames from the extracted data
+		report_frames = {}
 		
 		# Process problem sections
 		problem_sections_df = extract_problem_sections(standardized_data)
 		if problem_sections_df is not None and not problem_sections_df.empty:
-			problem_sections_path = os.path.join(self.output_directory, f"{analysis_type}_problem_sections.xlsx")
-			problem_sections_df.to_excel(problem_sections_path, index=False)
-			report_files[f'{analysis_type.capitalize()} Problem Sections'] = problem_sections_path
-			logger.info(f"Created problem sections report: {problem_sections_path}")
+			report_frames[f'{analysis_type.capitalize()} Problem Sections'] = problem_sections_df
 		
 		# Process anomalies
 		anomalies_df = extract_anomalies(standardized_data)
 		if anomalies_df is not None and not anomalies_df.empty:
-			anomalies_path = os.path.join(self.output_directory, f"{analysis_type}_anomalies.xlsx")
-			anomalies_df.to_excel(anomalies_path, index=False)
-			report_files[f'{analysis_type.capitalize()} Anomalies'] = anomalies_path
-			logger.info(f"Created anomalies report: {anomalies_path}")
+			report_frames[f'{analysis_type.capitalize()} Anomalies'] = anomalies_df
 		
 		# Process recommendations
 		recommendations_df = extract_recommendations(standardized_data)
 		if recommendations_df is not None and not recommendations_df.empty:
-			recommendations_path = os.path.join(self.output_directory, "recommendations.xlsx")
-			recommendations_df.to_excel(recommendations_path, index=False)
-			report_files['Recommendations'] = recommendations_path
-			logger.info(f"Created recommendations report: {recommendations_path}")
+			report_frames['Recommendations'] = recommendations_df
 		
 		# Process compliance metrics
 		compliance_df = create_compliance_metrics_dataframe(standardized_data)
 		if compliance_df is not None and not compliance_df.empty:
-			compliance_path = os.path.join(self.output_directory, "compliance_metrics.xlsx")
-			compliance_df.to_excel(compliance_path, index=False)
-			report_files['Compliance Metrics'] = compliance_path
-			logger.info(f"Created compliance metrics report: {compliance_path}")
-		
-		# Step 6: Generate consolidated Excel report
-		excel_report = self.consolidate_excel_reports(report_files, f"{analysis_type}_analysis_report.xlsx")
-		
-		# Step 7: Generate PDF summary
-		pdf_report = self.generate_pdf_summary(
-			standardized_data, 
-			visualization_path,
-			f"{analysis_type}_analysis_summary.pdf"
-		)
+			report_frames['Compliance Metrics'] = compliance_df
+		
+		# Step 5: Write the individual and consolidated Excel reports and the PDF summary
+		reports = self._schedule_reports(standardized_data, report_frames, analysis_type,
+										 visualization_path, chart_data, visualization_ready)
+		
+		# Step 6: Check visualization path (once it has been written)
+		if visualization_path and not os.path.exists(visualization_path):
+			logger.warning(f"Visualization file not found: {visualization_path}")
+			visualization_path = None
 		
 		# Return all generated reports
 		return {
-			'excel_report': excel_report,
-			'pdf_report': pdf_report,
+			'excel_report': reports['excel'] or "",
+			'pdf_report': reports['pdf'] or "",
 			'visualization': visualization_path,
-			'individual_reports': report_files
+			'individual_reports': reports['individual_reports'] or {},
+			'failed_tasks': reports['failed_tasks']
 		}
 	
\ No newline at end of file
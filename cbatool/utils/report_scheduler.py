@@ -0,0 +1,139 @@
+"""
+Report scheduler module for CBAtool v2.0.
+
+This module contains a small dependency-graph scheduler used to produce the
+report artefacts (HTML visualizations, chart images, Excel workbook and PDF
+summary) concurrently. Each task starts as soon as the tasks it depends on
+have finished, so the total time approaches the slowest chain of artefacts
+rather than the sum of all of them.
+
+Tasks run on threads: they share the analysis DataFrames and the visualizer
+without copying, and the heavy work either happens outside the GIL (file and
+zlib I/O) or in its own process pool (chart rendering).
+"""
+
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ReportScheduler:
+    """
+    Run report tasks concurrently in dependency order.
+
+    Attributes:
+        max_workers (int): Maximum number of concurrent tasks (None: one thread per task).
+        failed (List[str]): Names of the tasks that raised during the last run.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of concurrent tasks (optional). By default
+                every task gets its own thread, so a task waiting on a Future from
+                another scheduler can never hold up the task it waits for.
+        """
+        self.max_workers = max_workers
+        self.failed = []
+        self._tasks = {}
+
+    def add_task(self, name: str, func: Callable, *args,
+                 depends_on: Optional[Sequence[Union[str, Future]]] = None,
+                 inputs: Optional[Dict[str, str]] = None, **kwargs) -> Future:
+        """
+        Add a task to the graph.
+
+        Dependencies must be added before the tasks that depend on them, so the
+        graph cannot contain cycles.
+
+        Args:
+            name: Unique task name (its result is stored under this name).
+            func: Function to call.
+            *args: Positional arguments for func.
+            depends_on: Names of tasks in this scheduler, or Futures (e.g. tasks
+                of another scheduler), that must finish first.
+            inputs: Mapping of keyword argument names to task names; the result
+                of each task is passed to func as that keyword argument.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            Future holding the task's result once it has run.
+        """
+        if name in self._tasks:
+            raise ValueError(f"Duplicate report task '{name}'")
+
+        inputs = dict(inputs or {})
+        depends_on = list(depends_on or [])
+        dependencies = [dependency for dependency in depends_on if isinstance(dependency, str)]
+        dependencies += [task for task in inputs.values() if task not in dependencies]
+        for dependency in dependencies:
+            if dependency not in self._tasks:
+                raise ValueError(f"Report task '{name}' depends on unknown task '{dependency}'")
+
+        future = Future()
+        self._tasks[name] = {
+            'func': func,
+            'args': args,
+            'kwargs': kwargs,
+            'inputs': inputs,
+            'dependencies': dependencies,
+            'external': [dependency for dependency in depends_on if isinstance(dependency, Future)],
+            'future': future
+        }
+        return future
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all added tasks, each as soon as its dependencies have finished.
+
+        A task that raises is logged, its result is None and its name is added
+        to self.failed; the tasks that depend on it still run (with None as any
+        input from it), so callers should check self.failed.
+
+        Returns:
+            Dictionary mapping task names to results.
+        """
+        pending, self._tasks = self._tasks, {}
+        self.failed = []
+        if not pending:
+            return {}
+
+        results = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(pending)) as executor:
+            running = {}
+            while pending or running:
+                for name in [name for name, task in pending.items()
+                             if all(dependency in results for dependency in task['dependencies'])]:
+                    task = pending.pop(name)
+                    running[executor.submit(self._run_task, name, task, results)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+        logger.info(f"Ran {len(results)} report tasks in {time.perf_counter() - started:.2f}s")
+        return results
+
+    def _run_task(self, name: str, task: Dict[str, Any], results: Dict[str, Any]) -> Any:
+        """Run one task, returning None (and logging) if it fails."""
+        started = time.perf_counter()
+        result = None
+        try:
+            for future in task['external']:
+                future.result()
+            kwargs = dict(task['kwargs'])
+            kwargs.update({keyword: results[dependency] for keyword, dependency in task['inputs'].items()})
+            result = task['func'](*task['args'], **kwargs)
+            logger.info(f"Report task '{name}' finished in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Report task '{name}' failed: {str(e)}", exc_info=True)
+            self.failed.append(name)
+        task['future'].set_result(result)
+        return result
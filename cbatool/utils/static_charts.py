@@ -0,0 +1,243 @@
+"""
+Static charts module for CBAtool v2.0.
+
+This module contains the static (PNG) chart rendering used by the PDF summary
+report: a decimated overview of the depth profile and one zoomed chart per
+problem section. Charts are drawn with matplotlib's Agg canvas, without pyplot,
+so rendering never touches the GUI backend and can run in worker processes.
+"""
+
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from ..core.decimation import decimate
+from ..core.process_pool import create_process_pool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+try:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+    logger.warning("matplotlib is not installed. PDF reports will not include charts.")
+
+# Point budgets of the overview and section charts (far above what a printed chart resolves)
+OVERVIEW_CHART_POINTS = 4000
+SECTION_CHART_POINTS = 1000
+
+# Each section chart shows this fraction of the section length on either side (at least 50 m)
+SECTION_CHART_PADDING = 0.5
+SECTION_CHART_MIN_PADDING_KM = 0.05
+
+# Fewer charts than this are rendered in-process (starting workers would cost more)
+PARALLEL_CHART_THRESHOLD = 8
+
+SEVERITY_COLORS = {'High': '#d62728', 'Medium': '#ff7f0e', 'Low': '#bcbd22'}
+
+
+def build_chart_jobs(data: pd.DataFrame, kp_column: str, depth_column: str,
+                     output_dir: str, target_depth: Optional[float] = None,
+                     problem_sections: Optional[pd.DataFrame] = None,
+                     max_sections: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build the chart jobs for a depth profile and its problem sections.
+
+    The profile is decimated here, so each job only carries the few thousand
+    points its chart draws.
+
+    Args:
+        data: Survey data with KP and depth columns.
+        kp_column: Name of the KP column.
+        depth_column: Name of the depth column.
+        output_dir: Directory where the PNG files are written.
+        target_depth: Target burial depth drawn as a reference line (optional).
+        problem_sections: Problem sections with Start_KP, End_KP and Severity columns (optional).
+        max_sections: Maximum number of section charts (optional, all sections if None).
+
+    Returns:
+        List of job dictionaries for render_chart.
+    """
+    kp = data[kp_column].to_numpy(dtype=float)
+    depth = data[depth_column].to_numpy(dtype=float)
+    valid = np.isfinite(kp) & np.isfinite(depth)
+    if not valid.all():
+        kp, depth = kp[valid], depth[valid]
+    if len(kp) == 0:
+        return []
+
+    if np.any(np.diff(kp) < 0):
+        order = np.argsort(kp, kind='stable')
+        kp, depth = kp[order], depth[order]
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    sections = pd.DataFrame()
+    if isinstance(problem_sections, pd.DataFrame) and {'Start_KP', 'End_KP'} <= set(problem_sections.columns):
+        sections = problem_sections
+        if 'Position_Type' in sections.columns:
+            sections = sections[sections['Position_Type'] == 'KP']
+        if max_sections is not None:
+            sections = sections.iloc[:max_sections]
+
+    spans = []
+    for number, section in enumerate(sections.itertuples(index=False), start=1):
+        spans.append({
+            'number': number,
+            'section_id': getattr(section, 'Section_ID', number),
+            'start': float(section.Start_KP),
+            'end': float(section.End_KP),
+            'severity': str(getattr(section, 'Severity', 'Medium'))
+        })
+
+    selected = decimate(kp, depth, OVERVIEW_CHART_POINTS)
+    jobs = [{
+        'kind': 'overview',
+        'output_file': os.path.join(output_dir, 'depth_profile.png'),
+        'title': 'Burial Depth Profile',
+        'kp': kp[selected],
+        'depth': depth[selected],
+        'target_depth': target_depth,
+        'sections': spans
+    }]
+
+    for span in spans:
+        padding = max((span['end'] - span['start']) * SECTION_CHART_PADDING, SECTION_CHART_MIN_PADDING_KM)
+        lo, hi = np.searchsorted(kp, [span['start'] - padding, span['end'] + padding], side='left')
+        hi = min(hi + 1, len(kp))
+        if hi - lo < 2:
+            continue
+        selected = lo + decimate(kp[lo:hi], depth[lo:hi], SECTION_CHART_POINTS)
+        jobs.append({
+            'kind': 'section',
+            'output_file': os.path.join(output_dir, f"section_{span['number']:04d}.png"),
+            'title': f"Section {span['section_id']}: KP {span['start']:.3f} - {span['end']:.3f} "
+                     f"({span['severity']} severity)",
+            'kp': kp[selected],
+            'depth': depth[selected],
+            'target_depth': target_depth,
+            'sections': [span]
+        })
+
+    return jobs
+
+
+def render_chart(job: Dict[str, Any]) -> str:
+    """
+    Render one chart job to a PNG file with the Agg canvas.
+
+    Args:
+        job: Job dictionary from build_chart_jobs.
+
+    Returns:
+        Path to the PNG file.
+    """
+    overview = job['kind'] == 'overview'
+    # Fixed margins: tight_layout would cost an extra draw of every chart
+    fig = Figure(figsize=(7.0, 3.0 if overview else 2.4), dpi=110)
+    fig.subplots_adjust(left=0.09, right=0.98, top=0.88 if overview else 0.86,
+                        bottom=0.16 if overview else 0.2)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+
+    for span in job['sections']:
+        ax.axvspan(span['start'], span['end'], color=SEVERITY_COLORS.get(span['severity'], '#ff7f0e'),
+                   alpha=0.12 if overview else 0.2, linewidth=0)
+    ax.plot(job['kp'], job['depth'], color='#1f77b4', linewidth=0.8)
+    if job['target_depth'] is not None:
+        ax.axhline(job['target_depth'], color='#2ca02c', linestyle='--', linewidth=0.8,
+                   label=f"Target Depth ({job['target_depth']}m)")
+        ax.legend(loc='lower right', fontsize=7, frameon=False)
+
+    ax.set_title(job['title'], fontsize=9)
+    ax.set_xlabel('KP (km)', fontsize=8)
+    ax.set_ylabel('Depth (m)', fontsize=8)
+    ax.tick_params(labelsize=7)
+    ax.ticklabel_format(axis='x', useOffset=False)
+    ax.invert_yaxis()  # Deeper is lower, as in the HTML visualization
+    ax.grid(True, alpha=0.3, linewidth=0.5)
+
+    # Save as RGB: the charts are opaque, and an alpha channel would add a mask image per chart to the PDF
+    canvas.draw()
+    Image.fromarray(np.asarray(canvas.buffer_rgba())).convert('RGB').save(job['output_file'])
+    return job['output_file']
+
+
+def render_charts(jobs: List[Dict[str, Any]], n_jobs: int = -1) -> List[str]:
+    """
+    Render chart jobs, in a process pool when there are enough of them.
+
+    Args:
+        jobs: Job dictionaries from build_chart_jobs.
+        n_jobs: Number of worker processes (-1 uses all CPU cores).
+
+    Returns:
+        Paths to the PNG files, in job order.
+    """
+    if not MATPLOTLIB_AVAILABLE or not jobs:
+        return []
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(jobs))
+
+    if n_jobs > 1 and len(jobs) >= PARALLEL_CHART_THRESHOLD:
+        logger.info(f"Rendering {len(jobs)} report charts on {n_jobs} processes...")
+        # Spawned (not forked) while other threads run, e.g. other reports being written
+        try:
+            with create_process_pool(n_jobs) as executor:
+                return list(executor.map(render_chart, jobs, chunksize=max(1, len(jobs) // (4 * n_jobs))))
+        except Exception as e:
+            logger.warning(f"Parallel chart rendering failed ({str(e)}) - rendering serially")
+
+    logger.info(f"Rendering {len(jobs)} report charts...")
+    return [render_chart(job) for job in jobs]
+
+
+def render_report_charts(chart_data: Dict[str, Any], output_dir: str,
+                         max_sections: Optional[int] = None, n_jobs: int = -1) -> Dict[str, Any]:
+    """
+    Render the overview and section charts of a depth analysis.
+
+    Args:
+        chart_data: Dictionary with 'data', 'kp_column' and 'depth_column', and
+            optionally 'target_depth' and 'problem_sections'.
+        output_dir: Directory where the PNG files are written.
+        max_sections: Maximum number of section charts (optional, all sections if None).
+        n_jobs: Number of worker processes (-1 uses all CPU cores).
+
+    Returns:
+        Dictionary with the 'overview' chart path (or None) and a list of
+        (title, path) tuples under 'sections'. Empty if no charts were rendered.
+    """
+    if not MATPLOTLIB_AVAILABLE:
+        return {}
+
+    try:
+        data = chart_data.get('data')
+        kp_column = chart_data.get('kp_column')
+        depth_column = chart_data.get('depth_column')
+        if not isinstance(data, pd.DataFrame) or kp_column not in data.columns or depth_column not in data.columns:
+            logger.warning("Chart data has no KP and depth columns - skipping report charts")
+            return {}
+
+        jobs = build_chart_jobs(data, kp_column, depth_column, output_dir,
+                                chart_data.get('target_depth'), chart_data.get('problem_sections'),
+                                max_sections)
+        paths = render_charts(jobs, n_jobs)
+        if not paths:
+            return {}
+
+        return {
+            'overview': paths[0],
+            'sections': [(job['title'], path) for job, path in zip(jobs[1:], paths[1:])]
+        }
+    except Exception as e:
+        logger.error(f"Error rendering report charts: {str(e)}", exc_info=True)
+        return {}
@@ -1,7 +1,7 @@
 # worker_utils.py
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -76,6 +76,44 @@ class BaseAnalysisWorker:
         """Save analysis outputs to files."""
         raise NotImplementedError("Subclasses must implement save_outputs")
     
+    def _save_visualization(self, output_file: str, figure=None, stream: bool = False) -> bool:
+        """
+        Save a visualization, raising if it could not be written.
+        
+        Used as a report task so that a failed save is recorded by the scheduler.
+        
+        Args:
+            output_file: Path where the HTML file should be saved
+            figure: Figure to save (optional, defaults to the visualizer's current figure)
+            stream: Whether a large depth profile may be streamed to file (see
+                Visualizer.save_visualization; only for figures that were not edited)
+            
+        Returns:
+            True once the visualization has been saved
+        """
+        if not self.visualizer.save_visualization(output_file, figure=figure, stream=stream):
+            raise RuntimeError(f"Failed to save visualization to {output_file}")
+        return True
+    
+    def _check_report_tasks(self, scheduler, reports: Dict[str, Any]) -> List[str]:
+        """
+        Report the output tasks that failed and store their names in the results.
+        
+        Args:
+            scheduler: ReportScheduler that ran the output tasks
+            reports: Report paths from create_comprehensive_report (may be empty)
+            
+        Returns:
+            Names of the failed tasks ('reports.<task>' for report generator tasks)
+        """
+        failed = list(scheduler.failed)
+        failed += [f"reports.{name}" for name in reports.get('failed_tasks', [])]
+        if failed:
+            print(f"Warning: failed to write outputs: {', '.join(failed)}")
+            logger.warning(f"Failed output tasks: {failed}")
+        self.results['failed_tasks'] = failed
+        return failed
+    
     def handle_exception(self, exception):
         """Handle exceptions that occur during analysis."""
         import traceback
@@ -7,9 +7,17 @@ setup(
     install_requires=[
         "pandas",
         "numpy",
-        "plotly",
+        "plotly>=5.18",  # Typed-array (bdata) figure data in saved HTML
         "openpyxl",  # For Excel file handling
     ],
+    extras_require={
+        'reports': [
+            "xlsxwriter",  # Streaming Excel writer (default when installed)
+            "matplotlib",  # Charts in PDF reports
+            "Pillow",  # Chart images for PDF reports
+            "reportlab",  # PDF report generation
+        ],
+    },
     entry_points={
         'console_scripts': [
             'cbatool=cbatool.__main__:main',